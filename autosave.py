@@ -0,0 +1,162 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Autosave Module
+
+Saves the current character only when it has actually changed.
+
+After every menu action the game calls mark_action(). The scheduler takes a
+cheap snapshot of the fields that matter (stats, gold, XP, inventory,
+quests) and compares it with the last saved state. Read-only actions such
+as viewing stats leave the character unchanged and cost no disk I/O.
+Changes are written by a background thread once they are max_interval
+seconds old, or right away after max_operations changing actions.
+flush()/close() write any pending changes immediately (used on exit and
+death).
+"""
+
+import copy
+import threading
+import time
+
+import character_manager
+
+# Flush pending changes once they are this many seconds old
+DEFAULT_MAX_INTERVAL = 30.0
+
+# ...or once this many actions have changed the character
+DEFAULT_MAX_OPERATIONS = 10
+
+# Fields that make up a character's saved state
+SNAPSHOT_FIELDS = (
+    "level", "health", "max_health", "strength", "magic", "experience", "gold"
+)
+SNAPSHOT_LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+def take_snapshot(character):
+    """
+    Capture the parts of a character that end up in its save
+
+    Returns: Tuple that compares equal only if the saved state is the same
+    """
+    return (
+        tuple(character[field] for field in SNAPSHOT_FIELDS)
+        + tuple(tuple(character[field]) for field in SNAPSHOT_LIST_FIELDS)
+    )
+
+class AutosaveScheduler:
+    """
+    Decides when to save a character, and saves it
+
+    Args:
+        character: Character to watch
+        save_function: Called with a copy of the character to save it
+                       (default: character_manager.save_character)
+        max_interval: Seconds a change may wait before it is saved
+                      (None = only save on max_operations or flush)
+        max_operations: Changing actions before an immediate save
+                        (None = no limit)
+        background: Start a background thread for the time-based policy
+    """
+
+    def __init__(self, character, save_function=None,
+                 max_interval=DEFAULT_MAX_INTERVAL,
+                 max_operations=DEFAULT_MAX_OPERATIONS, background=True):
+        self.character = character
+        self.save_function = save_function or character_manager.save_character
+        self.max_interval = max_interval
+        self.max_operations = max_operations
+
+        self.saves = 0
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._saved_snapshot = take_snapshot(character)
+        self._pending = None
+        self._pending_since = None
+        self._pending_operations = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+        if background and max_interval is not None:
+            self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self._thread.start()
+
+    @property
+    def dirty(self):
+        """True if there are changes that have not been saved yet"""
+        return self._pending is not None
+
+    def mark_action(self):
+        """
+        Record that a game action finished
+
+        Returns: True if the character changed since the last save
+        """
+        snapshot = take_snapshot(self.character)
+        flush_now = False
+        with self._lock:
+            if snapshot == self._saved_snapshot:
+                # Unchanged (or changed and then changed back)
+                self._pending = None
+                self._pending_since = None
+                self._pending_operations = 0
+                return False
+            if self._pending is not None and snapshot == self._pending[0]:
+                return True
+            # Copy now so the background thread never reads a character
+            # that the game is in the middle of changing
+            self._pending = (snapshot, copy.deepcopy(self.character))
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            self._pending_operations += 1
+            if self.max_operations is not None and self._pending_operations >= self.max_operations:
+                flush_now = True
+
+        if flush_now:
+            self.flush()
+        return True
+
+    def flush(self):
+        """
+        Save pending changes now
+
+        Returns: True if something was saved, False if there was nothing to save
+        Raises: Whatever the save function raises (the changes stay pending)
+        """
+        with self._lock:
+            if self._pending is None:
+                return False
+            snapshot, character_copy = self._pending
+            self.save_function(character_copy)
+            self._saved_snapshot = snapshot
+            self._pending = None
+            self._pending_since = None
+            self._pending_operations = 0
+            self.saves += 1
+            self.last_error = None
+            return True
+
+    def close(self):
+        """
+        Stop the background thread and save any pending changes
+
+        Returns: True if something was saved
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.flush()
+
+    def _run(self):
+        """Background thread: save changes once they are old enough"""
+        check_every = min(1.0, self.max_interval)
+        while not self._stop.wait(check_every):
+            since = self._pending_since
+            if since is None or time.monotonic() - since < self.max_interval:
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                # Keep the changes pending and let the game report the error
+                self.last_error = e
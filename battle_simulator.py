@@ -0,0 +1,219 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Simulator Module
+
+Runs large numbers of battles at once for balance tuning.
+
+Every battle in a simulation is one slot in a set of parallel NumPy arrays,
+and each turn advances all unfinished battles together. The rules mirror
+SimpleBattle in combat_system (basic attack, class special abilities and
+the 50% escape chance), and character/enemy stats come straight from
+character_manager.create_character and combat_system.create_enemy, so
+balance changes there show up here automatically.
+
+Requires NumPy.
+"""
+
+import numpy as np
+
+import character_manager
+import combat_system
+from combat_system import CHARACTER_CLASSES
+
+POLICIES = ("attack", "ability", "run")
+
+# Battle outcomes stored in the outcome array
+ONGOING = 0
+PLAYER_WON = 1
+ENEMY_WON = 2
+ESCAPED = 3
+
+# Stop a battle that has not finished after this many turns (for example a
+# Cleric healing through a goblin's attacks forever)
+DEFAULT_MAX_TURNS = combat_system.SIMULATION_MAX_TURNS
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def simulate_battles(character_class, enemy_type, level=1, n=10000,
+                     policy="attack", seed=None, max_turns=DEFAULT_MAX_TURNS,
+                     rng=None):
+    """
+    Simulate n independent battles of one matchup
+
+    Args:
+        character_class: Warrior, Mage, Rogue or Cleric
+        enemy_type: Any type accepted by combat_system.create_enemy
+        level: Character level
+        n: Number of battles
+        policy: "attack", "ability" or "run" (action used every turn)
+        seed: Seed for the random number generator (None = random)
+        max_turns: Battles still going after this many turns are unfinished
+        rng: numpy Generator to use instead of creating one from seed
+
+    Returns: Summary dictionary (see summarize_battles)
+    Raises: ValueError for an unknown policy or n < 1
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}'. Choose from {', '.join(POLICIES)}.")
+    if n < 1:
+        raise ValueError("Number of battles must be at least 1.")
+    if rng is None:
+        rng = np.random.default_rng(seed)
+
+    character = character_manager.create_character_at_level("Simulated", character_class, level)
+    enemy = combat_system.create_enemy(enemy_type)
+
+    # Damage is fixed per matchup; only rogue crits and escapes are random
+    player_damage = max(1, character['strength'] - enemy['strength'] // 4)
+    enemy_damage = max(1, enemy['strength'] - character['strength'] // 4)
+
+    character_hp = np.full(n, character['health'], dtype=np.int32)
+    enemy_hp = np.full(n, enemy['health'], dtype=np.int32)
+    turns = np.zeros(n, dtype=np.int32)
+    outcome = np.zeros(n, dtype=np.int8)
+
+    # Indices of battles that are still going
+    live = np.arange(n)
+    cls = character_class.lower()
+
+    for turn in range(1, max_turns + 1):
+        if live.size == 0:
+            break
+        turns[live] = turn
+
+        # --- Player turn ---
+        if policy == "run":
+            escaped = rng.random(live.size) < 0.5
+            outcome[live[escaped]] = ESCAPED
+            live = live[~escaped]
+        elif policy == "ability" and cls == "cleric":
+            character_hp[live] = np.minimum(character['max_health'], character_hp[live] + 30)
+        else:
+            if policy == "attack":
+                damage = player_damage
+            elif cls == "warrior":
+                damage = character['strength'] * 2
+            elif cls == "mage":
+                damage = character['magic'] * 2
+            elif cls == "rogue":
+                crit = rng.random(live.size) < 0.5
+                damage = np.where(crit, character['strength'] * 3, character['strength'])
+            else:
+                damage = 0
+            hp = np.maximum(0, enemy_hp[live] - damage)
+            enemy_hp[live] = hp
+            won = hp <= 0
+            outcome[live[won]] = PLAYER_WON
+            live = live[~won]
+
+        # --- Enemy turn ---
+        if live.size:
+            hp = np.maximum(0, character_hp[live] - enemy_damage)
+            character_hp[live] = hp
+            lost = hp <= 0
+            outcome[live[lost]] = ENEMY_WON
+            live = live[~lost]
+
+    return summarize_battles(
+        outcome, turns, character_hp, enemy_hp,
+        character_class=character_class, enemy_type=enemy_type,
+        level=level, policy=policy
+    )
+
+def simulate_matchups(levels=(1,), n=10000, policy="attack", seed=None,
+                      character_classes=CHARACTER_CLASSES, enemy_types=None,
+                      max_turns=DEFAULT_MAX_TURNS):
+    """
+    Simulate every class against every enemy type at every level
+
+    All matchups share one random number generator, so the whole grid is
+    reproducible from a single seed. enemy_types defaults to every enemy
+    in the enemy registry (see combat_system.get_enemy_types), the same
+    set battle_sweep covers.
+
+    Returns: List of summary dictionaries, one per matchup
+    """
+    if enemy_types is None:
+        enemy_types = combat_system.get_enemy_types()
+    rng = np.random.default_rng(seed)
+    results = []
+    for level in levels:
+        for character_class in character_classes:
+            for enemy_type in enemy_types:
+                results.append(simulate_battles(
+                    character_class, enemy_type, level=level, n=n,
+                    policy=policy, max_turns=max_turns, rng=rng
+                ))
+    return results
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+def summarize_battles(outcome, turns, character_hp, enemy_hp, **matchup):
+    """
+    Turn per-battle result arrays into summary statistics
+
+    Returns: Dictionary with the matchup fields plus:
+            battles, wins, losses, escapes, unfinished, win_rate, escape_rate,
+            turns (distribution of battle length),
+            turns_to_kill (battle length of wins only),
+            hp_remaining (character HP left after wins),
+            enemy_hp_remaining (enemy HP left after losses)
+    """
+    n = int(outcome.size)
+    won = outcome == PLAYER_WON
+    lost = outcome == ENEMY_WON
+
+    summary = dict(matchup)
+    summary.update({
+        "battles": n,
+        "wins": int(np.count_nonzero(won)),
+        "losses": int(np.count_nonzero(lost)),
+        "escapes": int(np.count_nonzero(outcome == ESCAPED)),
+        "unfinished": int(np.count_nonzero(outcome == ONGOING)),
+    })
+    summary["win_rate"] = summary["wins"] / n
+    summary["escape_rate"] = summary["escapes"] / n
+    summary["turns"] = describe_distribution(turns)
+    summary["turns_to_kill"] = describe_distribution(turns[won])
+    summary["hp_remaining"] = describe_distribution(character_hp[won])
+    summary["enemy_hp_remaining"] = describe_distribution(enemy_hp[lost])
+    return summary
+
+def describe_distribution(values):
+    """
+    Describe an integer array with plain Python numbers
+
+    Returns: Dictionary with count, mean, min, p10, p50, p90, max and a
+             histogram list (histogram[v] = how many values equal v).
+             Empty arrays give count 0 and None for everything else.
+    """
+    if values.size == 0:
+        return {"count": 0, "mean": None, "min": None, "p10": None,
+                "p50": None, "p90": None, "max": None, "histogram": []}
+
+    p10, p50, p90 = np.percentile(values, (10, 50, 90))
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "min": int(values.min()),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+        "max": int(values.max()),
+        "histogram": np.bincount(values).tolist(),
+    }
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE SIMULATOR TEST ===")
+
+    for result in simulate_matchups(levels=(1, 3, 6), n=100000, policy="ability", seed=163):
+        print(f"Lvl {result['level']} {result['character_class']:8} vs {result['enemy_type']:7}"
+              f" win rate {result['win_rate']:.1%}, avg turns {result['turns']['mean']:.1f}")
@@ -0,0 +1,245 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Sweep Module
+
+Runs balance sweeps over a grid of class x enemy x level x policy using
+every CPU core.
+
+The grid is cut into fixed-size shards. Each shard gets its own random
+number generator seeded from the master seed and the shard's position in
+the grid (never from the worker that runs it), so results are identical
+no matter how many workers are used. Workers fight their battles with the
+headless engine from combat_system and send back only merged totals (win
+counts and turn histograms), never per-battle records.
+"""
+
+import hashlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import character_manager
+import combat_system
+from combat_system import CHARACTER_CLASSES
+
+# Turn limit so endless battles (a Cleric out-healing a goblin) count as draws
+DEFAULT_MAX_TURNS = combat_system.SIMULATION_MAX_TURNS
+
+# Battles per shard. Changing this changes which seed each battle gets,
+# so keep it fixed when comparing sweeps.
+DEFAULT_SHARD_SIZE = 1000
+
+# ============================================================================
+# GRID AND SHARDS
+# ============================================================================
+
+def build_grid(character_classes=CHARACTER_CLASSES, enemy_types=None,
+               levels=(1,), policies=("attack",)):
+    """
+    Build every (character_class, enemy_type, level, policy) combination
+
+    enemy_types defaults to every enemy in the enemy registry (see
+    combat_system.get_enemy_types), in data file order.
+
+    Returns: List of cell tuples in a fixed order
+    """
+    if enemy_types is None:
+        enemy_types = combat_system.get_enemy_types()
+    return [
+        (character_class, enemy_type, level, policy)
+        for character_class in character_classes
+        for enemy_type in enemy_types
+        for level in levels
+        for policy in policies
+    ]
+
+def plan_shards(grid, battles_per_cell, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Split every grid cell into shards of at most shard_size battles
+
+    Returns: List of (cell, shard_index, battle_count) tuples
+    """
+    shards = []
+    for cell in grid:
+        remaining = battles_per_cell
+        shard_index = 0
+        while remaining > 0:
+            count = min(shard_size, remaining)
+            shards.append((cell, shard_index, count))
+            remaining -= count
+            shard_index += 1
+    return shards
+
+def shard_seed(master_seed, cell, shard_index):
+    """
+    Derive the seed for one shard from the master seed
+
+    Uses a hash of the values (not Python's hash(), which changes between
+    processes), so every process derives the same seed.
+
+    Returns: Integer seed
+    """
+    key = f"{master_seed}|{'|'.join(str(part) for part in cell)}|{shard_index}"
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def new_totals():
+    """Return empty totals for one grid cell"""
+    return {
+        "battles": 0,
+        "wins": 0,
+        "losses": 0,
+        "escapes": 0,
+        "draws": 0,
+        "hp_remaining_total": 0,
+        "turn_histogram": {},
+    }
+
+def run_shard(shard, master_seed, max_turns=DEFAULT_MAX_TURNS):
+    """
+    Fight every battle in one shard
+
+    Returns: Totals dictionary for the shard's cell
+    """
+    (character_class, enemy_type, level, policy_name), shard_index, count = shard
+    rng = random.Random(shard_seed(master_seed, shard[0], shard_index))
+    policy = combat_system.BATTLE_POLICIES[policy_name]()
+    sink = combat_system.NullSink()
+
+    template = character_manager.create_character_at_level("Sweep", character_class, level)
+    totals = new_totals()
+    histogram = totals["turn_histogram"]
+
+    for _ in range(count):
+        character = template.copy()
+        battle = combat_system.SimpleBattle(
+            character, combat_system.create_enemy(enemy_type),
+            policy, sink, rng, max_turns
+        )
+        winner = battle.run()["winner"]
+
+        if winner == "player":
+            totals["wins"] += 1
+            totals["hp_remaining_total"] += character["health"]
+        elif winner == "enemy":
+            totals["losses"] += 1
+        elif winner == "escaped":
+            totals["escapes"] += 1
+        else:
+            totals["draws"] += 1
+        turns = battle.turn_counter
+        histogram[turns] = histogram.get(turns, 0) + 1
+
+    totals["battles"] = count
+    return totals
+
+def run_shard_group(shards, master_seed, max_turns=DEFAULT_MAX_TURNS):
+    """
+    Run several shards and merge their totals inside the worker
+
+    Returns: Dictionary {cell: totals}
+    """
+    results = {}
+    for shard in shards:
+        cell = shard[0]
+        if cell not in results:
+            results[cell] = new_totals()
+        merge_totals(results[cell], run_shard(shard, master_seed, max_turns))
+    return results
+
+def merge_totals(into, part):
+    """Add the totals in part into the totals in into"""
+    for key in ("battles", "wins", "losses", "escapes", "draws", "hp_remaining_total"):
+        into[key] += part[key]
+    histogram = into["turn_histogram"]
+    for turns, count in part["turn_histogram"].items():
+        histogram[turns] = histogram.get(turns, 0) + count
+
+# ============================================================================
+# SWEEP DRIVER
+# ============================================================================
+
+def run_sweep(grid, battles_per_cell=1000, master_seed=0, max_workers=None,
+              shard_size=DEFAULT_SHARD_SIZE, max_turns=DEFAULT_MAX_TURNS):
+    """
+    Simulate battles_per_cell battles for every cell of the grid
+
+    Args:
+        grid: List of (character_class, enemy_type, level, policy) cells
+        battles_per_cell: Battles to fight per cell
+        master_seed: Seed all shard seeds are derived from
+        max_workers: Worker processes (default: CPU count; 1 = no pool)
+        shard_size: Battles per shard
+        max_turns: Turn limit per battle before it counts as a draw
+
+    Returns: Dictionary {cell: summary} (see summarize_totals)
+    Raises: ValueError for an unknown policy name
+    """
+    for cell in grid:
+        if cell[3] not in combat_system.BATTLE_POLICIES:
+            raise ValueError(f"Unknown policy '{cell[3]}'.")
+
+    shards = plan_shards(grid, battles_per_cell, shard_size)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(shards)))
+
+    totals = {cell: new_totals() for cell in grid}
+
+    if max_workers == 1:
+        parts = [run_shard_group(shards, master_seed, max_turns)]
+    else:
+        # A few groups per worker keeps them all busy without sending
+        # back one result per shard
+        group_count = min(len(shards), max_workers * 4)
+        groups = [shards[i::group_count] for i in range(group_count)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parts = list(executor.map(
+                run_shard_group, groups,
+                [master_seed] * group_count, [max_turns] * group_count
+            ))
+
+    for part in parts:
+        for cell, cell_totals in part.items():
+            merge_totals(totals[cell], cell_totals)
+
+    return {cell: summarize_totals(cell_totals) for cell, cell_totals in totals.items()}
+
+def summarize_totals(totals):
+    """
+    Add rates and averages to merged totals
+
+    Returns: Dictionary with the totals (turn histogram sorted by turn count)
+             plus win_rate, escape_rate, mean_turns and mean_hp_remaining
+             (character HP left after wins, None if there were no wins)
+    """
+    battles = totals["battles"]
+    histogram = dict(sorted(totals["turn_histogram"].items()))
+    summary = dict(totals)
+    summary["turn_histogram"] = histogram
+    summary["win_rate"] = totals["wins"] / battles if battles else 0.0
+    summary["escape_rate"] = totals["escapes"] / battles if battles else 0.0
+    summary["mean_turns"] = (
+        sum(turns * count for turns, count in histogram.items()) / battles
+        if battles else 0.0
+    )
+    summary["mean_hp_remaining"] = (
+        totals["hp_remaining_total"] / totals["wins"] if totals["wins"] else None
+    )
+    return summary
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE SWEEP TEST ===")
+
+    sweep_grid = build_grid(levels=(1, 3, 6), policies=("attack", "ability"))
+    results = run_sweep(sweep_grid, battles_per_cell=2000, master_seed=163)
+    for (cls, enemy, lvl, pol), summary in results.items():
+        print(f"Lvl {lvl} {cls:8} vs {enemy:7} [{pol:7}] win rate {summary['win_rate']:.1%}"
+              f", avg turns {summary['mean_turns']:.1f}")
@@ -0,0 +1,315 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Module
+
+Times the main subsystems at several data scales.
+
+Each benchmark builds its data for one scale (quest and item files, save
+files, a quest catalog, ...) in a temporary directory with
+content_generator, then times one batch of operations a few times and
+keeps the best run. Results are JSON, so a run can be saved and later
+used as the baseline for another run:
+
+    python benchmark.py --output baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.15
+
+With --compare, every benchmark that got slower than the baseline by more
+than the threshold is reported and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import character_manager
+import combat_system
+import content_generator
+import game_data
+import inventory_system
+import quest_handler
+
+# Data sizes each benchmark is run at (what "size" means depends on the
+# benchmark: quests or items in a file, saved characters, battles, ...)
+DEFAULT_SCALES = (100, 1000, 10000)
+
+# Timed runs per benchmark and scale (the fastest one is reported)
+DEFAULT_REPEAT = 5
+
+# A benchmark counts as a regression if its time per operation grows by
+# more than this fraction
+DEFAULT_THRESHOLD = 0.10
+
+# Random seed for all generated data, so runs are comparable
+DATA_SEED = 163
+
+# ============================================================================
+# TEST DATA
+# ============================================================================
+
+def veteran_character(name, completed_quests):
+    """A character with a long quest history and a few items"""
+    character = character_manager.create_character(name, "Warrior")
+    for index in range(completed_quests):
+        character["completed_quests"].append(f"quest_{index}")
+    for item_id in ("health_potion", "iron_sword", "health_potion"):
+        character["inventory"].append(item_id)
+    return character
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+# Each benchmark takes (scale, work_dir) and returns (run, operations):
+# run() does one timed batch of work and operations is how many operations
+# that batch counts as.
+
+def bench_load_quests(scale, work_dir):
+    """game_data.load_quests on a file of scale quests"""
+    filename = os.path.join(work_dir, "quests.txt")
+    content_generator.write_quests(filename, scale, shape="random", seed=DATA_SEED)
+    return (lambda: game_data.load_quests(filename)), 1
+
+def bench_load_items(scale, work_dir):
+    """game_data.load_items on a file of scale items"""
+    filename = os.path.join(work_dir, "items.txt")
+    content_generator.write_items(filename, scale, seed=DATA_SEED)
+    return (lambda: game_data.load_items(filename)), 1
+
+def bench_save_character(scale, work_dir):
+    """character_manager.save_character with scale completed quests (no fsync)"""
+    character = veteran_character("Saver", scale)
+
+    def run():
+        for _ in range(20):
+            # Change the character so every save is really written
+            character["gold"] += 1
+            character_manager.save_character(character, work_dir, fsync=False)
+    return run, 20
+
+def bench_load_character(scale, work_dir):
+    """character_manager.load_character with scale completed quests"""
+    character_manager.save_character(veteran_character("Loader", scale), work_dir, fsync=False)
+
+    def run():
+        for _ in range(20):
+            character_manager.load_character("Loader", work_dir)
+    return run, 20
+
+def bench_list_saved_characters(scale, work_dir):
+    """character_manager.list_saved_characters with scale save files"""
+    content_generator.write_saves(work_dir, scale, seed=DATA_SEED, quest_count=20)
+    return (lambda: character_manager.list_saved_characters(work_dir)), 1
+
+def bench_battles(scale, work_dir):
+    """scale headless SimpleBattle fights (level 3 Rogue vs orc, abilities)"""
+    template = character_manager.create_character_at_level("Fighter", "Rogue", 3)
+    policy = combat_system.AbilityPolicy()
+    sink = combat_system.NullSink()
+
+    def run():
+        rng = random.Random(DATA_SEED)
+        for _ in range(scale):
+            combat_system.SimpleBattle(
+                template.copy(), combat_system.create_enemy("orc"), policy, sink, rng, 500
+            ).run()
+    return run, scale
+
+def bench_inventory_cycle(scale, work_dir):
+    """scale rounds of add, equip, unequip and remove on one character"""
+    character = character_manager.create_character("Packer", "Warrior")
+    sword = {"item_id": "iron_sword", "type": "weapon", "effect": "strength:5", "cost": 100}
+    sword["effects"] = game_data.compile_item_effect(sword["effect"])
+
+    def run():
+        for _ in range(scale):
+            inventory_system.add_item_to_inventory(character, "iron_sword")
+            inventory_system.equip_weapon(character, "iron_sword", sword)
+            inventory_system.unequip_weapon(character)
+            inventory_system.remove_item_from_inventory(character, "iron_sword")
+    return run, scale
+
+def bench_available_quests(scale, work_dir):
+    """quest_handler.get_available_quests on a catalog of scale quests"""
+    filename = os.path.join(work_dir, "quests.txt")
+    content_generator.write_quests(filename, scale, shape="random", seed=DATA_SEED)
+    catalog = game_data.load_quests(filename)
+    character = character_manager.create_character_at_level("Seeker", "Cleric", 10)
+    for quest_id in catalog.graph.order[:scale // 2]:
+        character["completed_quests"].append(quest_id)
+    # Build the character's frontier before timing
+    quest_handler.get_available_quests(character, catalog)
+
+    def run():
+        for _ in range(20):
+            quest_handler.get_available_quests(character, catalog)
+    return run, 20
+
+# {name: benchmark function}, run in this order
+BENCHMARKS = {
+    "game_data.load_quests": bench_load_quests,
+    "game_data.load_items": bench_load_items,
+    "character_manager.save_character": bench_save_character,
+    "character_manager.load_character": bench_load_character,
+    "character_manager.list_saved_characters": bench_list_saved_characters,
+    "combat_system.SimpleBattle": bench_battles,
+    "inventory_system.equip_cycle": bench_inventory_cycle,
+    "quest_handler.get_available_quests": bench_available_quests,
+}
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def time_benchmark(benchmark, scale, repeat=DEFAULT_REPEAT):
+    """
+    Time one benchmark at one scale in a fresh temporary directory
+
+    Returns: Dictionary with best and median seconds per run, operations
+             per run, seconds per operation and operations per second
+    """
+    work_dir = tempfile.mkdtemp(prefix="quest_bench_")
+    previous_backend = character_manager.set_save_backend(None)
+    try:
+        run, operations = benchmark(scale, work_dir)
+        run()  # warm-up (caches, first-use setup)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+    finally:
+        character_manager.set_save_backend(previous_backend)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    best = min(times)
+    return {
+        "scale": scale,
+        "operations": operations,
+        "best": best,
+        "median": statistics.median(times),
+        "per_op": best / operations,
+        "ops_per_sec": operations / best if best > 0 else None,
+    }
+
+def run_benchmarks(scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, only=None, progress=None):
+    """
+    Run every benchmark (or those whose name contains only) at every scale
+
+    Args:
+        scales: Data sizes to run at
+        repeat: Timed runs per benchmark and scale
+        only: Substring to select benchmarks by name (None = all)
+        progress: Function called with each result key as it finishes
+
+    Returns: JSON-ready dictionary {"meta": {...}, "results": {key: timing}}
+             where key is "name[scale]"
+    """
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if only is not None and only not in name:
+            continue
+        for scale in scales:
+            key = f"{name}[{scale}]"
+            results[key] = time_benchmark(benchmark, scale, repeat)
+            if progress is not None:
+                progress(key)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "scales": list(scales),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare a run with a baseline run
+
+    Only benchmarks present in both runs are compared, by time per
+    operation.
+
+    Returns: List of dictionaries {name, baseline, current, ratio,
+             regression}, slowest change first; ratio is current/baseline
+    """
+    rows = []
+    baseline_results = baseline["results"]
+    for key, timing in current["results"].items():
+        old = baseline_results.get(key)
+        if old is None or not old["per_op"]:
+            continue
+        ratio = timing["per_op"] / old["per_op"]
+        rows.append({
+            "name": key,
+            "baseline": old["per_op"],
+            "current": timing["per_op"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    rows.sort(key=lambda row: row["ratio"], reverse=True)
+    return rows
+
+def format_comparison(rows):
+    """Format compare_results output as a text table"""
+    lines = [f"{'benchmark':60} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['name']:60} {row['baseline'] * 1e6:10.1f}us {row['current'] * 1e6:10.1f}us"
+            f" {row['ratio'] - 1:+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv=None):
+    """
+    Run the benchmarks from the command line
+
+    Returns: Exit status (1 if --compare found a regression, else 0)
+    """
+    parser = argparse.ArgumentParser(description="Quest Chronicles benchmarks")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated data sizes (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="timed runs per benchmark (default: %(default)s)")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+    current = run_benchmarks(scales, args.repeat, args.only,
+                             progress=lambda key: print(f"done {key}", file=sys.stderr))
+
+    text = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_results(current, baseline, args.threshold)
+        print(format_comparison(rows), file=sys.stderr)
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,14 @@ AI Usage: Implemented with ChatGPT assistance
 This module handles character creation, loading, and saving.
 """
 
+import hashlib
+import math
 import os
+import tempfile
+from bisect import bisect_right
+from inventory_system import Inventory
+from quest_graph import QuestLog
+from records import Character
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -18,6 +25,22 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# Where save_character/load_character/list_saved_characters/delete_character
+# keep their data. None means one text file per character in save_directory
+# (the original format). Anything else is a backend object with save(),
+# load(), list_names() and delete() methods, such as
+# save_store.SQLiteSaveStore. Use set_save_backend() to change it.
+_save_backend = None
+
+# Digest of the last save written to each save file, so that saving a
+# character that has not changed costs no disk I/O
+_last_saved_digest = {}
+
+# Custom XP curve: tuple where entry i is the total XP needed to reach
+# level i + 1. None means the default curve (level L -> L + 1 costs L * 100).
+# Use set_xp_curve() to change it.
+_xp_curve = None
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -28,7 +51,7 @@ def create_character(name, character_class):
     
     Valid classes: Warrior, Mage, Rogue, Cleric
     
-    Returns: Dictionary with character data including:
+    Returns: Character record (used like a dictionary) with:
             - name, class, level, health, max_health, strength, magic
             - experience, gold, inventory, active_quests, completed_quests
     
@@ -46,24 +69,39 @@ def create_character(name, character_class):
 
     base = valid_classes[character_class]
 
-    character = {
-        "name": name,
-        "class": character_class,
-        "level": 1,
-        "health": base["health"],
-        "max_health": base["health"],
-        "strength": base["strength"],
-        "magic": base["magic"],
-        "experience": 0,
-        "gold": 100,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
-    }
+    character = Character(
+        name=name,
+        character_class=character_class,
+        level=1,
+        health=base["health"],
+        max_health=base["health"],
+        strength=base["strength"],
+        magic=base["magic"],
+        experience=0,
+        gold=100,
+        inventory=Inventory(),
+        active_quests=QuestLog(),
+        completed_quests=QuestLog()
+    )
 
     return character
 
-def save_character(character, save_directory="data/save_games"):
+def create_character_at_level(name, character_class, level):
+    """
+    Create a new character that has already reached a level
+    
+    Grants exactly the XP needed to reach the level, so the normal
+    level-up rules apply. Used for simulations and testing.
+    
+    Returns: Character dictionary at full health with 0 leftover XP
+    Raises: InvalidCharacterClassError if class is not valid
+    """
+    character = create_character(name, character_class)
+    if level > 1:
+        gain_experience(character, total_xp_for_level(level))
+    return character
+
+def save_character(character, save_directory="data/save_games", fsync=True):
     """
     Save character to file
     
@@ -83,46 +121,145 @@ def save_character(character, save_directory="data/save_games"):
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
     
+    The file is written atomically (see write_file_atomically), so a crash
+    never leaves a truncated save. If the character has not changed since
+    the last save to the same file, nothing is written. Pass fsync=False to
+    skip flushing to disk (faster, but a power cut may lose the save).
+    
+    If a save backend is set (see set_save_backend), the character is saved
+    there instead and save_directory is ignored.
+    
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
     """
+    if _save_backend is not None:
+        return _save_backend.save(character)
+
     if not os.path.exists(save_directory):
         os.makedirs(save_directory)
 
     filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+    text = serialize_character(character)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
 
-    try:
-        with open(filename, "w") as file:
-            file.write(f"NAME: {character['name']}\n")
-            file.write(f"CLASS: {character['class']}\n")
-            file.write(f"LEVEL: {character['level']}\n")
-            file.write(f"HEALTH: {character['health']}\n")
-            file.write(f"MAX_HEALTH: {character['max_health']}\n")
-            file.write(f"STRENGTH: {character['strength']}\n")
-            file.write(f"MAGIC: {character['magic']}\n")
-            file.write(f"EXPERIENCE: {character['experience']}\n")
-            file.write(f"GOLD: {character['gold']}\n")
-            file.write(f"INVENTORY: {','.join(character['inventory']) if character['inventory'] else ''}\n")
-            file.write(f"ACTIVE_QUESTS: {','.join(character['active_quests']) if character['active_quests'] else ''}\n")
-            file.write(f"COMPLETED_QUESTS: {','.join(character['completed_quests']) if character['completed_quests'] else ''}\n")
-    except Exception as e:
-        raise e
+    # Skip the write if this exact save is already on disk
+    if _last_saved_digest.get(filename) == digest and os.path.exists(filename):
+        return True
 
+    write_file_atomically(filename, text, fsync)
+    _last_saved_digest[filename] = digest
     return True
 
+def serialize_character(character):
+    """
+    Build the full text of a character's save file (see save_character)
+    
+    Returns: String with one 'KEY: value' line per field
+    """
+    return (
+        f"NAME: {character['name']}\n"
+        f"CLASS: {character['class']}\n"
+        f"LEVEL: {character['level']}\n"
+        f"HEALTH: {character['health']}\n"
+        f"MAX_HEALTH: {character['max_health']}\n"
+        f"STRENGTH: {character['strength']}\n"
+        f"MAGIC: {character['magic']}\n"
+        f"EXPERIENCE: {character['experience']}\n"
+        f"GOLD: {character['gold']}\n"
+        f"INVENTORY: {','.join(character['inventory'])}\n"
+        f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n"
+        f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n"
+    )
+
+def write_file_atomically(filename, text, fsync=True):
+    """
+    Replace a file's contents so that a crash never leaves it half-written
+    
+    The text is written with one write call to a temporary file in the same
+    directory, flushed to disk (if fsync is True) and then renamed over the
+    target. Readers see either the old file or the new one, never a mix.
+    Every call gets its own temporary file, so threads saving the same file
+    at once cannot clobber each other's half-written data.
+    
+    Raises: OSError (PermissionError, IOError, ...) if the write fails
+    """
+    data = text.encode("utf-8")
+    fd, temp_name = tempfile.mkstemp(
+        prefix=os.path.basename(filename) + ".",
+        suffix=".tmp",
+        dir=os.path.dirname(filename) or ".",
+    )
+    try:
+        try:
+            if hasattr(os, "fchmod"):
+                # mkstemp creates the file readable by its owner only
+                os.fchmod(fd, 0o644)
+            written = os.write(fd, data)
+            while written < len(data):
+                # os.write may write less than asked for (rare for files)
+                written += os.write(fd, data[written:])
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temp_name, filename)
+    except OSError:
+        try:
+            os.remove(temp_name)
+        except OSError:
+            pass
+        raise
+
+    if fsync:
+        # Make the rename itself durable (not supported on every platform)
+        try:
+            dir_fd = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
 def load_character(character_name, save_directory="data/save_games"):
+    """
+    Load a character from its save
+    
+    Uses the save backend if one is set (see set_save_backend), otherwise
+    the {character_name}_save.txt file in save_directory.
+    
+    Returns: Character dictionary
+    Raises:
+        CharacterNotFoundError if there is no save for the character
+        SaveFileCorruptedError if the save cannot be read
+        InvalidSaveDataError if the save contents are invalid
+    """
+    if _save_backend is not None:
+        return _save_backend.load(character_name)
+
     filename = os.path.join(save_directory, f"{character_name}_save.txt")
 
     if not os.path.exists(filename):
         raise CharacterNotFoundError(f"No save file found for {character_name}")
 
     try:
-        with open(filename, "r") as file:
+        with open(filename, "r", encoding="utf-8") as file:
             lines = file.readlines()
     except:
         raise SaveFileCorruptedError(f"Could not read save file for {character_name}")
 
-    character = {}
+    return parse_character_lines(lines)
+
+def parse_character_lines(lines):
+    """
+    Turn the lines of a text save (see save_character) into a character
+    
+    Returns: Validated character dictionary
+    Raises: InvalidSaveDataError if the lines are not a valid save
+    """
+    character = Character.from_mapping()
 
     try:
         for line in lines:
@@ -142,8 +279,10 @@ def load_character(character_name, save_directory="data/save_games"):
             # --------------------------------------------
 
             # Lists
-            if key in ("INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"):
-                character[key.lower()] = value.split(",") if value else []
+            if key == "INVENTORY":
+                character["inventory"] = Inventory(value.split(",") if value else ())
+            elif key in ("ACTIVE_QUESTS", "COMPLETED_QUESTS"):
+                character[key.lower()] = QuestLog(value.split(",") if value else ())
 
             # Integers
             elif key in ("LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"):
@@ -165,6 +304,9 @@ def list_saved_characters(save_directory="data/save_games"):
     
     Returns: List of character names (without _save.txt extension)
     """
+    if _save_backend is not None:
+        return _save_backend.list_names()
+
     if not os.path.exists(save_directory):
         return []
 
@@ -182,14 +324,99 @@ def delete_character(character_name, save_directory="data/save_games"):
     Returns: True if deleted successfully
     Raises: CharacterNotFoundError if character doesn't exist
     """
+    if _save_backend is not None:
+        return _save_backend.delete(character_name)
+
     filename = os.path.join(save_directory, f"{character_name}_save.txt")
 
     if not os.path.exists(filename):
         raise CharacterNotFoundError(f"No save file for {character_name}")
 
     os.remove(filename)
+    _last_saved_digest.pop(filename, None)
     return True
 
+def set_save_backend(backend):
+    """
+    Choose where characters are saved
+    
+    Args:
+        backend: Object with save(character), load(name), list_names() and
+                 delete(name) methods, or None for per-character text files
+    
+    Returns: The previous backend (so callers can restore it)
+    """
+    global _save_backend
+    previous = _save_backend
+    _save_backend = backend
+    return previous
+
+def get_save_backend():
+    """Return the current save backend (None means text files)"""
+    return _save_backend
+
+# ============================================================================
+# XP CURVE
+# ============================================================================
+
+def total_xp_for_level(level):
+    """
+    Total XP needed to get from level 1 to level
+    
+    Default curve: 100 + 200 + ... + (level - 1) * 100 = 50 * level * (level - 1)
+    
+    Returns: Integer XP
+    Raises: ValueError if a custom curve does not go up to level
+    """
+    if _xp_curve is None:
+        return 50 * level * (level - 1)
+    if level > len(_xp_curve):
+        raise ValueError(f"XP curve only goes up to level {len(_xp_curve)}.")
+    return _xp_curve[level - 1]
+
+def level_for_total_xp(total_xp):
+    """
+    Highest level reached with total_xp XP (counted from level 1)
+    
+    Default curve: largest L with 50 * L * (L - 1) <= total_xp, found with an
+    integer square root. Custom curves use a binary search.
+    
+    Returns: Integer level (at least 1)
+    """
+    if total_xp < 0:
+        return 1
+    if _xp_curve is None:
+        return (1 + math.isqrt(4 * (total_xp // 50) + 1)) // 2
+    return bisect_right(_xp_curve, total_xp)
+
+def set_xp_curve(thresholds=None):
+    """
+    Use a custom XP curve (or the default curve again with None)
+    
+    Args:
+        thresholds: Total XP needed to reach each level, starting with 0 for
+                    level 1, strictly increasing. Characters stop leveling
+                    at the last level in the table.
+    
+    Returns: The previous curve (None for the default)
+    Raises: ValueError if the table is invalid
+    """
+    global _xp_curve
+    if thresholds is not None:
+        thresholds = tuple(thresholds)
+        if not thresholds or thresholds[0] != 0:
+            raise ValueError("XP curve must start with 0 for level 1.")
+        for lower, higher in zip(thresholds, thresholds[1:]):
+            if not isinstance(higher, int) or higher <= lower:
+                raise ValueError("XP curve values must be strictly increasing integers.")
+    previous = _xp_curve
+    _xp_curve = thresholds
+    return previous
+
+def get_xp_curve():
+    """Return the current XP curve table (None means the default curve)"""
+    return _xp_curve
+
 # ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
@@ -199,13 +426,18 @@ def gain_experience(character, xp_amount):
     Add experience to character and handle level ups
     
     Level up formula: level_up_xp = current_level * 100
-    Example when leveling up:
+    (or the custom curve from set_xp_curve)
+    For every level gained:
     - Increase level by 1
     - Increase max_health by 10
     - Increase strength by 2
     - Increase magic by 2
     - Restore health to max_health
     
+    The new level is computed directly from the total XP, so a huge grant
+    costs the same as a small one.
+    
+    Returns: True if the character leveled up
     Raises: CharacterDeadError if character health is 0
     """
     if character["health"] <= 0:
@@ -213,18 +445,30 @@ def gain_experience(character, xp_amount):
 
     character["experience"] += xp_amount
 
-    leveled_up = False
+    level = character["level"]
+    if _xp_curve is not None and level >= len(_xp_curve):
+        # Already at the top of the custom curve
+        return False
+
+    base_xp = total_xp_for_level(level)
+    new_level = level_for_total_xp(base_xp + character["experience"])
+    if new_level <= level:
+        return False
+
+    gained = new_level - level
+    character["experience"] -= total_xp_for_level(new_level) - base_xp
+    character["level"] = new_level
+    character["max_health"] += 10 * gained
+    character["strength"] += 2 * gained
+    character["magic"] += 2 * gained
+    character["health"] = character["max_health"]
 
-    while character["experience"] >= character["level"] * 100:
-        character["experience"] -= character["level"] * 100
-        character["level"] += 1
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
-        character["health"] = character["max_health"]
-        leveled_up = True
+    # Quests waiting for a higher level may now be available
+    frontier = character.get("quest_frontier")
+    if frontier is not None:
+        frontier.level_changed()
 
-    return leveled_up
+    return True
 
 def add_gold(character, amount):
     """
@@ -288,7 +532,7 @@ def validate_character_data(character):
 
     list_fields = ["inventory", "active_quests", "completed_quests"]
     for field in list_fields:
-        if not isinstance(character[field], list):
+        if not isinstance(character[field], (list, Inventory, QuestLog)):
             raise InvalidSaveDataError(f"{field} must be a list")
 
     return True
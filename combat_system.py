@@ -9,135 +9,348 @@ AI Usage: [Document any AI assistance used]
 Handles combat mechanics
 """
 
+import json
+import os
+import random
+from collections import deque, namedtuple
+from itertools import accumulate
+
+import game_data
+from records import Character, Enemy, EnemyTemplate
+
 from custom_exceptions import (
     InvalidTargetError,
+    MissingDataFileError,
     CombatNotActiveError,
     CharacterDeadError,
-    AbilityOnCooldownError
+    AbilityOnCooldownError,
+    CorruptedDataError
 )
 
 # ============================================================================
 # ENEMY DEFINITIONS
 # ============================================================================
 
+class EnemyRegistry:
+    """
+    Every enemy type, with an index of which enemies appear at each level
+    
+    Built once from enemy templates (see game_data.load_enemies). The
+    templates are shared by every enemy created from them, and the enemy
+    pool for each level is worked out up front, so creating an enemy or
+    picking a random one never scans the enemy list.
+    """
+
+    def __init__(self, templates):
+        """
+        Args:
+            templates: EnemyTemplate records or enemy data dictionaries
+        """
+        self.templates = {}
+        for template in templates:
+            if not isinstance(template, EnemyTemplate):
+                template = EnemyTemplate(**template)
+            self.templates[template.enemy_id] = template
+
+        # Levels past the last one listed here all use the last pool
+        self.top_level = max(
+            [t.min_level for t in self.templates.values()]
+            + [t.max_level for t in self.templates.values() if t.max_level is not None]
+            + [1]
+        )
+        # _pools[level] = (templates, cumulative weights) for levels 1..top_level
+        self._pools = [None]
+        for level in range(1, self.top_level + 1):
+            members = tuple(
+                t for t in self.templates.values()
+                if t.min_level <= level and (t.max_level is None or level <= t.max_level)
+            )
+            if not members:
+                # A gap in the data: reuse the nearest lower level's enemies
+                self._pools.append(self._pools[-1])
+                continue
+            self._pools.append((members, tuple(accumulate(t.weight for t in members))))
+
+        # Leading levels with no enemies use the first level that has some
+        first = next((pool for pool in self._pools[1:] if pool), None)
+        self._pools = [pool or first for pool in self._pools]
+
+    def __len__(self):
+        return len(self.templates)
+
+    def __contains__(self, enemy_type):
+        return enemy_type in self.templates or enemy_type.lower() in self.templates
+
+    def get_template(self, enemy_type):
+        """
+        Look up the template for an enemy type (case-insensitive)
+        
+        Returns: EnemyTemplate
+        Raises: InvalidTargetError if enemy_type not recognized
+        """
+        template = self.templates.get(enemy_type)
+        if template is None:
+            template = self.templates.get(enemy_type.lower())
+            if template is None:
+                raise InvalidTargetError(f"Unknown enemy type '{enemy_type.lower()}'.")
+        return template
+
+    def templates_for_level(self, level):
+        """
+        Get the enemy templates that can appear at a level
+        
+        Returns: Tuple of EnemyTemplate (empty if there are no enemies)
+        """
+        pool = self._pools[min(max(level, 1), self.top_level)]
+        return pool[0] if pool else ()
+
+    def choose_template(self, level, rng=None):
+        """
+        Pick a random enemy template for a level, weighted by WEIGHT
+        
+        When only one enemy fits the level no random number is used.
+        
+        Returns: EnemyTemplate
+        Raises: InvalidTargetError if there are no enemies at all
+        """
+        pool = self._pools[min(max(level, 1), self.top_level)]
+        if pool is None:
+            raise InvalidTargetError("No enemies are defined.")
+        members, cum_weights = pool
+        if len(members) == 1:
+            return members[0]
+        if rng is None:
+            rng = random
+        return rng.choices(members, cum_weights=cum_weights)[0]
+
+# Loaded on first use (see get_enemy_registry)
+_enemy_registry = None
+
+def get_enemy_registry():
+    """
+    Get the enemy registry, loading it on first use
+    
+    Enemies come from data/enemies.txt. If that file does not exist the
+    built-in enemies (game_data.DEFAULT_ENEMIES) are used.
+    
+    Returns: EnemyRegistry
+    Raises: InvalidDataFormatError, CorruptedDataError for a bad enemies file
+    """
+    global _enemy_registry
+    if _enemy_registry is None:
+        try:
+            enemies = game_data.load_enemies()
+        except MissingDataFileError:
+            enemies = game_data.get_default_enemies()
+        _enemy_registry = EnemyRegistry(enemies.values())
+    return _enemy_registry
+
+def set_enemy_registry(registry=None):
+    """
+    Replace the enemy registry (for content packs and tests)
+    
+    Args:
+        registry: An EnemyRegistry, or None to load it again on next use
+    
+    Returns: The previous registry (or None if it was not loaded yet)
+    """
+    global _enemy_registry
+    previous = _enemy_registry
+    _enemy_registry = registry
+    return previous
+
 def create_enemy(enemy_type):
     """
     Create an enemy based on type
     
-    Example enemy types and stats:
+    Default enemy types and stats (see data/enemies.txt):
     - goblin: health=50, strength=8, magic=2, xp_reward=25, gold_reward=10
     - orc: health=80, strength=12, magic=5, xp_reward=50, gold_reward=25
     - dragon: health=200, strength=25, magic=15, xp_reward=200, gold_reward=100
     
-    Returns: Enemy dictionary
+    Returns: Enemy record (used like a dictionary) sharing its type's template
     Raises: InvalidTargetError if enemy_type not recognized
     """
-    enemy_type = enemy_type.lower()
-
-    stats = {
-        "goblin":  {"health": 50, "strength": 8,  "magic": 2,  "xp": 25,  "gold": 10},
-        "orc":     {"health": 80, "strength": 12, "magic": 5,  "xp": 50,  "gold": 25},
-        "dragon":  {"health": 200,"strength": 25, "magic": 15, "xp": 200, "gold": 100},
-    }
-
-    if enemy_type not in stats:
-        raise InvalidTargetError(f"Unknown enemy type '{enemy_type}'.")
+    registry = _enemy_registry if _enemy_registry is not None else get_enemy_registry()
+    return Enemy(registry.get_template(enemy_type))
 
-    s = stats[enemy_type]
-
-    return {
-        "name": enemy_type.capitalize(),
-        "health": s["health"],
-        "max_health": s["health"],
-        "strength": s["strength"],
-        "magic": s["magic"],
-        "xp_reward": s["xp"],
-        "gold_reward": s["gold"]
-    }
-
-def get_random_enemy_for_level(character_level):
+def get_random_enemy_for_level(character_level, rng=None):
     """
     Get an appropriate enemy for character's level
     
+    Default enemies:
     Level 1-2: Goblins
     Level 3-5: Orcs
     Level 6+: Dragons
     
-    Returns: Enemy dictionary
+    When several enemies fit a level one is picked at random using their
+    weights and rng (default: the random module).
+    
+    Returns: Enemy record
     """
-    if character_level <= 2:
-        return create_enemy("goblin")
-    elif character_level <= 5:
-        return create_enemy("orc")
-    else:
-        return create_enemy("dragon")
+    return Enemy(get_enemy_registry().choose_template(character_level, rng))
+
+def get_enemy_types():
+    """
+    Get every enemy type in the registry, in data file order
+    
+    Returns: Tuple of enemy ids (the default for simulations and sweeps)
+    """
+    return tuple(get_enemy_registry().templates)
 
 # ============================================================================
 # COMBAT SYSTEM
 # ============================================================================
 
+# Player actions (these match the numbers on the battle menu)
+ACTION_ATTACK = "1"
+ACTION_ABILITY = "2"
+ACTION_RUN = "3"
+
+# Battle events are plain tuples (turn, kind, actor, amount, detail), turned
+# into text only when a sink needs it (see render_event). Damage is the
+# amount of an attack or ability event.
+EVENT_START = "start"        # detail: enemy name
+EVENT_ATTACK = "attack"      # amount: damage dealt; detail: enemy name
+EVENT_ABILITY = "ability"    # amount: damage or healing; detail: ability
+EVENT_ESCAPE = "escape"      # amount: 1 if it worked, 0 if not
+EVENT_INVALID = "invalid"    # detail: the action that was not understood
+EVENT_DEATH = "death"        # actor: who died; detail: their name
+EVENT_REWARD = "reward"      # amount: XP; detail: gold
+
+# Who an event is about
+ACTOR_PLAYER = "player"
+ACTOR_ENEMY = "enemy"
+
+# Events an EventLog keeps by default
+DEFAULT_EVENT_LOG_SIZE = 64
+
 class SimpleBattle:
     """
     Simple turn-based combat system
     
-    Manages combat between character and enemy
+    Manages combat between character and enemy.
+
+    The player's action each turn comes from a policy object (anything with
+    a choose_action(battle) method) and battle events go to a sink object
+    (anything with record(event), show_stats() and heading() methods; an
+    optional verbose attribute, False if missing, asks for the stats and
+    headings every turn). By default the battle is interactive: the player
+    is asked at the terminal and events are printed as messages. Pass a
+    headless policy and sink to run battles with no terminal I/O at all.
+
+    The battle changes battle.character and battle.enemy in place, so a
+    policy or sink reading them always sees the current health. They can
+    be records (from character_manager.create_character and create_enemy)
+    or plain dicts.
+
+    Random rolls (escapes, rogue crits) come from rng, which defaults to the
+    global random module. Pass a seeded random.Random for repeatable battles.
+    max_turns stops a battle that never ends (it counts as a draw).
     """
     
-    def __init__(self, character, enemy):
+    def __init__(self, character, enemy, policy=None, sink=None, rng=None,
+                 max_turns=None):
         """Initialize battle with character and enemy"""
         self.character = character
         self.enemy = enemy
+        # The hot path reads a Character and an Enemy by attribute (much
+        # faster than their mapping interface) and anything else by key
+        self._by_attribute = type(character) is Character and type(enemy) is Enemy
         self.turn_counter = 0
         self.combat_active = True
+        # Result dictionary once the battle is over
+        self.result = None
+        self.policy = policy if policy is not None else InteractivePolicy()
+        self.sink = sink if sink is not None else ConsoleSink()
+        self.rng = rng if rng is not None else random
+        self.max_turns = max_turns
     
     def start_battle(self):
         """
         Start the combat loop
         
         Returns: Dictionary with battle results:
-                {'winner': 'player'|'enemy', 'xp_gained': int, 'gold_gained': int}
+                {'winner': 'player'|'enemy'|'escaped'|'draw', 'xp': int, 'gold': int}
         
         Raises: CharacterDeadError if character is already dead
         """
-        if self.character['health'] <= 0:
+        return self.run()
+
+    def run(self):
+        """
+        Run the battle to completion
+        
+        This is the battle engine. It only touches the terminal if the
+        policy or sink does, so with a headless policy and sink a full
+        battle is one tight loop.
+        
+        Returns: Same result dictionary as start_battle()
+        Raises: CharacterDeadError if character is already dead
+        """
+        character = self.character
+        enemy = self.enemy
+        by_attribute = self._by_attribute
+        if (character.health if by_attribute else character['health']) <= 0:
             raise CharacterDeadError("Character is dead, cannot fight.")
 
-        display_battle_log(f"Combat begins! A wild {self.enemy['name']} appears!")
+        sink = self.sink
+        policy = self.policy
+        verbose = getattr(sink, "verbose", False)
+        max_turns = self.max_turns
+        sink.record((0, EVENT_START, ACTOR_ENEMY, 0, enemy.name if by_attribute else enemy['name']))
 
         # Combat loop
         while self.combat_active:
-            display_combat_stats(self.character, self.enemy)
-
-            self.player_turn()
-            result = self.check_battle_end()
-            if result:
-                return self._finish_battle(result)
-
-            self.enemy_turn()
-            result = self.check_battle_end()
-            if result:
-                return self._finish_battle(result)
+            if max_turns is not None and self.turn_counter >= max_turns:
+                return self._finish_battle("draw")
+            self.turn_counter += 1
+            if verbose:
+                sink.show_stats(character, enemy)
+                sink.heading("Your Turn")
+
+            self._take_action(policy.choose_action(self))
+            if not self.combat_active:
+                return self._finish_battle("escaped")
+            if (enemy.health if by_attribute else enemy['health']) <= 0:
+                return self._finish_battle("player")
+
+            if verbose:
+                sink.heading("Enemy Turn")
+            self._enemy_attack()
+            if (character.health if by_attribute else character['health']) <= 0:
+                return self._finish_battle("enemy")
 
     def _finish_battle(self, result):
         """Handle end of battle logic."""
 
         self.combat_active = False
+        turn = self.turn_counter
+        by_attribute = self._by_attribute
 
         if result == "player":
-            rewards = get_victory_rewards(self.enemy)
-            display_battle_log(f"You defeated the {self.enemy['name']}!")
-            display_battle_log(f"Gained {rewards['xp']} XP and {rewards['gold']} gold!")
-            return {"winner": "player", **rewards}
+            enemy = self.enemy
+            rewards = get_victory_rewards(enemy)
+            name = enemy.name if by_attribute else enemy['name']
+            self.sink.record((turn, EVENT_DEATH, ACTOR_ENEMY, 0, name))
+            self.sink.record((turn, EVENT_REWARD, ACTOR_PLAYER, rewards["xp"], rewards["gold"]))
+            self.result = {"winner": "player", **rewards}
+
+        elif result in ("escaped", "draw"):
+            self.result = {"winner": result, "xp": 0, "gold": 0}
 
         else:
-            display_battle_log("You were defeated...")
-            return {"winner": "enemy", "xp": 0, "gold": 0}
+            character = self.character
+            name = character.name if by_attribute else character['name']
+            self.sink.record((turn, EVENT_DEATH, ACTOR_PLAYER, 0, name))
+            self.result = {"winner": "enemy", "xp": 0, "gold": 0}
+        return self.result
     
     def player_turn(self):
         """
         Handle player's turn
         
-        Displays options:
+        Gets one of these actions from the battle policy:
         1. Basic Attack
         2. Special Ability (if available)
         3. Try to Run
@@ -147,31 +360,45 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError()
 
-        print("\n--- Your Turn ---")
-        print("1. Basic Attack")
-        print("2. Special Ability")
-        print("3. Try to Run")
-
-        choice = input("Choose action: ").strip()
-
-        if choice == "1":
-            dmg = self.calculate_damage(self.character, self.enemy)
-            self.apply_damage(self.enemy, dmg)
-            display_battle_log(f"You attacked for {dmg} damage!")
-
-        elif choice == "2":
-            msg = use_special_ability(self.character, self.enemy)
-            display_battle_log(msg)
-
-        elif choice == "3":
-            if self.attempt_escape():
-                display_battle_log("You escaped the battle!")
-                self.combat_active = False
-                return
+        self.sink.heading("Your Turn")
+        self._take_action(self.policy.choose_action(self))
+
+    def _take_action(self, choice):
+        """Carry out one player action"""
+        if choice == ACTION_ATTACK:
+            # Same as calculate_damage() + apply_damage(), inlined because
+            # this is the hottest line in a headless battle
+            enemy = self.enemy
+            if self._by_attribute:
+                # One read of the shared template instead of a property
+                # per stat (the template is replaced if a stat is changed)
+                stats = enemy.template
+                dmg = self.character.strength - (stats.strength // 4)
+                if dmg < 1:
+                    dmg = 1
+                health = enemy.health - dmg
+                enemy.health = health if health > 0 else 0
+                name = stats.name
             else:
-                display_battle_log("Failed to escape!")
+                dmg = self.character['strength'] - (enemy['strength'] // 4)
+                if dmg < 1:
+                    dmg = 1
+                health = enemy['health'] - dmg
+                enemy['health'] = health if health > 0 else 0
+                name = enemy['name']
+            self.sink.record((self.turn_counter, EVENT_ATTACK, ACTOR_PLAYER, dmg, name))
+
+        elif choice == ACTION_ABILITY:
+            ability, amount = resolve_special_ability(self.character, self.enemy, self.rng)
+            self.sink.record((self.turn_counter, EVENT_ABILITY, ACTOR_PLAYER, amount, ability))
+
+        elif choice == ACTION_RUN:
+            escaped = self.attempt_escape()
+            self.sink.record((self.turn_counter, EVENT_ESCAPE, ACTOR_PLAYER, int(escaped), None))
+            if escaped:
+                self.combat_active = False
         else:
-            display_battle_log("Invalid choice! You lose your turn.")
+            self.sink.record((self.turn_counter, EVENT_INVALID, ACTOR_PLAYER, 0, choice))
     
     def enemy_turn(self):
         """
@@ -184,10 +411,29 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError()
 
-        print("\n--- Enemy Turn ---")
-        dmg = self.calculate_damage(self.enemy, self.character)
-        self.apply_damage(self.character, dmg)
-        display_battle_log(f"The {self.enemy['name']} hits you for {dmg} damage!")
+        self.sink.heading("Enemy Turn")
+        self._enemy_attack()
+
+    def _enemy_attack(self):
+        """The enemy hits the character"""
+        character = self.character
+        enemy = self.enemy
+        if self._by_attribute:
+            stats = enemy.template
+            dmg = stats.strength - (character.strength // 4)
+            if dmg < 1:
+                dmg = 1
+            health = character.health - dmg
+            character.health = health if health > 0 else 0
+            name = stats.name
+        else:
+            dmg = enemy['strength'] - (character['strength'] // 4)
+            if dmg < 1:
+                dmg = 1
+            health = character['health'] - dmg
+            character['health'] = health if health > 0 else 0
+            name = enemy['name']
+        self.sink.record((self.turn_counter, EVENT_ATTACK, ACTOR_ENEMY, dmg, name))
     
     def calculate_damage(self, attacker, defender):
         """
@@ -229,13 +475,389 @@ class SimpleBattle:
         
         Returns: True if escaped, False if failed
         """
-        return random.random() < 0.5
+        return self.rng.random() < 0.5
+
+# ============================================================================
+# BATTLE POLICIES
+# ============================================================================
+
+class InteractivePolicy:
+    """Ask the player at the terminal which action to take"""
+
+    def choose_action(self, battle):
+        print("1. Basic Attack")
+        print("2. Special Ability")
+        print("3. Try to Run")
+        return input("Choose action: ").strip()
+
+class AttackPolicy:
+    """Always use a basic attack"""
+
+    def choose_action(self, battle):
+        return ACTION_ATTACK
+
+class AbilityPolicy:
+    """Always use the class special ability"""
+
+    def choose_action(self, battle):
+        return ACTION_ABILITY
+
+class RunPolicy:
+    """Always try to run away"""
+
+    def choose_action(self, battle):
+        return ACTION_RUN
+
+class ScriptedPolicy:
+    """
+    Play a fixed list of actions in order
+    
+    Once the script runs out, falls back to a basic attack.
+    """
+
+    def __init__(self, actions):
+        self.actions = list(actions)
+        self.position = 0
+
+    def choose_action(self, battle):
+        if self.position >= len(self.actions):
+            return ACTION_ATTACK
+        action = self.actions[self.position]
+        self.position += 1
+        return action
+
+# Headless policies by name (used by simulations and sweeps)
+BATTLE_POLICIES = {
+    "attack": AttackPolicy,
+    "ability": AbilityPolicy,
+    "run": RunPolicy,
+}
+
+# Character classes simulations and sweeps cover by default
+CHARACTER_CLASSES = ("Warrior", "Mage", "Rogue", "Cleric")
+
+# Turn limit for simulated battles, so endless ones (a Cleric out-healing a
+# goblin) count as draws
+SIMULATION_MAX_TURNS = 500
+
+# ============================================================================
+# BATTLE SINKS
+# ============================================================================
+
+class ConsoleSink:
+    """Print battle messages and stats to the terminal"""
+
+    verbose = True
+
+    def record(self, event):
+        display_battle_log(render_event(event))
+
+    def show_stats(self, character, enemy):
+        display_combat_stats(character, enemy)
+
+    def heading(self, title):
+        print(f"\n--- {title} ---")
+
+class EventLog:
+    """
+    Keep the last maxlen battle events in a ring buffer
+    
+    Recording an event is one deque append; older events drop off the front
+    once the log is full, so a long-running simulation keeps a fixed amount
+    of memory per battle. Events are only turned into text when render() is
+    called. maxlen=None keeps every event.
+    """
+
+    verbose = False
+
+    def __init__(self, maxlen=DEFAULT_EVENT_LOG_SIZE):
+        self.events = deque(maxlen=maxlen)
+        # The engine calls record() for every event; bind the deque's own
+        # append so that is a single C call
+        self.record = self.events.append
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def render(self):
+        """
+        Turn the logged events into battle messages
+        
+        Returns: List of message strings, oldest first
+        """
+        return [render_event(event) for event in self.events]
+
+    def show_stats(self, character, enemy):
+        pass
+
+    def heading(self, title):
+        pass
+
+    def clear(self):
+        """Remove and return all logged events"""
+        events = list(self.events)
+        self.events.clear()
+        return events
+
+class BufferedSink(EventLog):
+    """
+    Keep every battle event in memory instead of printing messages
+
+    messages is one list that lives as long as the sink: events recorded
+    since the last access are rendered and appended to it when it is read.
+    """
+
+    def __init__(self):
+        super().__init__(maxlen=None)
+        # Unbounded, so a plain list (indexable for incremental rendering)
+        self.events = []
+        self.record = self.events.append
+        self._messages = []
+        self._rendered = 0
+
+    @property
+    def messages(self):
+        """All battle messages so far (only new events are rendered)"""
+        events = self.events
+        if self._rendered < len(events):
+            self._messages.extend(map(render_event, events[self._rendered:]))
+            self._rendered = len(events)
+        return self._messages
+
+    def clear(self):
+        """Remove and return all buffered messages"""
+        messages = self.messages
+        self.events.clear()
+        self._messages = []
+        self._rendered = 0
+        return messages
+
+class NullSink:
+    """Throw away all battle output (fastest option for simulations)"""
+
+    verbose = False
+
+    def __init__(self):
+        # A zero-length deque's append discards the event in one C call,
+        # cheaper than calling a Python method that does nothing
+        self.record = deque(maxlen=0).append
+
+    def show_stats(self, character, enemy):
+        pass
+
+    def heading(self, title):
+        pass
+
+# ============================================================================
+# BATTLE RECORDING
+# ============================================================================
+
+# Everything needed to fight a recorded battle again. character and enemy
+# are the combat stats at the start of the battle; result and turns are
+# what happened. record._asdict() can be stored as JSON, and
+# BattleRecord(**data) turns it back into a record.
+BattleRecord = namedtuple("BattleRecord", [
+    "seed", "character", "enemy", "actions", "max_turns", "result", "turns",
+])
+
+# Each character's recorded battles are appended to
+# <save_directory>/<name>_battles.jsonl, one record._asdict() per line
+BATTLE_LOG_SUFFIX = "_battles.jsonl"
+
+# Character fields the battle engine and special abilities use
+COMBAT_FIELDS = ("name", "class", "level", "health", "max_health", "strength", "magic")
+
+class RecordingPolicy:
+    """Pass actions through from another policy and remember each one"""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.actions = []
+
+    def choose_action(self, battle):
+        action = self.policy.choose_action(battle)
+        self.actions.append(action)
+        return action
+
+def record_battle(character, enemy, policy=None, sink=None, seed=None,
+                  max_turns=None):
+    """
+    Fight a battle and record it so it can be replayed exactly
+    
+    The battle's random rolls come from random.Random(seed), so the seed
+    plus the player's actions are enough to fight it again.
+    
+    Args:
+        character, enemy: Modified in place, as with SimpleBattle
+        policy: Battle policy (default: ask at the terminal)
+        sink: Battle sink (default: print to the terminal)
+        seed: Random seed (default: a new random 64-bit seed)
+        max_turns: Turn limit before the battle is a draw (default: none)
+    
+    Returns: BattleRecord (the battle result is record.result)
+    Raises: CharacterDeadError if character is already dead
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    start_character = {key: character[key] for key in COMBAT_FIELDS if key in character}
+    start_enemy = dict(enemy)
+
+    recorder = RecordingPolicy(policy if policy is not None else InteractivePolicy())
+    battle = SimpleBattle(character, enemy, recorder, sink, random.Random(seed), max_turns)
+    result = battle.run()
+    return BattleRecord(seed, start_character, start_enemy, tuple(recorder.actions),
+                        max_turns, result, battle.turn_counter)
+
+def replay_battle(record, sink=None):
+    """
+    Fight a recorded battle again, with no terminal I/O by default
+    
+    The character and enemy are rebuilt from the record, the same actions
+    are played in order and the same seed drives the random rolls.
+    
+    Args:
+        record: BattleRecord from record_battle
+        sink: Battle sink (default: NullSink); pass an EventLog or
+              BufferedSink to see what happened turn by turn
+    
+    Returns: The finished SimpleBattle (result in battle.result)
+    """
+    battle = SimpleBattle(
+        Character.from_mapping(record.character), Enemy.from_mapping(record.enemy),
+        ScriptedPolicy(record.actions), sink if sink is not None else NullSink(),
+        random.Random(record.seed), record.max_turns,
+    )
+    battle.run()
+    return battle
+
+def verify_battle_record(record):
+    """
+    Check that replaying a record gives the outcome it recorded
+    
+    Returns: True if the result and number of turns match
+    """
+    battle = replay_battle(record)
+    return battle.result == record.result and battle.turn_counter == record.turns
+
+def get_battle_log_path(character_name, save_directory="data/save_games"):
+    """Get the file a character's recorded battles are appended to"""
+    return os.path.join(save_directory, f"{character_name}{BATTLE_LOG_SUFFIX}")
+
+def append_battle_record(record, filename):
+    """
+    Append a recorded battle to a battle log (JSON Lines)
+    
+    Each record is one line written with a single append, so a crash can
+    at worst cut off the last line and earlier battles stay readable.
+    
+    Raises: OSError if the log cannot be written
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    line = json.dumps(record._asdict(), separators=(",", ":")) + "\n"
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write(line)
+
+def load_battle_records(filename):
+    """
+    Read every battle in a battle log, oldest first
+    
+    Returns: List of BattleRecord (empty if there is no log yet)
+    Raises: CorruptedDataError if a line is not a battle record
+    """
+    if not os.path.exists(filename):
+        return []
+
+    records = []
+    try:
+        with open(filename, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    data["actions"] = tuple(data["actions"])
+                    records.append(BattleRecord(**data))
+                except (ValueError, TypeError, KeyError) as e:
+                    raise CorruptedDataError(
+                        f"Bad battle record in {filename}, line {line_number}: {e}"
+                    )
+    except (OSError, UnicodeDecodeError) as e:
+        raise CorruptedDataError(f"Could not read battle log {filename}: {e}")
+    return records
+
+# ============================================================================
+# EVENT RENDERING
+# ============================================================================
+
+# Message for each ability result; formatted with the amount
+ABILITY_MESSAGES = {
+    "power_strike": "Power Strike! You hit for {} damage.",
+    "fireball": "Fireball! You burn the enemy for {} damage.",
+    "critical_strike": "Critical Strike! HUGE hit for {} damage!",
+    "stab": "You stab the enemy for {} damage.",
+    "heal": "Heal! Restored {} HP.",
+    "none": "No ability available.",
+}
+
+def render_event(event):
+    """
+    Turn one battle event tuple into the message a player would see
+    
+    Returns: Message string
+    """
+    turn, kind, actor, amount, detail = event
+    if kind == EVENT_ATTACK:
+        if actor == ACTOR_PLAYER:
+            return f"You attacked for {amount} damage!"
+        return f"The {detail} hits you for {amount} damage!"
+    if kind == EVENT_ABILITY:
+        return ABILITY_MESSAGES[detail].format(amount)
+    if kind == EVENT_START:
+        return f"Combat begins! A wild {detail} appears!"
+    if kind == EVENT_ESCAPE:
+        return "You escaped the battle!" if amount else "Failed to escape!"
+    if kind == EVENT_INVALID:
+        return "Invalid choice! You lose your turn."
+    if kind == EVENT_DEATH:
+        if actor == ACTOR_ENEMY:
+            return f"You defeated the {detail}!"
+        return "You were defeated..."
+    if kind == EVENT_REWARD:
+        return f"Gained {amount} XP and {detail} gold!"
+    return f"{kind}: {amount} {detail}"
+
+def run_headless_battle(character, enemy, policy=None, sink=None, rng=None,
+                        max_turns=None):
+    """
+    Fight a full battle with no terminal I/O
+    
+    Args:
+        character: Character dictionary (modified in place)
+        enemy: Enemy dictionary (modified in place)
+        policy: Battle policy (default: AttackPolicy)
+        sink: Battle sink (default: NullSink)
+        rng: Source of random rolls (default: the random module)
+        max_turns: Turn limit before the battle is a draw (default: none)
+    
+    Returns: Battle result dictionary (see SimpleBattle.start_battle)
+    Raises: CharacterDeadError if character is already dead
+    """
+    if policy is None:
+        policy = AttackPolicy()
+    if sink is None:
+        sink = NullSink()
+    return SimpleBattle(character, enemy, policy, sink, rng, max_turns).run()
 
 # ============================================================================
 # SPECIAL ABILITIES
 # ============================================================================
 
-def use_special_ability(character, enemy):
+def use_special_ability(character, enemy, rng=None):
     """
     Use character's class-specific special ability
     
@@ -245,9 +867,22 @@ def use_special_ability(character, enemy):
     - Rogue: Critical Strike (3x strength damage, 50% chance)
     - Cleric: Heal (restore 30 health)
     
+    rng: Source of random rolls (default: the random module)
+    
     Returns: String describing what happened
     Raises: AbilityOnCooldownError if ability was used recently
     """
+    ability, amount = resolve_special_ability(character, enemy, rng)
+    return ABILITY_MESSAGES[ability].format(amount)
+
+def resolve_special_ability(character, enemy, rng=None):
+    """
+    Apply character's special ability without building a message
+    
+    Returns: Tuple (ability, amount), e.g. ("fireball", 16); see
+             ABILITY_MESSAGES for the ability names
+    Raises: AbilityOnCooldownError if ability was used recently
+    """
     cls = character['class'].lower()
 
     if cls == "warrior":
@@ -255,32 +890,32 @@ def use_special_ability(character, enemy):
     elif cls == "mage":
         return mage_fireball(character, enemy)
     elif cls == "rogue":
-        return rogue_critical_strike(character, enemy)
+        return rogue_critical_strike(character, enemy, rng)
     elif cls == "cleric":
         return cleric_heal(character)
     else:
-        return "No ability available."
+        return ("none", 0)
 
 def warrior_power_strike(character, enemy):
     """Warrior special ability"""
     dmg = character['strength'] * 2
     enemy['health'] = max(0, enemy['health'] - dmg)
-    return f"Power Strike! You hit for {dmg} damage."
+    return ("power_strike", dmg)
 
 def mage_fireball(character, enemy):
     """Mage special ability"""
     dmg = character['magic'] * 2
     enemy['health'] = max(0, enemy['health'] - dmg)
-    return f"Fireball! You burn the enemy for {dmg} damage."
+    return ("fireball", dmg)
 
-def rogue_critical_strike(character, enemy):
+def rogue_critical_strike(character, enemy, rng=None):
     """Rogue special ability"""
-    crit = random.random() < 0.5
+    if rng is None:
+        rng = random
+    crit = rng.random() < 0.5
     dmg = character['strength'] * (3 if crit else 1)
     enemy['health'] = max(0, enemy['health'] - dmg)
-    if crit:
-        return f"Critical Strike! HUGE hit for {dmg} damage!"
-    return f"You stab the enemy for {dmg} damage."
+    return ("critical_strike" if crit else "stab", dmg)
 
 def cleric_heal(character):
     """Cleric special ability"""
@@ -288,7 +923,7 @@ def cleric_heal(character):
     new_hp = min(character['max_health'], character['health'] + heal_amount)
     healed = new_hp - character['health']
     character['health'] = new_hp
-    return f"Heal! Restored {healed} HP."
+    return ("heal", healed)
 
 # ============================================================================
 # COMBAT UTILITIES
@@ -308,6 +943,10 @@ def get_victory_rewards(enemy):
     
     Returns: Dictionary with 'xp' and 'gold'
     """
+    if type(enemy) is Enemy:
+        # Straight from the shared template (faster than enemy["xp_reward"])
+        stats = enemy.template
+        return {"xp": stats.xp_reward, "gold": stats.gold_reward}
     return {
         "xp": enemy["xp_reward"],
         "gold": enemy["gold_reward"]
@@ -0,0 +1,314 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Generator Module
+
+Writes large, realistic game data for performance testing.
+
+Quest catalogs and item catalogs are written in the block format that
+game_data reads, and character saves in the format character_manager
+writes. Everything is generated from a seed, so the same arguments always
+give the same files. Records are produced one at a time and written as
+they are made, so a catalog of millions of quests takes about as much
+memory as a catalog of ten.
+
+Quest prerequisite shapes:
+    chain   Long chains: every quest needs the one before it (a new chain
+            starts every `width` quests)
+    fan     Wide fans: one root quest unlocks `width` quests at once
+    tree    Deep trees: every quest unlocks `width` more
+    random  Each quest needs a random earlier quest 70% of the time
+
+Every prerequisite is an earlier quest, so completing the first N quests
+of a catalog is always a valid quest history.
+
+Command line:
+    python content_generator.py quests data/big_quests.txt --count 1000000 --shape tree
+    python content_generator.py items data/big_items.txt --count 50000
+    python content_generator.py saves data/big_saves --count 10000
+"""
+
+import argparse
+import os
+import random
+from array import array
+
+import character_manager
+
+QUEST_SHAPES = ("chain", "fan", "tree", "random")
+LEVEL_SPREADS = ("depth", "flat")
+ITEM_TYPES = ("weapon", "armor", "consumable")
+CHARACTER_CLASSES = ("Warrior", "Mage", "Rogue", "Cleric")
+
+# Default `width` for each quest shape
+DEFAULT_WIDTHS = {"chain": 50, "fan": 100, "tree": 3, "random": 0}
+
+# Stats each item type changes, and the range of the change
+ITEM_EFFECTS = {
+    "weapon": (("strength", 1, 30), ("magic", 1, 30)),
+    "armor": (("max_health", 5, 80),),
+    "consumable": (("health", 10, 200), ("strength", 1, 5), ("magic", 1, 5)),
+}
+
+# ============================================================================
+# QUESTS
+# ============================================================================
+
+def iter_quests(count, shape="tree", width=None, seed=0, max_level=50, level_spread="depth"):
+    """
+    Generate quest dictionaries one at a time
+
+    Args:
+        count: Number of quests
+        shape: Prerequisite shape (see QUEST_SHAPES)
+        width: Chain length, fan width or tree branching (default per shape)
+        seed: Random seed
+        max_level: Highest required level
+        level_spread: "depth" (required level grows with prerequisite depth,
+                      so a quest never needs a lower level than its
+                      prerequisite) or "flat" (uniform 1..max_level)
+
+    Yields: Quest dictionaries with the same keys game_data produces
+    Raises: ValueError for an unknown shape or level spread, or width < 1
+            (the random shape ignores width)
+    """
+    if shape not in QUEST_SHAPES:
+        raise ValueError(f"Unknown quest shape '{shape}'. Choose from {', '.join(QUEST_SHAPES)}.")
+    if level_spread not in LEVEL_SPREADS:
+        raise ValueError(f"Unknown level spread '{level_spread}'. Choose from {', '.join(LEVEL_SPREADS)}.")
+    if width is None:
+        width = DEFAULT_WIDTHS[shape]
+    elif shape != "random" and width < 1:
+        raise ValueError(f"width must be at least 1 for the {shape} shape, not {width}")
+
+    rng = random.Random(seed)
+    # Depth of every quest so far (2 bytes each); only the random shape
+    # needs it, the others work depth out from the index
+    depths = array("H") if shape == "random" else None
+
+    for index in range(count):
+        parent = _quest_parent(index, shape, width, rng)
+        if shape == "chain":
+            depth = index % width
+        elif shape == "fan":
+            depth = 0 if parent is None else 1
+        elif shape == "tree":
+            depth = _tree_depth(index, width)
+        else:
+            depth = 0 if parent is None else min(depths[parent] + 1, 65535)
+            depths.append(depth)
+
+        if level_spread == "depth":
+            level = min(max_level, 1 + depth)
+        else:
+            level = rng.randint(1, max_level)
+
+        yield {
+            "quest_id": f"quest_{index}",
+            "title": f"Quest {index}",
+            "description": f"A generated {shape} quest.",
+            "reward_xp": 20 * level + rng.randint(0, 50),
+            "reward_gold": 10 * level + rng.randint(0, 25),
+            "required_level": level,
+            "prerequisite": "NONE" if parent is None else f"quest_{parent}",
+        }
+
+def _quest_parent(index, shape, width, rng):
+    """Index of a quest's prerequisite (None for no prerequisite)"""
+    if shape == "chain":
+        return index - 1 if index % width else None
+    if shape == "fan":
+        offset = index % (width + 1)
+        return index - offset if offset else None
+    if shape == "tree":
+        return (index - 1) // width if index else None
+    if index and rng.random() < 0.7:
+        return rng.randrange(index)
+    return None
+
+def _tree_depth(index, width):
+    """Depth of a node in a tree numbered level by level (root = 0)"""
+    depth = 0
+    while index:
+        index = (index - 1) // width
+        depth += 1
+    return depth
+
+def format_quest(quest):
+    """Format a quest dictionary as a game_data block"""
+    return (
+        f"QUEST_ID: {quest['quest_id']}\n"
+        f"TITLE: {quest['title']}\n"
+        f"DESCRIPTION: {quest['description']}\n"
+        f"REWARD_XP: {quest['reward_xp']}\n"
+        f"REWARD_GOLD: {quest['reward_gold']}\n"
+        f"REQUIRED_LEVEL: {quest['required_level']}\n"
+        f"PREREQUISITE: {quest['prerequisite']}\n"
+    )
+
+def write_quests(filename, count, **options):
+    """
+    Write a generated quest catalog (options as for iter_quests)
+
+    Returns: Number of quests written
+    """
+    return write_blocks(filename, map(format_quest, iter_quests(count, **options)))
+
+# ============================================================================
+# ITEMS
+# ============================================================================
+
+def iter_items(count, seed=0, max_cost=1000):
+    """
+    Generate item dictionaries one at a time
+
+    The three item types take turns, so every type has about a third of
+    the items. Cost grows with the size of the effect.
+
+    Yields: Item dictionaries with the same keys game_data produces
+            (apart from the compiled 'effects')
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        item_type = ITEM_TYPES[index % len(ITEM_TYPES)]
+        stat, low, high = rng.choice(ITEM_EFFECTS[item_type])
+        value = rng.randint(low, high)
+        yield {
+            "item_id": f"item_{index}",
+            "name": f"{stat.replace('_', ' ').title()} {item_type.title()} {index}",
+            "type": item_type,
+            "effect": f"{stat}:{value}",
+            "cost": max(1, min(max_cost, value * max_cost // high // 2 + rng.randint(0, 20))),
+            "description": f"A generated {item_type}.",
+        }
+
+def format_item(item):
+    """Format an item dictionary as a game_data block"""
+    return (
+        f"ITEM_ID: {item['item_id']}\n"
+        f"NAME: {item['name']}\n"
+        f"TYPE: {item['type']}\n"
+        f"EFFECT: {item['effect']}\n"
+        f"COST: {item['cost']}\n"
+        f"DESCRIPTION: {item['description']}\n"
+    )
+
+def write_items(filename, count, **options):
+    """
+    Write a generated item catalog (options as for iter_items)
+
+    Returns: Number of items written
+    """
+    return write_blocks(filename, map(format_item, iter_items(count, **options)))
+
+# ============================================================================
+# CHARACTER SAVES
+# ============================================================================
+
+def iter_characters(count, seed=0, quest_count=1000, item_count=100, max_level=50):
+    """
+    Generate characters one at a time
+
+    Each character has a random class and level, has completed a prefix
+    of the generated quest catalog (quest_0, quest_1, ...), has a few of
+    the next quests active and carries some generated items.
+
+    Yields: Character records like character_manager.create_character gives
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        character = character_manager.create_character_at_level(
+            f"Hero{index}", rng.choice(CHARACTER_CLASSES), rng.randint(1, max_level)
+        )
+        character["gold"] = rng.randint(0, 5000)
+        character["health"] = rng.randint(1, character["max_health"])
+
+        completed = rng.randint(0, quest_count)
+        for quest_index in range(completed):
+            character["completed_quests"].append(f"quest_{quest_index}")
+        for quest_index in range(completed, min(quest_count, completed + rng.randint(0, 3))):
+            character["active_quests"].append(f"quest_{quest_index}")
+        if item_count:
+            for _ in range(rng.randint(0, 10)):
+                character["inventory"].append(f"item_{rng.randrange(item_count)}")
+        yield character
+
+def write_saves(save_directory, count, **options):
+    """
+    Write generated characters as save files (options as for iter_characters)
+
+    Files are written directly, without the atomic rename and fsync of
+    character_manager.save_character.
+
+    Returns: Number of saves written
+    """
+    os.makedirs(save_directory, exist_ok=True)
+    written = 0
+    for character in iter_characters(count, **options):
+        filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(character_manager.serialize_character(character))
+        written += 1
+    return written
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def write_blocks(filename, blocks):
+    """
+    Write blocks separated by blank lines, one block at a time
+
+    Returns: Number of blocks written
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    written = 0
+    with open(filename, "w", encoding="utf-8", buffering=1 << 20) as f:
+        for block in blocks:
+            if written:
+                f.write("\n")
+            f.write(block)
+            written += 1
+    return written
+
+def main(argv=None):
+    """
+    Generate content from the command line
+
+    Returns: Exit status
+    """
+    parser = argparse.ArgumentParser(description="Generate large Quest Chronicles data")
+    parser.add_argument("kind", choices=("quests", "items", "saves"))
+    parser.add_argument("path", help="output file (quests, items) or directory (saves)")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shape", choices=QUEST_SHAPES, default="tree")
+    parser.add_argument("--width", type=int, help="chain length, fan width or tree branching")
+    parser.add_argument("--max-level", type=int, default=50)
+    parser.add_argument("--level-spread", choices=LEVEL_SPREADS, default="depth")
+    parser.add_argument("--quest-count", type=int, default=1000,
+                        help="quests the generated saves refer to")
+    parser.add_argument("--item-count", type=int, default=100,
+                        help="items the generated saves carry")
+    args = parser.parse_args(argv)
+
+    if args.kind == "quests":
+        written = write_quests(args.path, args.count, shape=args.shape, width=args.width,
+                               seed=args.seed, max_level=args.max_level,
+                               level_spread=args.level_spread)
+    elif args.kind == "items":
+        written = write_items(args.path, args.count, seed=args.seed)
+    else:
+        written = write_saves(args.path, args.count, seed=args.seed,
+                              quest_count=args.quest_count, item_count=args.item_count,
+                              max_level=args.max_level)
+    print(f"Wrote {written} {args.kind} to {args.path}")
+    return 0
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    raise SystemExit(main())
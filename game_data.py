@@ -10,18 +10,65 @@ AI Usage: [Bug Fixes]
 This module handles loading and validating game data from text files.
 """
 
+import glob
+import hashlib
 import os
+import pickle
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from quest_graph import QuestCatalog
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Compiled caches are stored next to the source file with this suffix
+CACHE_SUFFIX = ".cache"
+
+# Bump this whenever the parsed quest/item format changes so that caches
+# written by older code are ignored
+CACHE_VERSION = 3
+
+# Contents of data/enemies.txt written by create_default_data_files (the
+# same enemies combat_system uses when there is no enemies file)
+DEFAULT_ENEMIES = """ENEMY_ID: goblin
+NAME: Goblin
+HEALTH: 50
+STRENGTH: 8
+MAGIC: 2
+XP_REWARD: 25
+GOLD_REWARD: 10
+MIN_LEVEL: 1
+MAX_LEVEL: 2
+
+ENEMY_ID: orc
+NAME: Orc
+HEALTH: 80
+STRENGTH: 12
+MAGIC: 5
+XP_REWARD: 50
+GOLD_REWARD: 25
+MIN_LEVEL: 3
+MAX_LEVEL: 5
+
+ENEMY_ID: dragon
+NAME: Dragon
+HEALTH: 200
+STRENGTH: 25
+MAGIC: 15
+XP_REWARD: 200
+GOLD_REWARD: 100
+MIN_LEVEL: 6
+MAX_LEVEL: NONE
+"""
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=False):
     """
     Load quest data from file
     
@@ -34,38 +81,40 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
-    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    If use_cache is True, a compiled copy of the parsed quests and their
+    prerequisite graph is kept next to the file (see load_catalog_cache) and
+    used while the file is unchanged. The cached graph was validated before
+    it was saved, so a cache hit skips the cycle check.
+    
+    Returns: QuestCatalog of quests {quest_id: quest_data_dict} with its
+             prerequisite graph already built
+    Raises: InvalidDataFormatError also if the prerequisites form a cycle
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Quest data file not found: {filename}")
 
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            raw = f.read()
-    except Exception as e:
-        raise CorruptedDataError(f"Could not read quest data file: {e}")
+    if use_cache:
+        cache_key = get_cache_key(filename)
+        cached = load_catalog_cache(filename, "quests", cache_key)
+        if cached is not None:
+            return QuestCatalog.from_cache_state(cached)
 
-    # Split blocks by blank lines (one or more)
-    blocks = [block.strip() for block in raw.split("\n\n") if block.strip()]
     quests = {}
-
-    for block in blocks:
-        lines = [line.strip() for line in block.splitlines() if line.strip()]
-        try:
-            q = parse_quest_block(lines)
-        except InvalidDataFormatError as e:
-            # include block preview for debugging
-            raise InvalidDataFormatError(f"Invalid quest block: {e}")
-
+    for line_number, q in iter_catalog_entries(filename, parse_quest_block, "quest"):
         quest_id = q["quest_id"]
         if quest_id in quests:
-            raise InvalidDataFormatError(f"Duplicate quest id '{quest_id}' in file.")
+            raise InvalidDataFormatError(
+                f"Duplicate quest id '{quest_id}' in {filename}, line {line_number}."
+            )
         quests[quest_id] = q
 
-    return quests
+    catalog = build_quest_catalog(quests)
+    if use_cache:
+        save_catalog_cache(filename, "quests", cache_key, catalog.cache_state())
+    return catalog
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False):
     """
     Load item data from file
     
@@ -77,35 +126,71 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
+    Each item also gets an 'effects' tuple of compiled ItemEffect records
+    (see compile_item_effect).
+    
+    If use_cache is True, a compiled copy of the parsed items is kept next
+    to the file (see load_catalog_cache) and used while the file is unchanged.
+    
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Item data file not found: {filename}")
 
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            raw = f.read()
-    except Exception as e:
-        raise CorruptedDataError(f"Could not read item data file: {e}")
+    if use_cache:
+        cache_key = get_cache_key(filename)
+        cached = load_catalog_cache(filename, "items", cache_key)
+        if cached is not None:
+            return cached
 
-    blocks = [block.strip() for block in raw.split("\n\n") if block.strip()]
     items = {}
-
-    for block in blocks:
-        lines = [line.strip() for line in block.splitlines() if line.strip()]
-        try:
-            itm = parse_item_block(lines)
-        except InvalidDataFormatError as e:
-            raise InvalidDataFormatError(f"Invalid item block: {e}")
-
+    for line_number, itm in iter_catalog_entries(filename, parse_item_block, "item"):
         item_id = itm["item_id"]
         if item_id in items:
-            raise InvalidDataFormatError(f"Duplicate item id '{item_id}' in file.")
+            raise InvalidDataFormatError(
+                f"Duplicate item id '{item_id}' in {filename}, line {line_number}."
+            )
         items[item_id] = itm
 
+    if use_cache:
+        save_catalog_cache(filename, "items", cache_key, items)
     return items
 
+def load_enemies(filename="data/enemies.txt"):
+    """
+    Load enemy data from file
+    
+    Expected format per enemy (separated by blank lines):
+    ENEMY_ID: unique_enemy_name
+    NAME: Enemy Display Name
+    HEALTH: 50
+    STRENGTH: 8
+    MAGIC: 2
+    XP_REWARD: 25
+    GOLD_REWARD: 10
+    MIN_LEVEL: 1
+    MAX_LEVEL: 2 (or NONE for no upper limit)
+    WEIGHT: 1 (optional, relative chance among enemies of the same level)
+    
+    Enemy ids are stored in lowercase.
+    
+    Returns: Dictionary of enemies {enemy_id: enemy_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Enemy data file not found: {filename}")
+
+    enemies = {}
+    for line_number, enemy in iter_catalog_entries(filename, parse_enemy_block, "enemy"):
+        enemy_id = enemy["enemy_id"]
+        if enemy_id in enemies:
+            raise InvalidDataFormatError(
+                f"Duplicate enemy id '{enemy_id}' in {filename}, line {line_number}."
+            )
+        enemies[enemy_id] = enemy
+    return enemies
+
 def validate_quest_data(quest_dict):
     """
     Validate that quest dictionary has all required fields
@@ -159,20 +244,48 @@ def validate_item_data(item_dict):
     if not isinstance(item_dict.get("cost"), int):
         raise InvalidDataFormatError("Item field 'cost' must be an integer.")
 
-    # effect must be in "stat:value" and value should be int
-    eff = item_dict["effect"]
-    if ":" not in eff:
-        raise InvalidDataFormatError("Item 'effect' must use format 'stat:value'.")
+    # effect must be "stat:value" (or several, comma-separated) with int values
+    compile_item_effect(item_dict["effect"])
 
-    stat, val = eff.split(":", 1)
-    stat = stat.strip()
-    val = val.strip()
-    if not stat or not val:
-        raise InvalidDataFormatError("Item 'effect' must contain both stat and value.")
-    try:
-        int(val)
-    except ValueError:
-        raise InvalidDataFormatError("Item effect value must be an integer.")
+    return True
+
+def validate_enemy_data(enemy_dict):
+    """
+    Validate that enemy dictionary has all required fields
+    
+    Required fields: enemy_id, name, max_health, strength, magic,
+                    xp_reward, gold_reward, min_level
+    Optional fields: max_level (None = no limit), weight (default 1)
+    
+    Returns: True if valid
+    Raises: InvalidDataFormatError if missing required fields or bad values
+    """
+    required = {
+        "enemy_id", "name", "max_health", "strength", "magic",
+        "xp_reward", "gold_reward", "min_level"
+    }
+
+    missing = required - set(enemy_dict.keys())
+    if missing:
+        raise InvalidDataFormatError(f"Missing enemy fields: {', '.join(sorted(missing))}")
+
+    for key in ("max_health", "strength", "magic", "xp_reward", "gold_reward", "min_level"):
+        if not isinstance(enemy_dict.get(key), int):
+            raise InvalidDataFormatError(f"Enemy field '{key}' must be an integer.")
+
+    if enemy_dict["max_health"] < 1:
+        raise InvalidDataFormatError("Enemy HEALTH must be at least 1.")
+    if enemy_dict["min_level"] < 1:
+        raise InvalidDataFormatError("Enemy MIN_LEVEL must be at least 1.")
+
+    max_level = enemy_dict.get("max_level")
+    if max_level is not None and (not isinstance(max_level, int)
+                                  or max_level < enemy_dict["min_level"]):
+        raise InvalidDataFormatError("Enemy MAX_LEVEL must be NONE or at least MIN_LEVEL.")
+
+    weight = enemy_dict.get("weight", 1)
+    if not isinstance(weight, int) or weight < 1:
+        raise InvalidDataFormatError("Enemy WEIGHT must be a positive integer.")
 
     return True
 
@@ -190,6 +303,7 @@ def create_default_data_files():
 
     quests_path = os.path.join(data_dir, "quests.txt")
     items_path = os.path.join(data_dir, "items.txt")
+    enemies_path = os.path.join(data_dir, "enemies.txt")
 
     # Only create if not exists; do not overwrite existing files.
     if not os.path.exists(quests_path):
@@ -243,12 +357,474 @@ DESCRIPTION: Basic armor that increases maximum health.
         except Exception as e:
             raise CorruptedDataError(f"Could not create default items file: {e}")
 
+    if not os.path.exists(enemies_path):
+        try:
+            with open(enemies_path, "w", encoding="utf-8") as f:
+                f.write(DEFAULT_ENEMIES)
+        except Exception as e:
+            raise CorruptedDataError(f"Could not create default enemies file: {e}")
+
     return True
 
+# ============================================================================
+# STREAMING PARSER
+# ============================================================================
+
+def iter_catalog_blocks(filename):
+    """
+    Read a data file one line at a time and yield one block at a time
+    
+    Blocks are separated by blank lines. A line with only whitespace counts
+    as blank, and Windows (CRLF) line endings are fine. Only the current
+    block is ever held in memory.
+    
+    Yields: (line_number, lines) where line_number is the first line of the
+            block (1-based) and lines are its stripped lines
+    Raises:
+        MissingDataFileError if the file does not exist
+        InvalidDataFormatError if a line is not 'KEY: value'
+        CorruptedDataError if the file cannot be read
+    """
+    try:
+        f = open(filename, "r", encoding="utf-8")
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file not found: {filename}")
+    except OSError as e:
+        raise CorruptedDataError(f"Could not read data file {filename}: {e}")
+
+    with f:
+        block = []
+        start = 0
+        line_number = 0
+        try:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    if block:
+                        yield start, block
+                        block = []
+                    continue
+                if ":" not in line:
+                    raise InvalidDataFormatError(
+                        f"{filename}, line {line_number}: Malformed line '{line}' "
+                        f"(expected 'KEY: value')."
+                    )
+                if not block:
+                    start = line_number
+                block.append(line)
+        except (OSError, UnicodeDecodeError) as e:
+            raise CorruptedDataError(
+                f"Could not read data file {filename} after line {line_number}: {e}"
+            )
+        if block:
+            yield start, block
+
+def iter_catalog_entries(filename, parse_block, label):
+    """
+    Parse a data file block by block
+    
+    Args:
+        filename: Data file to read
+        parse_block: parse_quest_block, parse_item_block or similar
+        label: Word used in error messages ("quest", "item", ...)
+    
+    Yields: (line_number, entry) for each validated entry
+    Raises: Same as iter_catalog_blocks
+    """
+    for line_number, lines in iter_catalog_blocks(filename):
+        try:
+            entry = parse_block(lines)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(
+                f"Invalid {label} block at {filename}, line {line_number}: {e}"
+            )
+        yield line_number, entry
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Yield validated quest dictionaries one at a time (see load_quests)
+    
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for _, quest in iter_catalog_entries(filename, parse_quest_block, "quest"):
+        yield quest
+
+def iter_items(filename="data/items.txt"):
+    """
+    Yield validated item dictionaries one at a time (see load_items)
+    
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for _, item in iter_catalog_entries(filename, parse_item_block, "item"):
+        yield item
+
+# ============================================================================
+# MULTI-FILE CONTENT PACKS
+# ============================================================================
+
+def find_catalog_files(path, pattern="*.txt"):
+    """
+    Find the catalog files for a content pack
+    
+    Args:
+        path: A directory (every file matching pattern inside it is used)
+              or a glob such as "content/*/quests*.txt"
+        pattern: File pattern used when path is a directory
+    
+    Returns: Sorted list of file paths
+    Raises: MissingDataFileError if nothing matches
+    """
+    if os.path.isdir(path):
+        files = glob.glob(os.path.join(path, pattern))
+    else:
+        files = glob.glob(path)
+    files = sorted(f for f in files if os.path.isfile(f))
+    if not files:
+        raise MissingDataFileError(f"No catalog files found for: {path}")
+    return files
+
+def parse_catalog_file(filename, kind):
+    """
+    Parse one catalog file completely (runs inside worker processes)
+    
+    Args:
+        filename: File to parse
+        kind: "quests" or "items"
+    
+    Returns: List of (line_number, entry) tuples in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if kind == "quests":
+        return list(iter_catalog_entries(filename, parse_quest_block, "quest"))
+    if kind == "items":
+        return list(iter_catalog_entries(filename, parse_item_block, "item"))
+    raise ValueError(f"Unknown catalog kind: {kind}")
+
+def load_catalog_files(path, kind, max_workers=None):
+    """
+    Load and merge a content pack made of many catalog files
+    
+    Files are parsed in parallel with a process pool and merged in sorted
+    file order. Ids must be unique across the whole pack.
+    
+    Args:
+        path: Directory or glob (see find_catalog_files)
+        kind: "quests" or "items"
+        max_workers: Worker processes (default: CPU count; 1 = no pool)
+    
+    Returns: Dictionary {id: entry} for the whole pack (a QuestCatalog
+             for quests)
+    Raises:
+        MissingDataFileError if no files match
+        InvalidDataFormatError for bad blocks or duplicate ids (every
+            duplicate is listed with file:line for each copy), or a
+            prerequisite cycle between quests
+        CorruptedDataError if a file cannot be read
+    """
+    if kind not in ("quests", "items"):
+        raise ValueError(f"Unknown catalog kind: {kind}")
+    id_field = "quest_id" if kind == "quests" else "item_id"
+
+    files = find_catalog_files(path)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(files)))
+
+    if max_workers == 1:
+        parsed = [parse_catalog_file(f, kind) for f in files]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed = list(executor.map(parse_catalog_file, files, [kind] * len(files)))
+
+    catalog = {}
+    locations = {}
+    duplicates = {}
+    for filename, entries in zip(files, parsed):
+        for line_number, entry in entries:
+            entry_id = entry[id_field]
+            where = f"{filename}:{line_number}"
+            if entry_id in catalog:
+                duplicates.setdefault(entry_id, [locations[entry_id]]).append(where)
+                continue
+            catalog[entry_id] = entry
+            locations[entry_id] = where
+
+    if duplicates:
+        details = "; ".join(
+            f"'{entry_id}' at {', '.join(places)}" for entry_id, places in duplicates.items()
+        )
+        raise InvalidDataFormatError(f"Duplicate {id_field} values in content pack: {details}")
+
+    if kind == "quests":
+        return build_quest_catalog(catalog)
+    return catalog
+
+def load_quest_pack(path, max_workers=None):
+    """Load every quest file in a directory or glob (see load_catalog_files)"""
+    return load_catalog_files(path, "quests", max_workers)
+
+def load_item_pack(path, max_workers=None):
+    """Load every item file in a directory or glob (see load_catalog_files)"""
+    return load_catalog_files(path, "items", max_workers)
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class CatalogWatcher:
+    """
+    Keeps a quest or item catalog in sync with its data file
+    
+    Call poll() now and then (for example once per game menu action). It
+    only checks the file's modification time and size; when they change the
+    file is read again, but only blocks whose text changed are parsed.
+    Every block is fingerprinted, and unchanged blocks reuse the entry that
+    was parsed last time. The new catalog is built on the side and swapped
+    in with a single assignment, so readers never see a half-loaded catalog.
+    """
+
+    def __init__(self, filename, kind):
+        """
+        Start watching a data file and load it
+        
+        Args:
+            filename: Data file to watch
+            kind: "quests" or "items"
+        
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        if kind == "quests":
+            self._parse_block, self._label, self._id_field = parse_quest_block, "quest", "quest_id"
+        elif kind == "items":
+            self._parse_block, self._label, self._id_field = parse_item_block, "item", "item_id"
+        else:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+
+        self.filename = filename
+        self.kind = kind
+        self.catalog = {}
+        self.blocks_reparsed = 0
+        self._stat_key = None
+        self._entries_by_fingerprint = {}
+        self.reload()
+
+    def _current_stat_key(self):
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            raise MissingDataFileError(f"Data file not found: {self.filename}")
+        except OSError as e:
+            raise CorruptedDataError(f"Could not read data file {self.filename}: {e}")
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self):
+        """
+        Reload the catalog if the file changed since the last load
+        
+        Returns: True if a new catalog was swapped in, False if unchanged
+        Raises: Same as reload(). On error the previous catalog is kept, and
+                the same broken file is not retried until it changes again.
+        """
+        if self._current_stat_key() == self._stat_key:
+            return False
+        self.reload()
+        return True
+
+    def reload(self):
+        """
+        Re-read the file, parsing only blocks that changed
+        
+        Returns: The new catalog dictionary
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        self._stat_key = self._current_stat_key()
+
+        catalog = {}
+        entries_by_fingerprint = {}
+        reparsed = 0
+        for line_number, lines in iter_catalog_blocks(self.filename):
+            fingerprint = hashlib.blake2b("\n".join(lines).encode("utf-8"),
+                                          digest_size=16).digest()
+            entry = self._entries_by_fingerprint.get(fingerprint)
+            if entry is None:
+                entry = entries_by_fingerprint.get(fingerprint)
+            if entry is None:
+                try:
+                    entry = self._parse_block(lines)
+                except InvalidDataFormatError as e:
+                    raise InvalidDataFormatError(
+                        f"Invalid {self._label} block at {self.filename}, line {line_number}: {e}"
+                    )
+                reparsed += 1
+            entries_by_fingerprint[fingerprint] = entry
+
+            entry_id = entry[self._id_field]
+            if entry_id in catalog:
+                raise InvalidDataFormatError(
+                    f"Duplicate {self._label} id '{entry_id}' in {self.filename}, line {line_number}."
+                )
+            catalog[entry_id] = entry
+
+        if self.kind == "quests":
+            catalog = build_quest_catalog(catalog)
+
+        self._entries_by_fingerprint = entries_by_fingerprint
+        self.blocks_reparsed = reparsed
+        self.catalog = catalog
+        return catalog
+
+# ============================================================================
+# COMPILED CACHE
+# ============================================================================
+
+def get_cache_key(filename):
+    """
+    Build the cache key for a data file
+    
+    The key is the file's modification time, size and SHA-256 content hash,
+    so any edit to the file makes the old cache stale.
+    
+    Returns: Tuple (mtime_ns, size, hex_digest)
+    Raises: CorruptedDataError if the file cannot be read
+    """
+    try:
+        stat = os.stat(filename)
+        digest = hashlib.sha256()
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError as e:
+        raise CorruptedDataError(f"Could not read data file {filename}: {e}")
+
+    return (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+
+def load_catalog_cache(filename, kind, cache_key):
+    """
+    Load a compiled catalog if its cache is still valid
+    
+    The cache is a pickle stored at filename + CACHE_SUFFIX. Only load
+    caches that this game wrote itself: unpickling runs code.
+    
+    Args:
+        filename: Source data file
+        kind: "quests" or "items"
+        cache_key: Key from get_cache_key() for the current source file
+    
+    Returns: The data given to save_catalog_cache, or None if there is no
+             valid cache
+    """
+    try:
+        with open(filename + CACHE_SUFFIX, "rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        # Missing, unreadable or corrupted caches just mean we parse again
+        return None
+
+    if not isinstance(cached, dict):
+        return None
+    if (cached.get("version") != CACHE_VERSION or cached.get("kind") != kind
+            or cached.get("key") != cache_key):
+        return None
+    return cached.get("data")
+
+def save_catalog_cache(filename, kind, cache_key, data):
+    """
+    Write a compiled catalog next to its source file
+    
+    The cache is written to a temporary file and renamed into place, so a
+    crash never leaves a half-written cache. Like
+    character_manager.write_file_atomically, every call gets its own
+    temporary file, so processes or threads caching the same file at once
+    cannot clobber each other. Failing to write a cache is not an error
+    (the data directory may be read-only).
+    
+    Returns: True if the cache was written, False otherwise
+    """
+    cache_file = filename + CACHE_SUFFIX
+    payload = {"version": CACHE_VERSION, "kind": kind, "key": cache_key, "data": data}
+    try:
+        fd, temp_file = tempfile.mkstemp(
+            prefix=os.path.basename(cache_file) + ".",
+            suffix=".tmp",
+            dir=os.path.dirname(cache_file) or ".",
+        )
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        return False
+    return True
+
+# ============================================================================
+# ITEM EFFECTS
+# ============================================================================
+
+# One compiled stat change, e.g. ItemEffect("strength", 5)
+ItemEffect = namedtuple("ItemEffect", ["stat", "delta"])
+
+def compile_item_effect(effect_string):
+    """
+    Compile an item effect string into ItemEffect records
+    
+    Format: "stat:value", or several changes separated by commas
+    ("strength:5,max_health:-10").
+    
+    Returns: Tuple of ItemEffect(stat, delta)
+    Raises: InvalidDataFormatError if the string is malformed
+    """
+    if not isinstance(effect_string, str):
+        raise InvalidDataFormatError("Item 'effect' must be a string.")
+
+    effects = []
+    for part in effect_string.split(","):
+        if ":" not in part:
+            raise InvalidDataFormatError("Item 'effect' must use format 'stat:value'.")
+        stat, val = part.split(":", 1)
+        stat = stat.strip()
+        val = val.strip()
+        if not stat or not val:
+            raise InvalidDataFormatError("Item 'effect' must contain both stat and value.")
+        try:
+            effects.append(ItemEffect(stat, int(val)))
+        except ValueError:
+            raise InvalidDataFormatError("Item effect value must be an integer.")
+    return tuple(effects)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def build_quest_catalog(quests):
+    """
+    Wrap loaded quests in a QuestCatalog and build its prerequisite graph
+    
+    Returns: QuestCatalog
+    Raises: InvalidDataFormatError if the prerequisites form a cycle
+    """
+    catalog = QuestCatalog(quests)
+    catalog.build()
+    return catalog
+
+def get_default_enemies():
+    """
+    Parse the built-in enemies (DEFAULT_ENEMIES)
+    
+    Returns: Dictionary of enemies {enemy_id: enemy_data_dict}, the same as
+             load_enemies() gives for the default data file
+    """
+    enemies = {}
+    for block in DEFAULT_ENEMIES.strip().split("\n\n"):
+        enemy = parse_enemy_block(block.splitlines())
+        enemies[enemy["enemy_id"]] = enemy
+    return enemies
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary
@@ -336,7 +912,61 @@ def parse_item_block(lines):
             pass
 
     validate_item_data(data)
+    # Compiled once here so using or equipping the item never parses strings
+    data["effects"] = compile_item_effect(data["effect"])
     return data
+
+def parse_enemy_block(lines):
+    """
+    Parse a block of lines into an enemy dictionary
+    
+    Args:
+        lines: List of strings representing one enemy
+    
+    Returns: Dictionary with enemy data (keys match EnemyTemplate)
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    int_keys = {
+        "HEALTH": "max_health",
+        "STRENGTH": "strength",
+        "MAGIC": "magic",
+        "XP_REWARD": "xp_reward",
+        "GOLD_REWARD": "gold_reward",
+        "MIN_LEVEL": "min_level",
+        "WEIGHT": "weight",
+    }
+    data = {"max_level": None, "weight": 1}
+    for line in lines:
+        if ":" not in line:
+            raise InvalidDataFormatError(f"Malformed line: '{line}' (expected 'KEY: value').")
+        key, value = line.split(":", 1)
+        key = key.strip().upper()
+        value = value.strip()
+
+        if key == "ENEMY_ID":
+            data["enemy_id"] = value.lower()
+        elif key == "NAME":
+            data["name"] = value
+        elif key in int_keys:
+            try:
+                data[int_keys[key]] = int(value)
+            except ValueError:
+                raise InvalidDataFormatError(f"{key} must be an integer.")
+        elif key == "MAX_LEVEL":
+            if value.upper() == "NONE":
+                data["max_level"] = None
+            else:
+                try:
+                    data["max_level"] = int(value)
+                except ValueError:
+                    raise InvalidDataFormatError("MAX_LEVEL must be an integer or NONE.")
+        else:
+            # ignore unknown keys
+            pass
+
+    validate_enemy_data(data)
+    return data
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -9,6 +9,9 @@ AI Usage: [Syntax Error Fixes, etc.]
 This module handles inventory management, item usage, and equipment.
 """
 
+from collections.abc import MutableSequence
+
+from game_data import ItemEffect, compile_item_effect
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -19,6 +22,158 @@ from custom_exceptions import (
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
 
+# ============================================================================
+# INVENTORY TYPE
+# ============================================================================
+
+class Inventory(MutableSequence):
+    """
+    List-like inventory with fast lookups
+    
+    Behaves like the plain list of item ids that character['inventory']
+    used to be (append, remove, in, count, len, iteration in insertion
+    order, ','.join(...)), so all the functions below and the save format
+    work unchanged. It is exactly that list plus an {item_id: count}
+    multiset, built the first time an item is looked up and kept up to date
+    afterwards. 'in' and count() are O(1), append() and pop() are O(1) as
+    for a list, and remove() fails in O(1) for a missing item; otherwise it
+    is one list.remove (a C scan and move, cheap even for thousands of
+    items).
+    """
+
+    __slots__ = ("_items", "_counts")
+
+    def __init__(self, items=()):
+        self._items = list(items)
+        # {item_id: count}, or None until the first lookup (see _index)
+        self._counts = None
+
+    def _index(self):
+        """Get the count multiset, building it if needed"""
+        counts = self._counts
+        if counts is None:
+            counts = self._counts = {}
+            for item_id in self._items:
+                counts[item_id] = counts.get(item_id, 0) + 1
+        return counts
+
+    def _discount(self, item_id):
+        """Take one copy of item_id off the multiset (if it is built)"""
+        counts = self._counts
+        if counts is not None:
+            left = counts[item_id] - 1
+            if left:
+                counts[item_id] = left
+            else:
+                del counts[item_id]
+
+    # --- Fast operations ---
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._index()
+
+    def count(self, item_id):
+        """Return how many of item_id are in the inventory"""
+        return self._index().get(item_id, 0)
+
+    def append(self, item_id):
+        """Add an item at the end"""
+        self._items.append(item_id)
+        counts = self._counts
+        if counts is not None:
+            counts[item_id] = counts.get(item_id, 0) + 1
+
+    def remove(self, item_id):
+        """
+        Remove the first (oldest) copy of an item
+        
+        Raises: ValueError if the item is not in the inventory (like list)
+        """
+        if item_id not in self._index():
+            raise ValueError(f"{item_id!r} is not in inventory")
+        self._items.remove(item_id)
+        self._discount(item_id)
+
+    def pop(self, index=-1):
+        """Remove and return an item (O(1) for the last item)"""
+        if not self._items:
+            raise IndexError("pop from empty inventory")
+        item_id = self._items.pop(index)
+        self._discount(item_id)
+        return item_id
+
+    def clear(self):
+        """Remove every item"""
+        self._items.clear()
+        self._counts = None
+
+    def extend(self, items):
+        """Add several items at the end"""
+        self._items.extend(items)
+        self._counts = None
+
+    def counts(self):
+        """
+        Count every distinct item
+        
+        Returns: Dictionary {item_id: quantity}, ordered by where each
+                 item first appears in the inventory
+        """
+        counts = self._index()
+        return {item_id: counts[item_id] for item_id in dict.fromkeys(self._items)}
+
+    def copy(self):
+        """Return the items as a plain list"""
+        return list(self._items)
+
+    # --- Index-based list operations (the multiset is rebuilt on next use) ---
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __setitem__(self, index, value):
+        self._items[index] = value
+        self._counts = None
+
+    def __delitem__(self, index):
+        del self._items[index]
+        self._counts = None
+
+    def insert(self, index, item_id):
+        """Insert an item before index"""
+        self._items.insert(index, item_id)
+        counts = self._counts
+        if counts is not None:
+            counts[item_id] = counts.get(item_id, 0) + 1
+
+    def index(self, item_id, *args):
+        """Return the position of the first copy of an item"""
+        return self._items.index(item_id, *args)
+
+    # --- Comparison, copying and display ---
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._items == other._items
+        if isinstance(other, list):
+            return self._items == other
+        return NotImplemented
+
+    def __reduce__(self):
+        return (self.__class__, (self._items,))
+
+    def __repr__(self):
+        return f"Inventory({self._items!r})"
+
 # ============================================================================
 # INVENTORY MANAGEMENT
 # ============================================================================
@@ -119,12 +274,13 @@ def use_item(character, item_id, item_data):
     if item_data["type"] != "consumable":
         raise InvalidItemTypeError("Only consumable items can be used.")
     
-    stat, value = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, value)
+    effects = get_item_effects(item_data)
+    apply_item_effects(character, effects)
 
     remove_item_from_inventory(character, item_id)
 
-    return f"{character['name']} used {item_id} and gained {stat} +{value}."
+    gained = ", ".join(f"{stat} +{value}" for stat, value in effects)
+    return f"{character['name']} used {item_id} and gained {gained}."
 
 def equip_weapon(character, item_id, item_data):
     """
@@ -136,6 +292,7 @@ def equip_weapon(character, item_id, item_data):
         item_data: Item information dictionary
     
     Weapon effect format: "strength:5" (adds 5 to strength)
+    The compiled effects are kept in character["equipped_weapon_effect"].
     
     If character already has weapon equipped:
     - Unequip current weapon (remove bonus)
@@ -155,22 +312,21 @@ def equip_weapon(character, item_id, item_data):
     # Unequip current weapon if needed
     if "equipped_weapon" in character and character["equipped_weapon"] is not None:
         old_weapon = character["equipped_weapon"]
-        old_stat, old_val = parse_item_effect(character["equipped_weapon_effect"])
-        apply_stat_effect(character, old_stat, -old_val)
+        apply_item_effects(character, get_item_effects(character["equipped_weapon_effect"]), -1)
 
         # Add old weapon back
         add_item_to_inventory(character, old_weapon)
 
     # Equip new weapon
-    stat, val = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, val)
+    effects = get_item_effects(item_data)
+    apply_item_effects(character, effects)
 
     character["equipped_weapon"] = item_id
-    character["equipped_weapon_effect"] = item_data["effect"]
+    character["equipped_weapon_effect"] = effects
 
     remove_item_from_inventory(character, item_id)
 
-    return f"{character['name']} equipped weapon: {item_id} (+{val} {stat})"
+    return f"{character['name']} equipped weapon: {item_id} ({describe_item_effects(effects)})"
 
 def equip_armor(character, item_id, item_data):
     """
@@ -182,6 +338,7 @@ def equip_armor(character, item_id, item_data):
         item_data: Item information dictionary
     
     Armor effect format: "max_health:10" (adds 10 to max_health)
+    The compiled effects are kept in character["equipped_armor_effect"].
     
     If character already has armor equipped:
     - Unequip current armor (remove bonus)
@@ -201,21 +358,20 @@ def equip_armor(character, item_id, item_data):
     # Unequip old armor
     if "equipped_armor" in character and character["equipped_armor"] is not None:
         old = character["equipped_armor"]
-        old_stat, old_val = parse_item_effect(character["equipped_armor_effect"])
-        apply_stat_effect(character, old_stat, -old_val)
+        apply_item_effects(character, get_item_effects(character["equipped_armor_effect"]), -1)
 
         add_item_to_inventory(character, old)
 
     # Equip new armor
-    stat, val = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, val)
+    effects = get_item_effects(item_data)
+    apply_item_effects(character, effects)
 
     character["equipped_armor"] = item_id
-    character["equipped_armor_effect"] = item_data["effect"]
+    character["equipped_armor_effect"] = effects
 
     remove_item_from_inventory(character, item_id)
 
-    return f"{character['name']} equipped armor: {item_id} (+{val} {stat})"
+    return f"{character['name']} equipped armor: {item_id} ({describe_item_effects(effects)})"
 
 def unequip_weapon(character):
     """
@@ -231,8 +387,7 @@ def unequip_weapon(character):
         raise InventoryFullError("No space to unequip weapon.")
 
     item_id = character["equipped_weapon"]
-    stat, val = parse_item_effect(character["equipped_weapon_effect"])
-    apply_stat_effect(character, stat, -val)
+    apply_item_effects(character, get_item_effects(character["equipped_weapon_effect"]), -1)
 
     add_item_to_inventory(character, item_id)
 
@@ -255,8 +410,7 @@ def unequip_armor(character):
         raise InventoryFullError("No space to unequip armor.")
 
     item_id = character["equipped_armor"]
-    stat, val = parse_item_effect(character["equipped_armor_effect"])
-    apply_stat_effect(character, stat, -val)
+    apply_item_effects(character, get_item_effects(character["equipped_armor_effect"]), -1)
 
     add_item_to_inventory(character, item_id)
 
@@ -316,6 +470,105 @@ def sell_item(character, item_id, item_data):
 
     return sell_value
 
+def purchase_items(character, order, item_data_dict):
+    """
+    Buy several items in one transaction
+    
+    The whole order is checked first (every item exists, total cost, free
+    inventory space) and then applied at once. Either every item is bought
+    or, if anything fails, nothing is: gold and inventory are left as
+    they were.
+    
+    Args:
+        character: Character dictionary
+        order: Dictionary {item_id: quantity}, or a list of item ids (an id
+               listed twice is bought twice)
+        item_data_dict: Item catalog {item_id: item_data}
+    
+    Returns: Total gold spent
+    Raises:
+        ItemNotFoundError if an item is not in the catalog
+        ValueError if a quantity is not a positive integer
+        InsufficientResourcesError if the total cost is more than the gold
+        InventoryFullError if the items do not all fit
+    """
+    quantities = _order_quantities(order)
+
+    total_cost = 0
+    for item_id, quantity in quantities.items():
+        if item_id not in item_data_dict:
+            raise ItemNotFoundError(f"Item '{item_id}' not found.")
+        total_cost += item_data_dict[item_id]["cost"] * quantity
+
+    if character["gold"] < total_cost:
+        raise InsufficientResourcesError(
+            f"Not enough gold: the order costs {total_cost}, you have {character['gold']}."
+        )
+    if get_inventory_space_remaining(character) < sum(quantities.values()):
+        raise InventoryFullError("Not enough inventory space for the whole order.")
+
+    inventory = character["inventory"]
+    before = (character["gold"], len(inventory))
+    try:
+        character["gold"] -= total_cost
+        for item_id, quantity in quantities.items():
+            for _ in range(quantity):
+                inventory.append(item_id)
+    except BaseException:
+        # Undo the appends (always at the end, so pop() is O(1))
+        character["gold"] = before[0]
+        while len(inventory) > before[1]:
+            inventory.pop()
+        raise
+
+    return total_cost
+
+def sell_items(character, order, item_data_dict):
+    """
+    Sell several items in one transaction, each for half its cost
+    
+    The whole order is checked first (every item is in the catalog and the
+    inventory holds enough copies) and then applied at once. If anything
+    fails nothing is sold.
+    
+    Args:
+        character: Character dictionary
+        order: Dictionary {item_id: quantity}, or a list of item ids
+        item_data_dict: Item catalog {item_id: item_data}
+    
+    Returns: Total gold received
+    Raises:
+        ItemNotFoundError if an item is not in the catalog, or the
+            inventory has fewer copies than are being sold
+        ValueError if a quantity is not a positive integer
+    """
+    quantities = _order_quantities(order)
+    inventory = character["inventory"]
+
+    total_value = 0
+    for item_id, quantity in quantities.items():
+        if item_id not in item_data_dict:
+            raise ItemNotFoundError(f"Item '{item_id}' not found.")
+        if inventory.count(item_id) < quantity:
+            raise ItemNotFoundError(
+                f"Cannot sell {quantity} x '{item_id}': only {inventory.count(item_id)} in inventory."
+            )
+        total_value += (item_data_dict[item_id]["cost"] // 2) * quantity
+
+    before = (character["gold"], list(inventory))
+    try:
+        for item_id, quantity in quantities.items():
+            for _ in range(quantity):
+                inventory.remove(item_id)
+        character["gold"] += total_value
+    except BaseException:
+        character["gold"] = before[0]
+        inventory.clear()
+        inventory.extend(before[1])
+        raise
+
+    return total_value
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -333,6 +586,87 @@ def parse_item_effect(effect_string):
     stat, value = effect_string.split(":")
     return stat, int(value)
 
+# Compiled effects of item dictionaries built by hand (not loaded through
+# game_data) and of effect strings stored by older versions
+_compiled_effects = {}
+
+def get_item_effects(item):
+    """
+    Get the compiled effects of an item
+    
+    Args:
+        item: Item data dictionary, an equipped effect (tuple of
+              ItemEffect, or any sequence of (stat, delta) pairs such as
+              a list after a JSON round trip), or an effect string like
+              "strength:5"
+    
+    Returns: Tuple of ItemEffect(stat, delta)
+    Raises: InvalidDataFormatError if an effect string is malformed
+    """
+    if type(item) is tuple:
+        return item
+    if isinstance(item, dict):
+        effects = item.get("effects")
+        if effects is not None:
+            return effects if type(effects) is tuple else _as_item_effects(effects)
+        item = item["effect"]
+    if not isinstance(item, str):
+        return _as_item_effects(item)
+
+    effects = _compiled_effects.get(item)
+    if effects is None:
+        effects = _compiled_effects[item] = compile_item_effect(item)
+    return effects
+
+def _as_item_effects(pairs):
+    """Convert a sequence of (stat, delta) pairs to a tuple of ItemEffect"""
+    return tuple(ItemEffect(stat, delta) for stat, delta in pairs)
+
+def describe_item_effects(effects):
+    """
+    Describe equipment bonuses for messages
+    
+    Returns: String like "+5 strength" (several effects comma-separated)
+    """
+    if len(effects) == 1:
+        stat, delta = effects[0]
+        return f"+{delta} {stat}"
+    return ", ".join(f"+{delta} {stat}" for stat, delta in effects)
+
+def _order_quantities(order):
+    """
+    Turn a batch order into quantities per item
+    
+    Returns: Dictionary {item_id: quantity} in order of first appearance
+    Raises: ValueError if a quantity is not a positive integer
+    """
+    if isinstance(order, dict):
+        quantities = dict(order)
+    else:
+        quantities = {}
+        for item_id in order:
+            quantities[item_id] = quantities.get(item_id, 0) + 1
+
+    for item_id, quantity in quantities.items():
+        if not isinstance(quantity, int) or quantity < 1:
+            raise ValueError(f"Quantity for '{item_id}' must be a positive integer.")
+    return quantities
+
+def apply_item_effects(character, effects, sign=1):
+    """
+    Apply compiled item effects to a character
+    
+    Args:
+        character: Character dictionary
+        effects: Tuple of ItemEffect
+        sign: 1 to add the effects, -1 to take them away again
+    """
+    # Same rules as apply_stat_effect, inlined for equip/unequip loops
+    for stat, delta in effects:
+        character[stat] += sign * delta
+        if stat == "health" and character["health"] > character["max_health"]:
+            character["health"] = character["max_health"]
+
 def apply_stat_effect(character, stat_name, value):
     """
     Apply a stat modification to character
@@ -361,9 +695,12 @@ def display_inventory(character, item_data_dict):
         print("Inventory is empty.")
         return
 
-    counted = {}
-    for item_id in character["inventory"]:
-        counted[item_id] = counted.get(item_id, 0) + 1
+    if isinstance(character["inventory"], Inventory):
+        counted = character["inventory"].counts()
+    else:
+        counted = {}
+        for item_id in character["inventory"]:
+            counted[item_id] = counted.get(item_id, 0) + 1
 
     for item_id, qty in counted.items():
         item = item_data_dict.get(item_id, {"name": "Unknown", "type": "unknown"})
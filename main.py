@@ -10,12 +10,18 @@ This is the main game file that ties all modules together.
 Demonstrates module integration and complete game flow.
 """
 
+import os
+
 # Import all our custom modules
 import character_manager
 import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import save_store
+import shop_catalog
+import autosave
+import profiling
 from custom_exceptions import *
 
 # ============================================================================
@@ -27,6 +33,21 @@ current_character = None
 all_quests = {}
 all_items = {}
 game_running = False
+autosaver = None
+
+# Optional content pack directories (one catalog file per region/expansion)
+QUEST_PACK_DIR = os.path.join("data", "quests")
+ITEM_PACK_DIR = os.path.join("data", "items")
+
+# Hot reload: set QUEST_CHRONICLES_HOT_RELOAD=1 to pick up data file edits
+# without restarting. The watchers stay None when hot reload is off.
+HOT_RELOAD_ENV = "QUEST_CHRONICLES_HOT_RELOAD"
+quest_watcher = None
+item_watcher = None
+
+# Set QUEST_CHRONICLES_SAVE_DB to a database path to keep saves in SQLite
+# instead of one text file per character
+SAVE_DB_ENV = "QUEST_CHRONICLES_SAVE_DB"
 
 # ============================================================================
 # MAIN MENU
@@ -138,45 +159,57 @@ def load_game():
 def game_loop():
     """
     Main game loop - shows game menu and processes actions
+
+    Changes are auto-saved by an AutosaveScheduler: actions that do not
+    change the character (viewing stats, browsing the shop) cost no disk
+    I/O, and pending changes are always saved when the loop ends.
     """
-    global game_running, current_character
+    global game_running, current_character, autosaver
     
     game_running = True
-    
-    while game_running:
-        if current_character is None:
-            print("No active character. Returning to main menu.")
-            return
-
-        choice = game_menu()
+    autosaver = autosave.AutosaveScheduler(current_character)
 
-        # Actions
-        if choice == 1:
-            view_character_stats()
-        elif choice == 2:
-            view_inventory()
-        elif choice == 3:
-            quest_menu()
-        elif choice == 4:
-            explore()
-            # If character died inside explore, game_loop may be ended by handle_character_death
+    try:
+        while game_running:
             if current_character is None:
+                print("No active character. Returning to main menu.")
                 return
-        elif choice == 5:
-            shop()
-        elif choice == 6:
-            save_game()
-            print("Saved. Returning to main menu.")
-            return
-        else:
-            print("Invalid selection.")
 
-        # Auto-save after each action
-        try:
-            save_game()
-        except Exception as e:
-            print(f"Auto-save failed: {e}")
+            refresh_game_data()
+            choice = game_menu()
+
+            # Actions
+            if choice == 1:
+                view_character_stats()
+            elif choice == 2:
+                view_inventory()
+            elif choice == 3:
+                quest_menu()
+            elif choice == 4:
+                explore()
+                # If character died inside explore, game_loop may be ended by handle_character_death
+                if current_character is None:
+                    return
+            elif choice == 5:
+                shop()
+            elif choice == 6:
+                stop_autosave()
+                save_game()
+                print("Saved. Returning to main menu.")
+                return
+            else:
+                print("Invalid selection.")
 
+            # Auto-save (only does anything if the action changed the character)
+            try:
+                autosaver.mark_action()
+            except Exception as e:
+                print(f"Auto-save failed: {e}")
+            if autosaver.last_error is not None:
+                print(f"Auto-save failed: {autosaver.last_error}")
+                autosaver.last_error = None
+    finally:
+        stop_autosave()
 
 def game_menu():
     """
@@ -436,13 +469,21 @@ def explore():
 
     print("\nYou explore the wilds...")
     enemy = combat_system.get_random_enemy_for_level(c['level'])
-    battle = combat_system.SimpleBattle(c, enemy)
 
     try:
-        result = battle.start_battle()
+        record = combat_system.record_battle(c, enemy)
     except CharacterDeadError:
         print("You are dead and cannot fight.")
         return
+    result = record.result
+
+    # Keep every fight so a disputed outcome can be replayed later
+    # (combat_system.load_battle_records / verify_battle_record)
+    try:
+        combat_system.append_battle_record(
+            record, combat_system.get_battle_log_path(c['name']))
+    except OSError as e:
+        print(f"Warning: could not record the battle: {e}")
 
     # If returned result says player won, grant rewards using character_manager
     if result.get("winner") == "player":
@@ -459,9 +500,17 @@ def explore():
             print("Error adding gold.")
 
         print(f"You gained {xp} XP and {gold} gold!")
+    elif result.get("winner") == "escaped":
+        print("You made it back safely.")
     else:
         # player lost
         print("You were defeated.")
+        # Make sure everything up to this battle is on disk
+        if autosaver is not None:
+            try:
+                autosaver.flush()
+            except Exception as e:
+                print(f"Auto-save failed: {e}")
         handle_character_death()
 
 def shop():
@@ -473,25 +522,36 @@ def shop():
         print("No character loaded.")
         return
 
-    # Build list of items (simple listing)
-    item_keys = list(all_items.keys())
+    # Indexes are built once per item catalog, and each screen only formats
+    # one page of items
+    catalog = shop_catalog.get_shop_catalog(all_items)
+    filters = {}
+    page_index = 0
     while True:
+        results = catalog.search(**filters)
+        pages = results.page_count()
+        page_index = min(page_index, pages - 1)
+        page = results.page(page_index)
+
         print("\n=== SHOP ===")
         print(f"Gold: {c['gold']}")
-        for i, key in enumerate(item_keys, start=1):
-            itm = all_items[key]
+        if filters:
+            shown = ", ".join(f"{key}={value}" for key, value in filters.items())
+            print(f"Filters: {shown}")
+        print(f"Page {page_index + 1}/{pages} ({len(results)} items)")
+        for i, (key, itm) in enumerate(page, start=1):
             print(f"{i}. {itm['name']} ({key}) - {itm['type']} - Cost: {itm['cost']}")
-        print(f"{len(item_keys)+1}. Sell item")
-        print(f"{len(item_keys)+2}. Back")
-
-        choice = input(f"Choose (1-{len(item_keys)+2}): ").strip()
-        if not choice.isdigit():
-            print("Enter a number.")
-            continue
-        choice = int(choice)
-        if 1 <= choice <= len(item_keys):
-            item_id = item_keys[choice - 1]
-            item_data = all_items[item_id]
+        print("N. Next page   P. Previous page")
+        print("T. Filter by type   C. Filter by cost   E. Filter by stat   A. Clear filters")
+        print("S. Sell item   B. Back")
+
+        choice = input(f"Choose (1-{len(page)} or a letter): ").strip().upper()
+        if choice.isdigit():
+            number = int(choice)
+            if not 1 <= number <= len(page):
+                print("Invalid choice.")
+                continue
+            item_id, item_data = page[number - 1]
             try:
                 inventory_system.purchase_item(c, item_id, item_data)
                 print(f"Purchased {item_data['name']}.")
@@ -502,25 +562,57 @@ def shop():
             except Exception as e:
                 print(f"Error purchasing item: {e}")
 
-        elif choice == len(item_keys) + 1:
-            # Sell flow
-            sid = input("Enter item id to sell: ").strip()
-            if sid not in c['inventory']:
+        elif choice == "N":
+            page_index = min(page_index + 1, pages - 1)
+        elif choice == "P":
+            page_index = max(page_index - 1, 0)
+
+        elif choice == "T":
+            item_type = input(f"Type ({', '.join(catalog.types)}): ").strip().lower()
+            if item_type not in catalog.types:
+                print("Unknown item type.")
+                continue
+            filters["item_type"] = item_type
+            page_index = 0
+        elif choice == "C":
+            try:
+                filters["min_cost"] = int(input("Minimum cost: ").strip() or 0)
+                filters["max_cost"] = int(input("Maximum cost: ").strip() or c['gold'])
+            except ValueError:
+                print("Enter a number.")
+                continue
+            page_index = 0
+        elif choice == "E":
+            stat = input(f"Stat ({', '.join(catalog.stats)}): ").strip().lower()
+            if stat not in catalog.stats:
+                print("No items change that stat.")
+                continue
+            filters["stat"] = stat
+            page_index = 0
+        elif choice == "A":
+            filters = {}
+            page_index = 0
+
+        elif choice == "S":
+            # Sell flow (several ids, comma-separated, are sold together)
+            sids = [sid.strip() for sid in input("Enter item id(s) to sell: ").split(",") if sid.strip()]
+            missing = [sid for sid in sids if sid not in c['inventory']]
+            if not sids or missing:
                 print("You don't have that item.")
                 continue
-            item_data = all_items.get(sid)
-            if item_data is None:
+            unknown = [sid for sid in sids if sid not in all_items]
+            if unknown:
                 print("Unknown item data; cannot sell.")
                 continue
             try:
-                amt = inventory_system.sell_item(c, sid, item_data)
-                print(f"Sold {sid} for {amt} gold.")
-            except ItemNotFoundError:
-                print("Item not found.")
+                amt = inventory_system.sell_items(c, sids, all_items)
+                print(f"Sold {', '.join(sids)} for {amt} gold.")
+            except ItemNotFoundError as e:
+                print(f"Item not found: {e}")
             except Exception as e:
                 print(f"Error selling item: {e}")
 
-        elif choice == len(item_keys) + 2:
+        elif choice == "B":
             return
         else:
             print("Invalid choice.")
@@ -547,12 +639,23 @@ def save_game():
 
 
 def load_game_data():
-    """Load all quest and item data from files"""
+    """
+    Load all quest and item data from files
+
+    If a content pack directory (data/quests/ or data/items/) exists, every
+    file in it is loaded in parallel instead of the single data file.
+    """
     global all_quests, all_items
     
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        if os.path.isdir(QUEST_PACK_DIR):
+            all_quests = game_data.load_quest_pack(QUEST_PACK_DIR)
+        else:
+            all_quests = game_data.load_quests(use_cache=True)
+        if os.path.isdir(ITEM_PACK_DIR):
+            all_items = game_data.load_item_pack(ITEM_PACK_DIR)
+        else:
+            all_items = game_data.load_items(use_cache=True)
     except MissingDataFileError:
         # Let caller decide to create defaults
         raise
@@ -561,6 +664,54 @@ def load_game_data():
     except CorruptedDataError as e:
         raise
 
+def stop_autosave():
+    """Stop the autosave scheduler, saving any pending changes first"""
+    global autosaver
+
+    if autosaver is None:
+        return
+    try:
+        autosaver.close()
+    except Exception as e:
+        print(f"Auto-save failed: {e}")
+    autosaver = None
+
+def enable_hot_reload():
+    """
+    Start watching the quest and item files for changes
+
+    Content packs (data/quests/, data/items/) are not watched.
+
+    Returns: True if hot reload is on, False if there is nothing to watch
+    """
+    global all_quests, all_items, quest_watcher, item_watcher
+
+    if not os.path.isdir(QUEST_PACK_DIR):
+        quest_watcher = game_data.CatalogWatcher("data/quests.txt", "quests")
+        all_quests = quest_watcher.catalog
+    if not os.path.isdir(ITEM_PACK_DIR):
+        item_watcher = game_data.CatalogWatcher("data/items.txt", "items")
+        all_items = item_watcher.catalog
+    return quest_watcher is not None or item_watcher is not None
+
+def refresh_game_data():
+    """
+    Swap in edited quest/item data if hot reload is on and a file changed
+
+    A broken edit is reported and the previous data is kept.
+    """
+    global all_quests, all_items
+
+    try:
+        if quest_watcher is not None and quest_watcher.poll():
+            all_quests = quest_watcher.catalog
+            print(f"Quest data reloaded ({quest_watcher.blocks_reparsed} changed).")
+        if item_watcher is not None and item_watcher.poll():
+            all_items = item_watcher.catalog
+            print(f"Item data reloaded ({item_watcher.blocks_reparsed} changed).")
+    except DataError as e:
+        print(f"Could not reload game data, keeping the old data: {e}")
+
 def handle_character_death():
     """Handle character death"""
     global current_character, game_running
@@ -615,6 +766,9 @@ def display_welcome():
 def main():
     """Main game execution function"""
     
+    if profiling.enable_from_environment():
+        print("Profiling enabled.")
+
     # Display welcome message
     display_welcome()
     
@@ -630,6 +784,21 @@ def main():
         print(f"Error loading game data: {e}")
         print("Please check data files for errors.")
         return
+
+    if os.environ.get(SAVE_DB_ENV):
+        try:
+            character_manager.set_save_backend(
+                save_store.SQLiteSaveStore(os.environ[SAVE_DB_ENV])
+            )
+        except SaveFileCorruptedError as e:
+            print(f"Could not open save database, using save files: {e}")
+
+    if os.environ.get(HOT_RELOAD_ENV):
+        try:
+            if enable_hot_reload():
+                print("Hot reload enabled.")
+        except DataError as e:
+            print(f"Could not enable hot reload: {e}")
     
     # Main menu loop
     while True:
@@ -641,6 +810,8 @@ def main():
             load_game()
         elif choice == 3:
             print("\nThanks for playing Quest Chronicles!")
+            if profiling.is_enabled():
+                print(profiling.format_report(profiling.report()))
             break
         else:
             print("Invalid choice. Please select 1-3.")
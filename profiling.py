@@ -0,0 +1,359 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Profiling Module
+
+Opt-in call counts and timings for the public functions of the game modules.
+
+Profiling is off by default and then costs nothing: no function is wrapped.
+enable() (or setting QUEST_CHRONICLES_PROFILE=1 before the game starts)
+replaces every public function of the profiled modules, and every public
+method of their public classes, with a thin timing wrapper, and disable()
+puts the original functions back.
+
+For every function the wrappers count calls and add up
+    cumulative time  time from entry to return, including the functions
+                     it called (a recursive call is only counted once)
+    self time        cumulative time minus the time spent in other
+                     profiled functions it called
+A generator function's call is one generator, and its time is the time
+spent running the generator body, summed over every resume.
+
+Only calls through the module attribute are seen (character_manager.foo(),
+or foo() inside character_manager itself); a name imported earlier with
+`from module import foo` keeps pointing at the original function, and so
+does a bound method saved before enable(). Each thread times its own
+calls, and report() adds the threads together.
+"""
+
+import functools
+import inspect
+import os
+import sys
+import threading
+from collections import namedtuple
+from time import perf_counter
+
+# Set this environment variable to turn profiling on at startup
+PROFILE_ENV = "QUEST_CHRONICLES_PROFILE"
+
+# Modules profiled when enable() is called without a list
+DEFAULT_MODULES = (
+    "character_manager", "inventory_system", "quest_handler", "combat_system", "game_data",
+)
+
+# Functions shown by report() by default
+DEFAULT_TOP = 10
+
+# One row of report(); times are in seconds
+FunctionStats = namedtuple(
+    "FunctionStats", ["name", "calls", "cumulative", "self_time", "per_call"]
+)
+
+# Indexes into the per-thread [calls, cumulative, self_time, depth] lists
+CALLS, CUMULATIVE, SELF_TIME, DEPTH = range(4)
+
+# ============================================================================
+# PROFILER STATE
+# ============================================================================
+
+# {(module or class, name): original function} for every installed wrapper
+_originals = {}
+
+# Per-thread state: .stack holds the child time of each active profiled
+# call, .stats is {qualified name: [calls, cumulative, self_time, depth]}
+_local = threading.local()
+
+# The stats dictionary of every thread that has made a profiled call
+_all_stats = []
+_all_stats_lock = threading.Lock()
+
+def _thread_state():
+    """Set up profiling state for the current thread"""
+    _local.stack = []
+    _local.stats = {}
+    with _all_stats_lock:
+        _all_stats.append(_local.stats)
+    return _local.stack, _local.stats
+
+def _stats_entry(name):
+    """Get the current thread's call stack and the stats entry for name"""
+    try:
+        stack = _local.stack
+        stats = _local.stats
+    except AttributeError:
+        stack, stats = _thread_state()
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = [0, 0.0, 0.0, 0]
+    return stack, entry
+
+def _stop_timer(stack, entry, start):
+    """Add the time since start to entry and to the caller's child time"""
+    elapsed = perf_counter() - start
+    child_time = stack.pop()
+    entry[DEPTH] -= 1
+    entry[SELF_TIME] += elapsed - child_time
+    if not entry[DEPTH]:
+        entry[CUMULATIVE] += elapsed
+    if stack:
+        stack[-1] += elapsed
+
+def _make_wrapper(function, name):
+    """Wrap one function with a timer that records under name"""
+    if inspect.isgeneratorfunction(function):
+        return _make_generator_wrapper(function, name)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stack, entry = _stats_entry(name)
+        entry[DEPTH] += 1
+        stack.append(0.0)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _stop_timer(stack, entry, start)
+            entry[CALLS] += 1
+
+    wrapper.__wrapped__ = function
+    return wrapper
+
+def _make_generator_wrapper(function, name):
+    """
+    Wrap a generator function
+
+    Calling the function only creates the generator, so each generator
+    counts as one call and its time is the time spent inside it across
+    all of its resumes (the time the caller spends between them is not
+    included).
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        generator = function(*args, **kwargs)
+        _stats_entry(name)[1][CALLS] += 1
+        return _timed_generator(generator, name)
+
+    wrapper.__wrapped__ = function
+    return wrapper
+
+def _timed_generator(generator, name):
+    """Pass values, exceptions and close() through to generator, timing each resume"""
+    resume = generator.send
+    value = None
+    while True:
+        # Look the entry up on every resume: another thread may resume it
+        stack, entry = _stats_entry(name)
+        entry[DEPTH] += 1
+        stack.append(0.0)
+        start = perf_counter()
+        try:
+            item = resume(value)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            _stop_timer(stack, entry, start)
+
+        try:
+            value = yield item
+            resume = generator.send
+        except GeneratorExit:
+            generator.close()
+            raise
+        except BaseException as error:
+            value = error
+            resume = generator.throw
+
+# ============================================================================
+# ENABLE / DISABLE
+# ============================================================================
+
+def public_functions(module):
+    """
+    Find the functions a module defines and does not mark private
+
+    Functions imported from other modules are left out, so each function
+    is profiled under the module that defines it.
+
+    Returns: Dictionary {name: function}
+    """
+    return {
+        name: value for name, value in vars(module).items()
+        if not name.startswith("_")
+        and inspect.isfunction(value)
+        and value.__module__ == module.__name__
+    }
+
+def public_classes(module):
+    """
+    Find the classes a module defines and does not mark private
+
+    Returns: Dictionary {name: class}
+    """
+    return {
+        name: value for name, value in vars(module).items()
+        if not name.startswith("_")
+        and inspect.isclass(value)
+        and value.__module__ == module.__name__
+    }
+
+def public_methods(cls):
+    """
+    Find the plain methods a class defines and does not mark private
+
+    Inherited methods are profiled under the class that defines them.
+    Static methods, class methods and properties are left out.
+
+    Returns: Dictionary {name: function}
+    """
+    return {
+        name: value for name, value in vars(cls).items()
+        if not name.startswith("_") and inspect.isfunction(value)
+    }
+
+def profiled_targets(module):
+    """
+    List everything enable() wraps in a module
+
+    Returns: List of (owner, name, function, qualified name) where owner
+             is the module or one of its public classes
+    """
+    targets = [
+        (module, name, function, f"{module.__name__}.{name}")
+        for name, function in public_functions(module).items()
+    ]
+    for cls in public_classes(module).values():
+        targets.extend(
+            (cls, name, function, f"{module.__name__}.{cls.__qualname__}.{name}")
+            for name, function in public_methods(cls).items()
+        )
+    return targets
+
+def enable(modules=None):
+    """
+    Start profiling the public functions of some modules, and the public
+    methods of their public classes
+
+    Modules already being profiled are skipped, so calling enable() twice
+    is harmless.
+
+    Args:
+        modules: Module objects or names (default DEFAULT_MODULES)
+
+    Returns: Number of functions wrapped by this call
+    """
+    if modules is None:
+        modules = DEFAULT_MODULES
+
+    wrapped = 0
+    for module in modules:
+        if isinstance(module, str):
+            module = sys.modules.get(module) or __import__(module)
+        for owner, name, function, qualified_name in profiled_targets(module):
+            key = (owner, name)
+            if key in _originals:
+                continue
+            _originals[key] = function
+            setattr(owner, name, _make_wrapper(function, qualified_name))
+            wrapped += 1
+    return wrapped
+
+def disable():
+    """
+    Stop profiling and put every original function back
+
+    The collected statistics are kept until reset().
+
+    Returns: Number of functions restored
+    """
+    restored = 0
+    for (owner, name), function in list(_originals.items()):
+        # Leave the attribute alone if something else replaced our wrapper
+        if getattr(getattr(owner, name, None), "__wrapped__", None) is function:
+            setattr(owner, name, function)
+            restored += 1
+    _originals.clear()
+    return restored
+
+def is_enabled():
+    """Check whether any function is currently wrapped"""
+    return bool(_originals)
+
+def enable_from_environment():
+    """
+    Enable profiling if QUEST_CHRONICLES_PROFILE is set (and not "0")
+
+    Returns: True if profiling is on
+    """
+    if os.environ.get(PROFILE_ENV, "0") not in ("", "0"):
+        enable()
+    return is_enabled()
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def reset():
+    """Forget all collected statistics"""
+    with _all_stats_lock:
+        for stats in _all_stats:
+            for entry in stats.values():
+                entry[CALLS] = 0
+                entry[CUMULATIVE] = 0.0
+                entry[SELF_TIME] = 0.0
+
+def report(top=DEFAULT_TOP, sort="self_time"):
+    """
+    Get the hottest profiled functions
+
+    Args:
+        top: Number of functions to return (None = all)
+        sort: "self_time", "cumulative" or "calls"
+
+    Returns: List of FunctionStats, hottest first
+    Raises: ValueError for an unknown sort key
+    """
+    if sort not in ("self_time", "cumulative", "calls"):
+        raise ValueError(f"Unknown sort key '{sort}'")
+
+    totals = {}
+    with _all_stats_lock:
+        for stats in _all_stats:
+            for name, entry in list(stats.items()):
+                total = totals.setdefault(name, [0, 0.0, 0.0])
+                total[CALLS] += entry[CALLS]
+                total[CUMULATIVE] += entry[CUMULATIVE]
+                total[SELF_TIME] += entry[SELF_TIME]
+
+    rows = [
+        FunctionStats(name, calls, cumulative, self_time, cumulative / calls)
+        for name, (calls, cumulative, self_time) in totals.items() if calls
+    ]
+    rows.sort(key=lambda row: getattr(row, sort), reverse=True)
+    return rows if top is None else rows[:top]
+
+def format_report(rows):
+    """Format report() output as a text table"""
+    lines = [f"{'function':50} {'calls':>9} {'cumulative':>12} {'self':>12} {'per call':>12}"]
+    for row in rows:
+        lines.append(
+            f"{row.name:50} {row.calls:9d} {row.cumulative * 1e3:10.2f}ms"
+            f" {row.self_time * 1e3:10.2f}ms {row.per_call * 1e6:10.1f}us"
+        )
+    return "\n".join(lines)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== PROFILING TEST ===")
+
+    import character_manager
+
+    print(f"Wrapped {enable()} functions")
+    hero = character_manager.create_character("TestHero", "Warrior")
+    for _ in range(100):
+        character_manager.gain_experience(hero, 10)
+    disable()
+    print(format_report(report(5)))
@@ -0,0 +1,599 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Graph Module
+
+Prerequisite graph for a quest catalog, built once per catalog load.
+
+Every quest has at most one prerequisite, so a catalog is a forest of
+prerequisite trees. QuestGraph indexes it so quest_handler never has to
+scan the whole catalog:
+- unlocks: prerequisite id -> quests it unlocks (reverse adjacency)
+- order: every quest in topological order (prerequisites first)
+- level buckets: required level -> quests, with the levels kept sorted
+- memoized prerequisite chains
+
+Prerequisite cycles are rejected when the graph is built, so a broken data
+file fails at load time instead of hanging the game.
+
+QuestCatalog is the quest dictionary returned by game_data.load_quests. It
+behaves like a normal dict and builds its QuestGraph the first time the
+graph is needed (and again after the catalog is changed).
+
+QuestFrontier keeps one character's available quests up to date as quests
+are accepted, completed and abandoned and as the character levels up.
+
+QuestLog is the ordered, set-backed list used for a character's active and
+completed quests.
+"""
+
+import copy
+from bisect import bisect_left, bisect_right
+from collections.abc import MutableSequence
+
+from custom_exceptions import InvalidDataFormatError, QuestNotFoundError
+
+# Value of 'prerequisite' for quests without one
+NO_PREREQUISITE = "NONE"
+
+# QuestGraph attributes saved by QuestCatalog.cache_state(); the catalog
+# positions are cheap to recompute and the memoized chains start empty
+GRAPH_INDEXES = ("unlocks", "roots", "levels", "level_buckets", "order",
+                 "_roots_by_level", "_root_levels")
+
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+class QuestGraph:
+    """
+    Precomputed indexes over one quest catalog
+
+    Build it from a quest dictionary {quest_id: quest_data}. The graph does
+    not copy the quests, so rebuild it if the catalog changes (QuestCatalog
+    does this automatically).
+    """
+
+    def __init__(self, quest_data_dict):
+        """
+        Index a quest catalog
+
+        Raises: InvalidDataFormatError if the prerequisites form a cycle
+        """
+        self.quests = quest_data_dict
+        # Catalog position of every quest, to return results in catalog order
+        self.position = {}
+
+        unlocks = {}
+        roots = []
+        buckets = {}
+        for index, (quest_id, quest) in enumerate(quest_data_dict.items()):
+            self.position[quest_id] = index
+            prereq = quest["prerequisite"]
+            if prereq == NO_PREREQUISITE:
+                roots.append(quest_id)
+            else:
+                unlocks.setdefault(prereq, []).append(quest_id)
+            buckets.setdefault(quest["required_level"], []).append(quest_id)
+
+        self.unlocks = {prereq: tuple(ids) for prereq, ids in unlocks.items()}
+        self.roots = tuple(roots)
+        self.levels = sorted(buckets)
+        self.level_buckets = {level: tuple(buckets[level]) for level in self.levels}
+        self.order = self._topological_order()
+
+        # Roots sorted by level, so a character only looks at the roots
+        # it is high enough level for
+        self._roots_by_level = sorted(roots, key=lambda q: quest_data_dict[q]["required_level"])
+        self._root_levels = [quest_data_dict[q]["required_level"] for q in self._roots_by_level]
+
+        self._chains = {}
+
+    @classmethod
+    def from_indexes(cls, quest_data_dict, indexes):
+        """
+        Rebuild a graph from indexes saved by indexes()
+
+        The catalog is not validated again: only use indexes taken from a
+        graph built for exactly these quests.
+
+        Returns: QuestGraph
+        """
+        graph = cls.__new__(cls)
+        graph.quests = quest_data_dict
+        graph.position = dict(zip(quest_data_dict, range(len(quest_data_dict))))
+        for name, value in zip(GRAPH_INDEXES, indexes):
+            setattr(graph, name, value)
+        graph._chains = {}
+        return graph
+
+    def indexes(self):
+        """Return the precomputed indexes, in GRAPH_INDEXES order"""
+        return tuple(getattr(self, name) for name in GRAPH_INDEXES)
+
+    def _topological_order(self):
+        """
+        Order quests so every prerequisite comes before the quests it unlocks
+
+        Quests whose prerequisite is missing from the catalog start their own
+        tree (they can never be accepted, but they are not an error here).
+
+        Returns: Tuple of quest ids
+        Raises: InvalidDataFormatError if some quests form a cycle
+        """
+        quests = self.quests
+        order = [
+            quest_id for quest_id, quest in quests.items()
+            if quest["prerequisite"] == NO_PREREQUISITE or quest["prerequisite"] not in quests
+        ]
+        # order doubles as the BFS queue
+        index = 0
+        while index < len(order):
+            order.extend(self.unlocks.get(order[index], ()))
+            index += 1
+
+        if len(order) != len(quests):
+            placed = set(order)
+            start = next(quest_id for quest_id in quests if quest_id not in placed)
+            raise InvalidDataFormatError(
+                f"Quest prerequisites form a cycle: {' -> '.join(self._find_cycle(start))}"
+            )
+        return tuple(order)
+
+    def _find_cycle(self, start):
+        """Follow prerequisites from a quest that is not in any tree until one repeats"""
+        seen = {}
+        path = []
+        current = start
+        while current not in seen:
+            seen[current] = len(path)
+            path.append(current)
+            current = self.quests[current]["prerequisite"]
+        return path[seen[current]:] + [current]
+
+    def available_quests(self, character):
+        """
+        Find the quests a character can accept right now
+
+        Only looks at root quests up to the character's level and at quests
+        unlocked by the character's completed quests, never at the whole
+        catalog.
+
+        Returns: List of quest ids in catalog order
+        """
+        level = character["level"]
+        completed = as_lookup(character["completed_quests"])
+        active = as_lookup(character["active_quests"])
+        quests = self.quests
+
+        available = [
+            quest_id
+            for quest_id in self._roots_by_level[:bisect_right(self._root_levels, level)]
+            if quest_id not in completed and quest_id not in active
+        ]
+        for done in completed:
+            for quest_id in self.unlocks.get(done, ()):
+                if (quests[quest_id]["required_level"] <= level
+                        and quest_id not in completed and quest_id not in active):
+                    available.append(quest_id)
+
+        available.sort(key=self.position.__getitem__)
+        return available
+
+    def prerequisite_chain(self, quest_id):
+        """
+        Get a quest's prerequisites, earliest first, ending with the quest
+
+        Chains are memoized, and each new chain reuses the memoized chain of
+        its nearest ancestor.
+
+        Returns: List of quest ids [earliest_prereq, ..., quest_id]
+        Raises: QuestNotFoundError if the quest or a prerequisite is missing
+        """
+        if quest_id not in self.position:
+            raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
+
+        chain = self._chains.get(quest_id)
+        if chain is None:
+            path = []
+            current = quest_id
+            while current != NO_PREREQUISITE and current not in self._chains:
+                if current not in self.position:
+                    raise QuestNotFoundError(f"Prerequisite '{current}' not found.")
+                path.append(current)
+                current = self.quests[current]["prerequisite"]
+
+            chain = self._chains.get(current, ())
+            for ancestor in reversed(path):
+                chain = chain + (ancestor,)
+                self._chains[ancestor] = chain
+        return list(chain)
+
+    def quests_in_level_range(self, min_level, max_level):
+        """
+        Get every quest whose required level is within [min_level, max_level]
+
+        Returns: List of quest ids in catalog order
+        """
+        start = bisect_left(self.levels, min_level)
+        stop = bisect_right(self.levels, max_level)
+        found = []
+        for level in self.levels[start:stop]:
+            found.extend(self.level_buckets[level])
+        found.sort(key=self.position.__getitem__)
+        return found
+
+# ============================================================================
+# QUEST CATALOG
+# ============================================================================
+
+class QuestCatalog(dict):
+    """
+    Quest dictionary that carries its QuestGraph
+
+    The graph is built on first use and thrown away whenever quests are
+    added, replaced or removed. Changing a quest's fields in place is not
+    noticed; call invalidate() after doing that.
+    """
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._graph = None
+
+    @property
+    def graph(self):
+        """
+        The catalog's QuestGraph (built if needed)
+
+        Raises: InvalidDataFormatError if the prerequisites form a cycle
+        """
+        if self._graph is None:
+            self._graph = QuestGraph(self)
+        return self._graph
+
+    def build(self):
+        """
+        Build the graph now instead of on first use, so a bad catalog fails
+        where it is loaded
+
+        Returns: The catalog's QuestGraph
+        Raises: InvalidDataFormatError if the prerequisites form a cycle
+        """
+        return self.graph
+
+    def cache_state(self):
+        """
+        Get the quests and their built graph in a picklable form
+
+        game_data stores this in its compiled cache, so a cache hit does not
+        have to rebuild (and re-validate) the graph.
+
+        Returns: Tuple (quest dictionary, graph indexes)
+        Raises: InvalidDataFormatError if the prerequisites form a cycle
+        """
+        return dict(self), self.graph.indexes()
+
+    @classmethod
+    def from_cache_state(cls, state):
+        """
+        Rebuild a catalog from cache_state() without validating it again
+
+        Returns: QuestCatalog with its graph already built
+        """
+        quests, indexes = state
+        catalog = cls(quests)
+        catalog._graph = QuestGraph.from_indexes(catalog, indexes)
+        return catalog
+
+    def invalidate(self):
+        """Throw away the graph so it is rebuilt on next use"""
+        self._graph = None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._graph = None
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._graph = None
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._graph = None
+
+    def pop(self, *args):
+        self._graph = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._graph = None
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._graph = None
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._graph = None
+
+    def __reduce__(self):
+        # Pickle (and deepcopy) as plain quest data; the graph is rebuilt
+        return (self.__class__, (dict(self),))
+
+# ============================================================================
+# QUEST LOG
+# ============================================================================
+
+class QuestLog(MutableSequence):
+    """
+    A character's active or completed quests: an ordered set of quest ids
+
+    Behaves like the plain list it replaces (append, remove, in, len,
+    iteration in the order quests were added, ','.join(...)) so the save
+    format is unchanged, but 'in', append() and remove() are O(1). A quest
+    id is stored once; appending one that is already there does nothing.
+    Index-based access (log[0], insert) works but is O(n).
+    """
+
+    def __init__(self, quest_ids=()):
+        # {quest_id: None}, used as an insertion-ordered set
+        self._ids = dict.fromkeys(quest_ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __reversed__(self):
+        return reversed(self._ids)
+
+    def __contains__(self, quest_id):
+        return quest_id in self._ids
+
+    def count(self, quest_id):
+        """Return 1 if the quest is in the log, else 0"""
+        return 1 if quest_id in self._ids else 0
+
+    def append(self, quest_id):
+        """Add a quest at the end (no-op if it is already in the log)"""
+        self._ids[quest_id] = None
+
+    def remove(self, quest_id):
+        """
+        Remove a quest
+
+        Raises: ValueError if the quest is not in the log (like list)
+        """
+        try:
+            del self._ids[quest_id]
+        except KeyError:
+            raise ValueError(f"{quest_id!r} is not in quest log")
+
+    def pop(self, index=-1):
+        """Remove and return a quest (O(1) for the last one)"""
+        if index != -1 and index != len(self._ids) - 1:
+            return super().pop(index)
+        if not self._ids:
+            raise IndexError("pop from empty quest log")
+        return self._ids.popitem()[0]
+
+    def clear(self):
+        """Remove every quest"""
+        self._ids.clear()
+
+    def copy(self):
+        """Return the quest ids as a plain list"""
+        return list(self._ids)
+
+    def __getitem__(self, index):
+        return self.copy()[index]
+
+    def __setitem__(self, index, value):
+        quest_ids = self.copy()
+        quest_ids[index] = value
+        self._ids = dict.fromkeys(quest_ids)
+
+    def __delitem__(self, index):
+        quest_ids = self.copy()
+        del quest_ids[index]
+        self._ids = dict.fromkeys(quest_ids)
+
+    def insert(self, index, quest_id):
+        """Insert a quest before index (no-op if it is already in the log)"""
+        if quest_id in self._ids:
+            return
+        quest_ids = self.copy()
+        quest_ids.insert(index, quest_id)
+        self._ids = dict.fromkeys(quest_ids)
+
+    def index(self, quest_id, *args):
+        """Return the position of a quest"""
+        return self.copy().index(quest_id, *args)
+
+    def __eq__(self, other):
+        if isinstance(other, (QuestLog, list)):
+            return self.copy() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"QuestLog({self.copy()!r})"
+
+def as_lookup(quest_ids):
+    """Return quest_ids itself if it has O(1) membership, else a set of it"""
+    if isinstance(quest_ids, (QuestLog, set, frozenset)):
+        return quest_ids
+    return set(quest_ids)
+
+# ============================================================================
+# QUEST FRONTIER
+# ============================================================================
+
+class QuestFrontier:
+    """
+    The quests one character can accept, kept up to date incrementally
+
+    Stored at character["quest_frontier"] by get_quest_frontier().
+    quest_handler reports accepted, completed and abandoned quests and
+    character_manager.gain_experience reports level-ups, so listing the
+    available quests costs O(frontier size) instead of a catalog scan.
+
+    Quests whose prerequisite is done but whose level is still too high
+    wait in per-level buckets until the character levels up. If the
+    character's quest lists or level are changed some other way, the
+    frontier notices (the sizes no longer match) and is rebuilt.
+    """
+
+    def __init__(self, catalog, character):
+        """
+        Build the frontier for a character
+
+        Args:
+            catalog: QuestCatalog the frontier belongs to
+            character: Character dictionary
+        """
+        self.catalog = catalog
+        self.character = character
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute the frontier from the character's current state"""
+        self.graph = graph = self.catalog.graph
+        completed = as_lookup(self.character["completed_quests"])
+        active = as_lookup(self.character["active_quests"])
+
+        # {quest_id: None}, used as an insertion-ordered set
+        self._available = {}
+        # {required_level: set of quest ids unlocked but too high level}
+        self._waiting = {}
+
+        candidates = list(graph.roots)
+        for done in completed:
+            candidates.extend(graph.unlocks.get(done, ()))
+        for quest_id in candidates:
+            if quest_id not in completed and quest_id not in active:
+                self._unlock(quest_id)
+        self._sync()
+
+    def available_quest_ids(self):
+        """Return the ids of the available quests in catalog order"""
+        return sorted(self._available, key=self.graph.position.__getitem__)
+
+    def is_current(self, catalog, character):
+        """True if the frontier still matches this catalog and character"""
+        return (self.catalog is catalog and self.character is character
+                and catalog.graph is self.graph
+                and self._signature == self._current_signature())
+
+    # --- Events ---
+
+    def quest_accepted(self, quest_id):
+        """The character accepted a quest"""
+        self._available.pop(quest_id, None)
+        self._sync()
+
+    def quest_completed(self, quest_id):
+        """The character completed a quest: unlock the quests that needed it"""
+        self._available.pop(quest_id, None)
+        completed = self.character["completed_quests"]
+        active = self.character["active_quests"]
+        for unlocked in self.graph.unlocks.get(quest_id, ()):
+            if unlocked not in completed and unlocked not in active:
+                self._unlock(unlocked)
+        self._sync()
+
+    def quest_abandoned(self, quest_id):
+        """The character abandoned a quest: it may be accepted again"""
+        quest = self.catalog.get(quest_id)
+        completed = self.character["completed_quests"]
+        if quest is not None and quest_id not in completed:
+            prereq = quest["prerequisite"]
+            if prereq == NO_PREREQUISITE or prereq in completed:
+                self._unlock(quest_id)
+        self._sync()
+
+    def level_changed(self):
+        """The character's level changed: release quests that were waiting"""
+        if self._signature[:2] != self._current_signature()[:2]:
+            # Quest lists were changed behind our back; is_current() will
+            # fail and the frontier gets rebuilt on next use
+            return
+        level = self.character["level"]
+        if level < self._signature[2]:
+            self.rebuild()
+            return
+
+        completed = self.character["completed_quests"]
+        active = self.character["active_quests"]
+        for required in [required for required in self._waiting if required <= level]:
+            for quest_id in self._waiting.pop(required):
+                if quest_id not in completed and quest_id not in active:
+                    self._available[quest_id] = None
+        self._sync()
+
+    # --- Helpers ---
+
+    def _unlock(self, quest_id):
+        """Add an unlocked quest to the available set or to its level bucket"""
+        required = self.catalog[quest_id]["required_level"]
+        if required > self.character["level"]:
+            self._waiting.setdefault(required, set()).add(quest_id)
+        else:
+            self._available[quest_id] = None
+
+    def _current_signature(self):
+        character = self.character
+        return (len(character["completed_quests"]), len(character["active_quests"]),
+                character["level"])
+
+    def _sync(self):
+        self._signature = self._current_signature()
+
+    def __deepcopy__(self, memo):
+        # Copies (autosave snapshots) share the read-only catalog
+        clone = copy.copy(self)
+        memo[id(self)] = clone
+        clone.character = copy.deepcopy(self.character, memo)
+        clone._available = dict(self._available)
+        clone._waiting = {level: set(ids) for level, ids in self._waiting.items()}
+        return clone
+
+def get_quest_frontier(character, catalog):
+    """
+    Get the character's up-to-date frontier for a catalog
+
+    Builds a new one (and stores it in character["quest_frontier"]) if the
+    character has none, it belongs to another catalog (for example after a
+    hot reload), the catalog changed, or it is out of date.
+
+    Returns: QuestFrontier
+    """
+    frontier = character.get("quest_frontier")
+    if frontier is None or not frontier.is_current(catalog, character):
+        frontier = QuestFrontier(catalog, character)
+        character["quest_frontier"] = frontier
+    return frontier
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== QUEST GRAPH TEST ===")
+
+    test_quests = QuestCatalog({
+        "a": {"required_level": 1, "prerequisite": "NONE"},
+        "b": {"required_level": 1, "prerequisite": "a"},
+        "c": {"required_level": 3, "prerequisite": "b"},
+    })
+    graph = test_quests.graph
+    print(f"Order: {graph.order}")
+    print(f"Chain for c: {graph.prerequisite_chain('c')}")
+    print(f"Available: {graph.available_quests({'level': 1, 'completed_quests': ['a'], 'active_quests': []})}")
@@ -14,11 +14,13 @@ from custom_exceptions import (
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    InvalidDataFormatError
 )
 
 
 import character_manager
+from quest_graph import QuestCatalog, get_quest_frontier
 
 # ============================================================================
 # QUEST MANAGEMENT
@@ -69,7 +71,10 @@ def accept_quest(character, quest_id, quest_data_dict):
         raise QuestRequirementsNotMetError("Quest already active.")
 
     # Accept quest
+    frontier = _current_frontier(character, quest_data_dict)
     character['active_quests'].append(quest_id)
+    if frontier is not None:
+        frontier.quest_accepted(quest_id)
     return True
 
 def complete_quest(character, quest_id, quest_data_dict):
@@ -99,8 +104,11 @@ def complete_quest(character, quest_id, quest_data_dict):
     quest = quest_data_dict[quest_id]
 
     # Remove from active, add to completed
+    frontier = _current_frontier(character, quest_data_dict)
     character['active_quests'].remove(quest_id)
     character['completed_quests'].append(quest_id)
+    if frontier is not None:
+        frontier.quest_completed(quest_id)
 
     # Grant rewards
     xp = quest['reward_xp']
@@ -124,7 +132,10 @@ def abandon_quest(character, quest_id):
     if quest_id not in character['active_quests']:
         raise QuestNotActiveError("Quest is not active.")
 
+    frontier = _current_frontier(character)
     character['active_quests'].remove(quest_id)
+    if frontier is not None:
+        frontier.quest_abandoned(quest_id)
     return True
 
 def get_active_quests(character, quest_data_dict):
@@ -149,8 +160,16 @@ def get_available_quests(character, quest_data_dict):
     
     Available = meets level req + prerequisite done + not completed + not active
     
+    For a QuestCatalog (what game_data.load_quests returns) the answer
+    comes from the character's quest frontier, which is kept up to date as
+    quests change, so no quests are scanned.
+    
     Returns: List of quest dictionaries
     """
+    if isinstance(quest_data_dict, QuestCatalog):
+        frontier = get_quest_frontier(character, quest_data_dict)
+        return [quest_data_dict[q] for q in frontier.available_quest_ids()]
+
     available = []
 
     for q_id, q_data in quest_data_dict.items():
@@ -159,6 +178,25 @@ def get_available_quests(character, quest_data_dict):
 
     return available
 
+def _current_frontier(character, quest_data_dict=None):
+    """
+    Get the character's quest frontier if it is still up to date
+    
+    Call this before changing the quest lists. An out-of-date frontier is
+    dropped so it gets rebuilt the next time available quests are needed.
+    
+    Returns: QuestFrontier, or None if there is none to update
+    """
+    frontier = character.get('quest_frontier')
+    if frontier is None:
+        return None
+    if quest_data_dict is None:
+        quest_data_dict = frontier.catalog
+    if not frontier.is_current(quest_data_dict, character):
+        character['quest_frontier'] = None
+        return None
+    return frontier
+
 # ============================================================================
 # QUEST TRACKING
 # ============================================================================
@@ -214,19 +252,28 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     Example: If Quest C requires Quest B, which requires Quest A:
              Returns ["quest_a", "quest_b", "quest_c"]
     
-    Raises: QuestNotFoundError if quest doesn't exist
+    Raises:
+        QuestNotFoundError if quest doesn't exist
+        InvalidDataFormatError if the prerequisites form a cycle
     """
+    if isinstance(quest_data_dict, QuestCatalog):
+        return quest_data_dict.graph.prerequisite_chain(quest_id)
+
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
 
     chain = []
+    seen = set()
     current = quest_id
 
     while current != "NONE":
         if current not in quest_data_dict:
             raise QuestNotFoundError(f"Prerequisite '{current}' not found.")
+        if current in seen:
+            raise InvalidDataFormatError(f"Quest '{quest_id}' has a prerequisite cycle at '{current}'.")
 
         chain.append(current)
+        seen.add(current)
         current = quest_data_dict[current]['prerequisite']
 
     return chain[::-1]
@@ -272,6 +319,12 @@ def get_quests_by_level(quest_data_dict, min_level, max_level):
     
     Returns: List of quest dictionaries
     """
+    if isinstance(quest_data_dict, QuestCatalog):
+        return [
+            quest_data_dict[q]
+            for q in quest_data_dict.graph.quests_in_level_range(min_level, max_level)
+        ]
+
     return [
         q_data for q_data in quest_data_dict.values()
         if min_level <= q_data['required_level'] <= max_level
@@ -0,0 +1,312 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Records Module
+
+Compact record types for characters and enemies.
+
+A plain dict spends a few hundred bytes per object on its hash table. The
+records here keep every known field in a __slots__ attribute instead, which
+takes a fraction of the memory when 100k characters or millions of
+simulated enemies are alive at once. Enemies go one step further and
+share their stats with every other enemy of the same type (EnemyTemplate).
+
+Records are still mappings: character['health'], 'equipped_weapon' in
+character, .get(), .items(), dict(character) and comparing with a dict all
+work, so existing code keeps working unchanged. Keys that are not fields
+(anything a caller adds) go into a small side dict. Hot loops can use
+attribute access instead (character.health), which is faster than a dict
+lookup.
+"""
+
+import copy
+from collections import namedtuple
+from collections.abc import MutableMapping
+from operator import attrgetter
+
+# Value of a slot whose key is not in the record
+_MISSING = object()
+
+# Every record class (checked with a set lookup, much faster than isinstance
+# against an abstract base class)
+_RECORD_TYPES = set()
+
+# ============================================================================
+# RECORD BASE CLASS
+# ============================================================================
+
+class Record(MutableMapping):
+    """
+    Slotted record with dict-style access
+
+    Subclasses list their fields in FIELDS (always present) and
+    OPTIONAL_FIELDS (only present once set), and take them as __init__
+    parameters in that order. A field whose key is not a valid attribute
+    name is stored under the slot name given in KEY_SLOTS. Use
+    from_mapping() to build a record from a dictionary.
+    Use attribute access only for FIELDS; an unset optional field reads as
+    an internal placeholder rather than raising.
+    """
+
+    __slots__ = ("_extras",)
+
+    FIELDS = ()
+    OPTIONAL_FIELDS = ()
+    # {key: slot name} for keys that cannot be attribute names
+    KEY_SLOTS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _RECORD_TYPES.add(cls)
+        # {key: slot name} for every field, in field order (which is also
+        # the order of the subclass's __init__ parameters)
+        cls._slot_by_key = {
+            key: cls.KEY_SLOTS.get(key, key)
+            for key in cls.FIELDS + cls.OPTIONAL_FIELDS
+        }
+        cls._slot_names = tuple(cls._slot_by_key.values())
+        cls._read_slots = attrgetter(*cls._slot_names)
+
+    @classmethod
+    def from_mapping(cls, mapping=(), **kwargs):
+        """
+        Create a record from a mapping and/or keyword arguments, like dict()
+
+        Fields that are not given are left out (not in the record).
+        """
+        data = dict(mapping, **kwargs)
+        record = cls(*[data.pop(key, _MISSING) for key in cls._slot_by_key])
+        # Whatever is left is not a field
+        record._extras = data or None
+        return record
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, key):
+        slot = self._slot_by_key.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self._extras is None:
+            raise KeyError(key)
+        return self._extras[key]
+
+    def __setitem__(self, key, value):
+        slot = self._slot_by_key.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+        elif self._extras is None:
+            self._extras = {key: value}
+        else:
+            self._extras[key] = value
+
+    def __delitem__(self, key):
+        slot = self._slot_by_key.get(key)
+        if slot is not None:
+            if getattr(self, slot) is _MISSING:
+                raise KeyError(key)
+            setattr(self, slot, _MISSING)
+        elif self._extras is None:
+            raise KeyError(key)
+        else:
+            del self._extras[key]
+
+    def __contains__(self, key):
+        slot = self._slot_by_key.get(key)
+        if slot is not None:
+            return getattr(self, slot) is not _MISSING
+        return self._extras is not None and key in self._extras
+
+    def __iter__(self):
+        for key, value in zip(self._slot_by_key, self._read_slots(self)):
+            if value is not _MISSING:
+                yield key
+        if self._extras:
+            yield from self._extras
+
+    def __len__(self):
+        count = len(self._slot_names) - self._read_slots(self).count(_MISSING)
+        return count + (len(self._extras) if self._extras else 0)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    # --- Copying and display ---
+
+    def copy(self):
+        """Return a shallow copy of the same record type"""
+        clone = self.__class__(*self._read_slots(self))
+        if self._extras:
+            clone._extras = dict(self._extras)
+        return clone
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        clone = self.from_mapping()
+        memo[id(self)] = clone
+        for key, value in self.items():
+            clone[key] = copy.deepcopy(value, memo)
+        return clone
+
+    def __reduce__(self):
+        return (self.from_mapping, (dict(self),))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+# ============================================================================
+# RECORD TYPES
+# ============================================================================
+
+class Character(Record):
+    """A player character (see character_manager.create_character)"""
+
+    FIELDS = (
+        "name", "class", "level", "health", "max_health", "strength", "magic",
+        "experience", "gold", "inventory", "active_quests", "completed_quests",
+    )
+    OPTIONAL_FIELDS = (
+        "equipped_weapon", "equipped_weapon_effect",
+        "equipped_armor", "equipped_armor_effect",
+        "quest_frontier",
+    )
+    KEY_SLOTS = {"class": "character_class"}
+
+    __slots__ = (
+        "name", "character_class", "level", "health", "max_health", "strength", "magic",
+        "experience", "gold", "inventory", "active_quests", "completed_quests",
+        "equipped_weapon", "equipped_weapon_effect",
+        "equipped_armor", "equipped_armor_effect",
+        "quest_frontier",
+    )
+
+    def __init__(self, name, character_class, level, health, max_health, strength,
+                 magic, experience, gold, inventory, active_quests, completed_quests,
+                 equipped_weapon=_MISSING, equipped_weapon_effect=_MISSING,
+                 equipped_armor=_MISSING, equipped_armor_effect=_MISSING,
+                 quest_frontier=_MISSING):
+        self._extras = None
+        self.name = name
+        self.character_class = character_class
+        self.level = level
+        self.health = health
+        self.max_health = max_health
+        self.strength = strength
+        self.magic = magic
+        self.experience = experience
+        self.gold = gold
+        self.inventory = inventory
+        self.active_quests = active_quests
+        self.completed_quests = completed_quests
+        self.equipped_weapon = equipped_weapon
+        self.equipped_weapon_effect = equipped_weapon_effect
+        self.equipped_armor = equipped_armor
+        self.equipped_armor_effect = equipped_armor_effect
+        self.quest_frontier = quest_frontier
+
+# Stats shared by every enemy of one type. max_level is None for no cap;
+# weight is the relative chance of being picked among the enemies for a level.
+EnemyTemplate = namedtuple("EnemyTemplate", [
+    "enemy_id", "name", "max_health", "strength", "magic", "xp_reward",
+    "gold_reward", "min_level", "max_level", "weight",
+])
+
+def _template_field(field):
+    """Property for an enemy stat that is read from the enemy's template"""
+    def set_field(enemy, value):
+        # Copy on write: give this enemy its own template
+        enemy.template = enemy.template._replace(**{field: value})
+    return property(attrgetter("template." + field), set_field)
+
+class Enemy(Record):
+    """
+    An enemy in battle (see combat_system.create_enemy)
+
+    Enemies are flyweights. The stats every goblin shares live in one
+    immutable EnemyTemplate, and the enemy itself only stores its template
+    and current health. Setting a shared stat (enemy['strength'] = 20) gives
+    that enemy a private copy of its template, so other goblins are not
+    affected.
+    """
+
+    FIELDS = ("name", "health", "max_health", "strength", "magic", "xp_reward", "gold_reward")
+
+    __slots__ = ("template", "health")
+
+    name = _template_field("name")
+    max_health = _template_field("max_health")
+    strength = _template_field("strength")
+    magic = _template_field("magic")
+    xp_reward = _template_field("xp_reward")
+    gold_reward = _template_field("gold_reward")
+
+    def __init__(self, template, health=None):
+        self._extras = None
+        self.template = template
+        self.health = template.max_health if health is None else health
+
+    @classmethod
+    def from_mapping(cls, mapping=(), **kwargs):
+        """
+        Create an enemy (with its own template) from a mapping, like dict()
+
+        Fields that are not given are left out (not in the record).
+        """
+        data = dict(mapping, **kwargs)
+        name = data.pop("name", _MISSING)
+        health = data.pop("health", _MISSING)
+        template = EnemyTemplate(
+            enemy_id=name.lower() if isinstance(name, str) else None,
+            name=name,
+            max_health=data.pop("max_health", _MISSING),
+            strength=data.pop("strength", _MISSING),
+            magic=data.pop("magic", _MISSING),
+            xp_reward=data.pop("xp_reward", _MISSING),
+            gold_reward=data.pop("gold_reward", _MISSING),
+            min_level=1,
+            max_level=None,
+            weight=1,
+        )
+        return cls._restore(template, health, data or None)
+
+    @classmethod
+    def _restore(cls, template, health, extras):
+        """Rebuild an enemy from its template, health and extra keys"""
+        enemy = cls(template, health)
+        enemy._extras = extras
+        return enemy
+
+    # Templates are immutable, so every kind of copy shares them
+
+    def copy(self):
+        """Return a shallow copy that shares this enemy's template"""
+        return self._restore(self.template, self.health,
+                             dict(self._extras) if self._extras else None)
+
+    def __deepcopy__(self, memo):
+        clone = self._restore(self.template, self.health, None)
+        memo[id(self)] = clone
+        if self._extras:
+            clone._extras = copy.deepcopy(self._extras, memo)
+        return clone
+
+    def __reduce__(self):
+        return (self._restore, (self.template, self.health, self._extras))
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== RECORDS TEST ===")
+
+    hero = Character.from_mapping(name="Hero", level=1, health=100)
+    hero["class"] = "Warrior"
+    print(hero)
+    print(f"health={hero.health}, class={hero.character_class}, dict={dict(hero)}")
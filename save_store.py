@@ -0,0 +1,276 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Store Module
+
+SQLite save backend for character_manager, plus a tool that imports the
+old one-file-per-character text saves.
+
+Usage:
+    store = SQLiteSaveStore("data/save_games/saves.db")
+    character_manager.set_save_backend(store)
+    # save_character/load_character/list_saved_characters/delete_character
+    # now use the database
+
+Migrating text saves from the command line:
+    python save_store.py data/save_games data/save_games/saves.db
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+
+import character_manager
+from inventory_system import Inventory
+from quest_graph import QuestLog
+from records import Character
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+DEFAULT_DB_PATH = os.path.join("data", "save_games", "saves.db")
+
+# Number of characters written per transaction during migration
+DEFAULT_BATCH_SIZE = 1000
+
+# Integer fields, in column order
+NUMERIC_FIELDS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+
+# List fields, stored comma-separated exactly like the text saves
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+COLUMNS = ("name", "class") + NUMERIC_FIELDS + LIST_FIELDS
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS characters (
+    name TEXT PRIMARY KEY,
+    class TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    health INTEGER NOT NULL,
+    max_health INTEGER NOT NULL,
+    strength INTEGER NOT NULL,
+    magic INTEGER NOT NULL,
+    experience INTEGER NOT NULL,
+    gold INTEGER NOT NULL,
+    inventory TEXT NOT NULL,
+    active_quests TEXT NOT NULL,
+    completed_quests TEXT NOT NULL
+)
+"""
+
+# The SQL text never changes, so sqlite3 prepares each statement once and
+# reuses it from its statement cache.
+UPSERT_SQL = (
+    f"INSERT INTO characters ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)}) "
+    f"ON CONFLICT(name) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:])
+)
+SELECT_SQL = f"SELECT {', '.join(COLUMNS)} FROM characters WHERE name = ?"
+LIST_SQL = "SELECT name FROM characters ORDER BY name"
+DELETE_SQL = "DELETE FROM characters WHERE name = ?"
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+class SQLiteSaveStore:
+    """
+    Character saves in one SQLite database
+
+    The database runs in WAL mode, so a crash never leaves a half-written
+    save and readers do not block the writer. Each save is one transaction;
+    use save_many() to write many characters in a single transaction.
+    One store can be shared between threads (access is serialized).
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        """
+        Open (and create if needed) the save database
+
+        Raises: SaveFileCorruptedError if the database cannot be opened
+        """
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        try:
+            self._connection = sqlite3.connect(db_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                self._connection.execute(CREATE_TABLE_SQL)
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Could not open save database {db_path}: {e}")
+
+    def save(self, character):
+        """
+        Save (insert or replace) one character
+
+        Returns: True if successful
+        """
+        return self.save_many([character])
+
+    def save_many(self, characters):
+        """
+        Save many characters in one transaction
+
+        Either all characters are saved or, on error, none are.
+
+        Returns: True if successful
+        """
+        rows = [character_to_row(character) for character in characters]
+        with self._lock, self._connection:
+            self._connection.executemany(UPSERT_SQL, rows)
+        return True
+
+    def load(self, character_name):
+        """
+        Load one character
+
+        Returns: Character dictionary
+        Raises:
+            CharacterNotFoundError if there is no save for the character
+            InvalidSaveDataError if the stored row is invalid
+        """
+        with self._lock:
+            row = self._connection.execute(SELECT_SQL, (character_name,)).fetchone()
+        if row is None:
+            raise CharacterNotFoundError(f"No save found for {character_name}")
+        return row_to_character(row)
+
+    def list_names(self):
+        """Return the names of all saved characters, sorted"""
+        with self._lock:
+            return [row[0] for row in self._connection.execute(LIST_SQL)]
+
+    def delete(self, character_name):
+        """
+        Delete one character's save
+
+        Returns: True if deleted
+        Raises: CharacterNotFoundError if there is no save for the character
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute(DELETE_SQL, (character_name,))
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"No save found for {character_name}")
+        return True
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+# ============================================================================
+# ROW CONVERSION
+# ============================================================================
+
+def character_to_row(character):
+    """Turn a character into a tuple of column values (see COLUMNS)"""
+    row = [character["name"], character["class"]]
+    row.extend(character[field] for field in NUMERIC_FIELDS)
+    row.extend(",".join(character[field]) for field in LIST_FIELDS)
+    return tuple(row)
+
+def row_to_character(row):
+    """
+    Turn a database row back into a character
+
+    Returns: Validated character dictionary
+    Raises: InvalidSaveDataError if the row is invalid
+    """
+    character = Character.from_mapping(zip(COLUMNS, row))
+    for field in LIST_FIELDS:
+        value = character[field]
+        character[field] = value.split(",") if value else []
+    character["inventory"] = Inventory(character["inventory"])
+    character["active_quests"] = QuestLog(character["active_quests"])
+    character["completed_quests"] = QuestLog(character["completed_quests"])
+    character_manager.validate_character_data(character)
+    return character
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+def migrate_text_saves(save_directory="data/save_games", store=None,
+                       db_path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Import every {name}_save.txt file in save_directory into a SQLite store
+
+    Saves are written batch_size at a time, one transaction per batch. Text
+    files are left in place. Unreadable or invalid saves are skipped and
+    reported.
+
+    Args:
+        save_directory: Directory with the text saves
+        store: SQLiteSaveStore to import into (default: open db_path)
+        db_path: Database to open when store is not given
+        batch_size: Characters per transaction
+
+    Returns: Dictionary {'migrated': int, 'failed': {name: error message}}
+    """
+    own_store = store is None
+    if own_store:
+        store = SQLiteSaveStore(db_path)
+
+    migrated = 0
+    failed = {}
+    batch = []
+    try:
+        if os.path.isdir(save_directory):
+            filenames = sorted(os.listdir(save_directory))
+        else:
+            filenames = []
+
+        for filename in filenames:
+            if not filename.endswith("_save.txt"):
+                continue
+            name = filename[:-len("_save.txt")]
+            try:
+                with open(os.path.join(save_directory, filename), "r", encoding="utf-8") as file:
+                    character = character_manager.parse_character_lines(file.readlines())
+            except (OSError, UnicodeDecodeError, InvalidSaveDataError) as e:
+                failed[name] = str(e) or e.__class__.__name__
+                continue
+
+            batch.append(character)
+            if len(batch) >= batch_size:
+                store.save_many(batch)
+                migrated += len(batch)
+                batch = []
+
+        if batch:
+            store.save_many(batch)
+            migrated += len(batch)
+    finally:
+        if own_store:
+            store.close()
+
+    return {"migrated": migrated, "failed": failed}
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "data/save_games"
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DB_PATH
+
+    print(f"Migrating text saves from {source} to {target}...")
+    report = migrate_text_saves(source, db_path=target)
+    print(f"Migrated {report['migrated']} characters.")
+    for bad_name, error in report["failed"].items():
+        print(f"Skipped {bad_name}: {error}")
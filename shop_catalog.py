@@ -0,0 +1,193 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Shop Catalog Module
+
+Indexed, paginated view of the item catalog for the shop.
+
+The shop used to list every item on every screen, which is unusable with a
+large catalog. A ShopCatalog is built once per item catalog and keeps
+secondary indexes: item ids sorted by cost (so a price range is two
+bisects), the same list split by item type, and the same list split by the
+stats an item changes. A search returns a ShopResults view over one of
+those lists, and a page of results costs O(page size), not O(catalog size).
+"""
+
+from bisect import bisect_left, bisect_right
+
+from inventory_system import get_item_effects
+
+# Items shown on one shop screen
+DEFAULT_PAGE_SIZE = 10
+
+# ============================================================================
+# SEARCH RESULTS
+# ============================================================================
+
+class ShopResults:
+    """
+    Items matching a shop search, cheapest first
+
+    A view over a slice of one of the catalog's indexes; nothing is copied
+    until a page is asked for.
+    """
+
+    def __init__(self, items, item_ids, start=0, stop=None):
+        self.items = items
+        self.item_ids = item_ids
+        self.start = start
+        self.stop = len(item_ids) if stop is None else stop
+
+    def __len__(self):
+        return max(0, self.stop - self.start)
+
+    def __iter__(self):
+        for index in range(self.start, self.stop):
+            yield self.item_ids[index]
+
+    def page_count(self, page_size=DEFAULT_PAGE_SIZE):
+        """Number of pages (at least 1, so an empty result has one empty page)"""
+        return max(1, -(-len(self) // page_size))
+
+    def page(self, page_index, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of results
+
+        Args:
+            page_index: 0 for the first page
+            page_size: Items per page
+
+        Returns: List of (item_id, item_data) tuples (empty past the end)
+        """
+        if page_index < 0 or page_size < 1:
+            raise ValueError("page_index must be >= 0 and page_size >= 1")
+        first = self.start + page_index * page_size
+        last = min(first + page_size, self.stop)
+        items = self.items
+        return [(item_id, items[item_id]) for item_id in self.item_ids[first:last]]
+
+# ============================================================================
+# SHOP CATALOG
+# ============================================================================
+
+class ShopCatalog:
+    """
+    Item catalog with indexes for the shop
+
+    Indexes are built once from the item dictionary (see get_shop_catalog,
+    which rebuilds them when the catalog changes). Every index lists item
+    ids in cost order, ties in catalog order, next to a parallel list of
+    costs for bisect.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self._size = len(items)
+
+        ordered = sorted(items, key=lambda item_id: items[item_id]["cost"])
+        by_type = {}
+        by_stat = {}
+        for item_id in ordered:
+            item = items[item_id]
+            by_type.setdefault(item["type"], []).append(item_id)
+            for stat in dict.fromkeys(effect.stat for effect in get_item_effects(item)):
+                by_stat.setdefault(stat, []).append(item_id)
+
+        # {(item_type, stat): (costs, item_ids)}, None meaning "any".
+        # Indexes for a type and a stat together are built on first use.
+        self._indexes = {(None, None): self._make_index(ordered)}
+        for item_type, item_ids in by_type.items():
+            self._indexes[(item_type, None)] = self._make_index(item_ids)
+        for stat, item_ids in by_stat.items():
+            self._indexes[(None, stat)] = self._make_index(item_ids)
+
+        self.types = sorted(by_type)
+        self.stats = sorted(by_stat)
+
+    def _make_index(self, item_ids):
+        """Build one (costs, item_ids) index from cost-sorted ids"""
+        items = self.items
+        return [items[item_id]["cost"] for item_id in item_ids], tuple(item_ids)
+
+    def _index(self, item_type, stat):
+        """Get the index for a type and/or stat (empty if nothing matches)"""
+        index = self._indexes.get((item_type, stat))
+        if index is None:
+            by_type = self._indexes.get((item_type, None))
+            by_stat = self._indexes.get((None, stat))
+            if by_type is None or by_stat is None:
+                return [], ()
+            # Filter the shorter list; it is already in cost order
+            shorter, longer = sorted((by_type[1], by_stat[1]), key=len)
+            wanted = set(longer)
+            index = self._make_index([item_id for item_id in shorter if item_id in wanted])
+            self._indexes[(item_type, stat)] = index
+        return index
+
+    def is_current(self, items):
+        """True if this catalog was built from items and items has not grown or shrunk"""
+        return items is self.items and len(items) == self._size
+
+    def search(self, item_type=None, stat=None, min_cost=None, max_cost=None):
+        """
+        Find items by type, affected stat and cost range
+
+        Args:
+            item_type: "weapon", "armor", "consumable" (None = any)
+            stat: Stat the item changes, e.g. "strength" (None = any)
+            min_cost, max_cost: Inclusive cost range (None = no limit)
+
+        Returns: ShopResults, cheapest first
+        """
+        costs, item_ids = self._index(item_type, stat)
+        start = 0 if min_cost is None else bisect_left(costs, min_cost)
+        stop = len(costs) if max_cost is None else bisect_right(costs, max_cost)
+        return ShopResults(self.items, item_ids, start, max(start, stop))
+
+    def count_by_type(self):
+        """
+        Count items of each type
+
+        Returns: Dictionary {item_type: count}
+        """
+        return {item_type: len(self._indexes[(item_type, None)][1]) for item_type in self.types}
+
+# ============================================================================
+# CATALOG CACHE
+# ============================================================================
+
+# The ShopCatalog for the item dictionary the shop used last
+_shop_catalog = None
+
+def get_shop_catalog(items):
+    """
+    Get the ShopCatalog for an item dictionary
+
+    The indexes are kept until a different dictionary is passed in (for
+    example after a hot reload) or this one changes size.
+
+    Returns: ShopCatalog
+    """
+    global _shop_catalog
+    if _shop_catalog is None or not _shop_catalog.is_current(items):
+        _shop_catalog = ShopCatalog(items)
+    return _shop_catalog
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== SHOP CATALOG TEST ===")
+
+    test_items = {
+        "health_potion": {"name": "Health Potion", "type": "consumable",
+                          "effect": "health:30", "cost": 25},
+        "iron_sword": {"name": "Iron Sword", "type": "weapon",
+                       "effect": "strength:5", "cost": 100},
+        "leather_armor": {"name": "Leather Armor", "type": "armor",
+                          "effect": "max_health:10", "cost": 80},
+    }
+    catalog = get_shop_catalog(test_items)
+    print(catalog.count_by_type())
+    print(catalog.search(max_cost=90).page(0))
+    print(catalog.search(stat="strength").page(0))
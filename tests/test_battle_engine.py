@@ -0,0 +1,311 @@
+"""
+Test Battle Engine
+Tests that battles can run headless with policies and sinks
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import random
+import subprocess
+
+import battle_sweep
+import character_manager
+import combat_system
+import game_data
+from custom_exceptions import CharacterDeadError, CorruptedDataError
+
+# ============================================================================
+# HEADLESS ENGINE TESTS
+# ============================================================================
+
+def test_headless_battle_no_input(monkeypatch):
+    """Test that a headless battle never asks for input or prints"""
+    def fail(*args, **kwargs):
+        raise AssertionError("headless battle used the terminal")
+
+    monkeypatch.setattr("builtins.input", fail)
+    monkeypatch.setattr("builtins.print", fail)
+
+    char = character_manager.create_character("EngineTest", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    result = combat_system.run_headless_battle(char, enemy)
+
+    assert result['winner'] == "player"
+    assert result['xp'] == 25
+    assert enemy['health'] == 0
+
+def test_buffered_sink_collects_messages():
+    """Test that battle messages go to the buffered sink"""
+    char = character_manager.create_character("SinkTest", "Mage")
+    enemy = combat_system.create_enemy("goblin")
+    sink = combat_system.BufferedSink()
+
+    battle = combat_system.SimpleBattle(char, enemy, combat_system.AbilityPolicy(), sink)
+    battle.run()
+
+    assert sink.messages[0] == "Combat begins! A wild Goblin appears!"
+    assert any(m.startswith("Fireball!") for m in sink.messages)
+    assert battle.turn_counter >= 1
+
+def test_buffered_messages_are_one_list():
+    """Test that messages is a stable list that picks up new events"""
+    sink = combat_system.BufferedSink()
+    sink.record((0, combat_system.EVENT_START, combat_system.ACTOR_ENEMY, 0, "Orc"))
+    messages = sink.messages
+    messages.append("note")
+    assert sink.messages is messages
+
+    sink.record((1, combat_system.EVENT_ESCAPE, combat_system.ACTOR_PLAYER, 1, None))
+    assert sink.messages is messages
+    assert messages == ["Combat begins! A wild Orc appears!", "note", "You escaped the battle!"]
+    assert sink.clear() is messages
+    assert sink.messages == [] and len(sink) == 0
+
+def test_scripted_policy_and_escape(monkeypatch):
+    """Test that escaping ends the battle without an error"""
+    monkeypatch.setattr(combat_system.random, "random", lambda: 0.0)
+
+    char = character_manager.create_character("RunTest", "Rogue")
+    enemy = combat_system.create_enemy("dragon")
+    policy = combat_system.ScriptedPolicy([combat_system.ACTION_RUN])
+    result = combat_system.run_headless_battle(char, enemy, policy)
+
+    assert result['winner'] == "escaped"
+    assert result['xp'] == 0
+
+def test_start_battle_uses_given_policy():
+    """Test that the interactive entry point is a wrapper over the engine"""
+    char = character_manager.create_character("WrapTest", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    battle = combat_system.SimpleBattle(char, enemy, combat_system.AttackPolicy(),
+                                        combat_system.NullSink())
+
+    assert battle.start_battle()['winner'] == "player"
+
+def test_sink_without_verbose_attribute():
+    """Test that a sink only needs record(), show_stats() and heading()"""
+    class ListSink:
+        def __init__(self):
+            self.events = []
+
+        def record(self, event):
+            self.events.append(event)
+
+        def show_stats(self, character, enemy):
+            raise AssertionError("stats shown to a quiet sink")
+
+        def heading(self, title):
+            raise AssertionError("heading shown to a quiet sink")
+
+    sink = ListSink()
+    char = character_manager.create_character("QuietTest", "Warrior")
+    combat_system.run_headless_battle(char, combat_system.create_enemy("goblin"), sink=sink)
+    assert sink.events[0][1] == combat_system.EVENT_START
+
+def test_dead_character_cannot_run_engine():
+    """Test that the engine refuses to start with a dead character"""
+    char = character_manager.create_character("DeadTest", "Cleric")
+    char['health'] = 0
+
+    with pytest.raises(CharacterDeadError):
+        combat_system.run_headless_battle(char, combat_system.create_enemy("orc"))
+
+def test_seeded_rng_and_turn_limit():
+    """Test that a seeded rng repeats a battle and max_turns ends it as a draw"""
+    def fight(seed):
+        char = character_manager.create_character("SeedTest", "Rogue")
+        enemy = combat_system.create_enemy("orc")
+        battle = combat_system.SimpleBattle(char, enemy, combat_system.AbilityPolicy(),
+                                            combat_system.NullSink(), random.Random(seed))
+        battle.run()
+        return battle.turn_counter, char['health'], enemy['health']
+
+    assert fight(5) == fight(5)
+
+    char = character_manager.create_character("DrawTest", "Cleric")
+    result = combat_system.run_headless_battle(char, combat_system.create_enemy("goblin"),
+                                               combat_system.AbilityPolicy(), max_turns=20)
+    assert result['winner'] == "draw"
+
+def test_policy_sees_live_health():
+    """Test that a policy reading battle.character sees the current HP"""
+    class WatchingPolicy:
+        def __init__(self):
+            self.seen = []
+
+        def choose_action(self, battle):
+            self.seen.append((battle.character['health'], battle.enemy['health']))
+            return combat_system.ACTION_ATTACK
+
+    for as_dict in (False, True):
+        char = character_manager.create_character("Watcher", "Cleric")
+        enemy = combat_system.create_enemy("dragon")
+        if as_dict:
+            char, enemy = dict(char), dict(enemy)
+        policy = WatchingPolicy()
+        result = combat_system.run_headless_battle(char, enemy, policy)
+
+        assert result['winner'] == "enemy"
+        assert char['health'] == 0
+        seen_hp = [hp for hp, _ in policy.seen]
+        assert seen_hp[0] == char['max_health']
+        assert seen_hp == sorted(seen_hp, reverse=True) and len(set(seen_hp)) == len(seen_hp)
+        assert policy.seen[-1][1] == enemy['health'] + (char['strength'] - enemy['strength'] // 4)
+
+# ============================================================================
+# EVENT LOG TESTS
+# ============================================================================
+
+def test_events_are_structured_tuples():
+    """Test that the engine records events, and renders them only on request"""
+    char = character_manager.create_character("EventTest", "Warrior")
+    sink = combat_system.BufferedSink()
+    combat_system.run_headless_battle(char, combat_system.create_enemy("goblin"), sink=sink)
+
+    events = list(sink)
+    assert events[0] == (0, "start", "enemy", 0, "Goblin")
+    assert events[1] == (1, "attack", "player", 13, "Goblin")
+    assert events[-2][1:] == ("death", "enemy", 0, "Goblin")
+    assert events[-1][1:] == ("reward", "player", 25, 10)
+
+    messages = sink.messages
+    assert messages[1] == "You attacked for 13 damage!"
+    assert messages[2] == "The Goblin hits you for 5 damage!"
+    assert messages[-2:] == ["You defeated the Goblin!", "Gained 25 XP and 10 gold!"]
+
+def test_event_log_keeps_last_events():
+    """Test that the ring buffer keeps only the newest maxlen events"""
+    char = character_manager.create_character("RingTest", "Cleric")
+    log = combat_system.EventLog(maxlen=5)
+    combat_system.run_headless_battle(char, combat_system.create_enemy("goblin"),
+                                      combat_system.AbilityPolicy(), log, max_turns=30)
+
+    assert len(log) == 5
+    assert [event[0] for event in log] == [28, 29, 29, 30, 30]
+    assert log.render()[-1] == "The Goblin hits you for 6 damage!"
+
+def test_ability_results_are_tuples():
+    """Test that abilities return (ability, amount) and still have messages"""
+    char = character_manager.create_character("AbilityTest", "Mage")
+    enemy = combat_system.create_enemy("dragon")
+    assert combat_system.resolve_special_ability(char, enemy) == ("fireball", 40)
+    assert combat_system.use_special_ability(char, enemy) == \
+        "Fireball! You burn the enemy for 40 damage."
+    assert enemy['health'] == 120
+
+# ============================================================================
+# RECORD AND REPLAY TESTS
+# ============================================================================
+
+def test_replay_matches_recorded_battles():
+    """Test that every recorded battle replays to the same outcome"""
+    rng = random.Random(20)
+    for seed in range(60):
+        char = character_manager.create_character("Replay", rng.choice(["Rogue", "Cleric", "Mage"]))
+        actions = [rng.choice("1123x") for _ in range(40)]
+        original = combat_system.BufferedSink()
+        record = combat_system.record_battle(char, combat_system.create_enemy("orc"),
+                                             combat_system.ScriptedPolicy(actions),
+                                             original, seed=seed, max_turns=40)
+
+        replay = combat_system.BufferedSink()
+        battle = combat_system.replay_battle(record, replay)
+        assert battle.result == record.result
+        assert battle.turn_counter == record.turns
+        assert list(replay) == list(original)
+        assert char['health'] == battle.character['health']
+
+def test_replay_from_json_without_io(monkeypatch):
+    """Test that a stored interactive battle replays with no terminal I/O"""
+    answers = iter(["3", "1", "2", "3", "2", "2", "2", "2"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+    char = character_manager.create_character("Disputed", "Rogue")
+    record = combat_system.record_battle(char, combat_system.create_enemy("goblin"), seed=77)
+    assert record.actions[0] == "3"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("replay used the terminal")
+    monkeypatch.setattr("builtins.input", fail)
+    monkeypatch.setattr("builtins.print", fail)
+
+    stored = combat_system.BattleRecord(**json.loads(json.dumps(record._asdict())))
+    assert combat_system.verify_battle_record(stored)
+
+def test_battle_log_keeps_every_fight(tmp_path):
+    """Test that logged battles read back in order and still replay"""
+    log = combat_system.get_battle_log_path("Logged", str(tmp_path / "saves"))
+    assert combat_system.load_battle_records(log) == []
+
+    char = character_manager.create_character("Logged", "Mage")
+    records = [
+        combat_system.record_battle(char, combat_system.create_enemy(enemy),
+                                    combat_system.AbilityPolicy(), combat_system.NullSink(),
+                                    seed=seed, max_turns=30)
+        for seed, enemy in enumerate(["goblin", "orc", "goblin"])
+    ]
+    for record in records:
+        combat_system.append_battle_record(record, log)
+
+    loaded = combat_system.load_battle_records(log)
+    assert loaded == records
+    assert all(combat_system.verify_battle_record(record) for record in loaded)
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write('{"seed": 1}\n')
+    with pytest.raises(CorruptedDataError, match="line 4"):
+        combat_system.load_battle_records(log)
+
+# ============================================================================
+# SWEEP TESTS
+# ============================================================================
+
+def test_sweep_same_results_for_any_worker_count():
+    """Test that sharded sweeps do not depend on the number of workers"""
+    grid = battle_sweep.build_grid(["Rogue", "Warrior"], ["orc"], [2], ["ability", "run"])
+
+    single = battle_sweep.run_sweep(grid, battles_per_cell=250, master_seed=9,
+                                    max_workers=1, shard_size=100)
+    pooled = battle_sweep.run_sweep(grid, battles_per_cell=250, master_seed=9,
+                                    max_workers=2, shard_size=100)
+
+    assert single == pooled
+    for summary in single.values():
+        assert summary['battles'] == 250
+        assert sum(summary['turn_histogram'].values()) == 250
+
+def test_default_grid_sweeps_every_registered_enemy():
+    """Test that the default grid takes its enemies from the enemy registry"""
+    enemies = list(game_data.get_default_enemies().values())
+    enemies.append(game_data.parse_enemy_block([
+        "ENEMY_ID: imp", "NAME: Imp", "HEALTH: 20", "STRENGTH: 4", "MAGIC: 2",
+        "XP_REWARD: 5", "GOLD_REWARD: 3", "MIN_LEVEL: 1", "MAX_LEVEL: 2",
+    ]))
+    previous = combat_system.set_enemy_registry(combat_system.EnemyRegistry(enemies))
+    try:
+        grid = battle_sweep.build_grid(["Warrior"])
+        assert [cell[1] for cell in grid] == ["goblin", "orc", "dragon", "imp"]
+        results = battle_sweep.run_sweep(grid[-1:], battles_per_cell=20, max_workers=1)
+        assert results[grid[-1]]['battles'] == 20
+    finally:
+        combat_system.set_enemy_registry(previous)
+
+def test_sweep_does_not_need_numpy():
+    """Test that the process-pool sweep imports without NumPy installed"""
+    code = "import sys; sys.modules['numpy'] = None; import battle_sweep"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+def test_sweep_rejects_unknown_policy():
+    """Test that bad policy names are caught before any work starts"""
+    grid = battle_sweep.build_grid(["Mage"], ["goblin"], [1], ["dance"])
+    with pytest.raises(ValueError):
+        battle_sweep.run_sweep(grid, battles_per_cell=1)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+"""
+Test Battle Simulator
+Tests that the vectorized simulator follows the combat_system rules
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+import battle_simulator
+import character_manager
+import combat_system
+
+def test_simulator_matches_headless_engine():
+    """Test that a deterministic matchup gives the same result as SimpleBattle"""
+    char = character_manager.create_character_at_level("SimTest", "Warrior", 1)
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(char, enemy, combat_system.AttackPolicy(),
+                                        combat_system.NullSink())
+    result = battle.run()
+
+    summary = battle_simulator.simulate_battles("Warrior", "orc", n=50, seed=1)
+
+    assert result['winner'] == "player"
+    assert summary['wins'] == 50
+    assert summary['turns']['max'] == battle.turn_counter
+    assert summary['hp_remaining']['min'] == char['health']
+
+def test_simulator_is_reproducible():
+    """Test that the same seed gives the same statistics"""
+    first = battle_simulator.simulate_battles("Rogue", "dragon", 5, n=1000,
+                                              policy="ability", seed=42)
+    second = battle_simulator.simulate_battles("Rogue", "dragon", 5, n=1000,
+                                               policy="ability", seed=42)
+    assert first == second
+    assert first['wins'] + first['losses'] + first['unfinished'] == 1000
+
+def test_simulator_escape_rate():
+    """Test that running away succeeds about half the time each turn"""
+    summary = battle_simulator.simulate_battles("Mage", "goblin", n=20000,
+                                                policy="run", seed=7)
+    first_turn = summary['turns']['histogram'][1] / summary['battles']
+    assert 0.47 < first_turn < 0.53
+
+def test_matchup_grid_and_bad_policy():
+    """Test the class x enemy grid and policy validation"""
+    results = battle_simulator.simulate_matchups(levels=(1, 2), n=10, seed=0)
+    enemy_types = combat_system.get_enemy_types()
+    assert len(results) == 2 * 4 * len(enemy_types)
+    assert [r['enemy_type'] for r in results[:len(enemy_types)]] == list(enemy_types)
+
+    with pytest.raises(ValueError):
+        battle_simulator.simulate_battles("Mage", "goblin", policy="dance")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
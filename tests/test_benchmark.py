@@ -0,0 +1,73 @@
+"""
+Test Benchmark
+Tests for the benchmark runner and baseline comparison
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+import benchmark
+
+# ============================================================================
+# RUNNER TESTS
+# ============================================================================
+
+def test_every_benchmark_runs_and_is_json():
+    """Every benchmark runs at a small scale and the results are JSON"""
+    results = benchmark.run_benchmarks(scales=(5,), repeat=1)
+
+    assert set(results["results"]) == {f"{name}[5]" for name in benchmark.BENCHMARKS}
+    for timing in results["results"].values():
+        assert timing["best"] <= timing["median"]
+        assert timing["per_op"] == timing["best"] / timing["operations"]
+    assert json.loads(json.dumps(results)) == results
+
+def test_only_selects_benchmarks():
+    """only= runs just the matching benchmarks"""
+    results = benchmark.run_benchmarks(scales=(3, 6), repeat=1, only="load_items")
+    assert list(results["results"]) == ["game_data.load_items[3]", "game_data.load_items[6]"]
+
+# ============================================================================
+# COMPARE TESTS
+# ============================================================================
+
+def fake_run(**per_op):
+    """Build a results dictionary with the given times per operation"""
+    return {"meta": {}, "results": {name: {"per_op": value} for name, value in per_op.items()}}
+
+def test_compare_flags_regressions_over_threshold():
+    """Only slowdowns beyond the threshold are regressions"""
+    baseline = fake_run(a=1.0, b=1.0, c=1.0, gone=1.0)
+    current = fake_run(a=1.25, b=1.05, c=0.5, new=9.0)
+
+    rows = benchmark.compare_results(current, baseline, threshold=0.10)
+    assert [row["name"] for row in rows] == ["a", "b", "c"]
+    assert [row["regression"] for row in rows] == [True, False, False]
+    assert "REGRESSION" in benchmark.format_comparison(rows)
+
+def test_command_line_compare_exit_status(tmp_path, capsys):
+    """--compare exits with 1 on a regression and writes --output"""
+    output = tmp_path / "run.json"
+    args = ["--scales", "4", "--repeat", "1", "--only", "equip_cycle", "--output", str(output)]
+    assert benchmark.main(args) == 0
+    run = json.loads(output.read_text())
+
+    slow_baseline = tmp_path / "slow.json"
+    fast_baseline = tmp_path / "fast.json"
+    for path, factor in ((slow_baseline, 1000.0), (fast_baseline, 0.001)):
+        baseline = json.loads(json.dumps(run))
+        for timing in baseline["results"].values():
+            timing["per_op"] *= factor
+        path.write_text(json.dumps(baseline))
+
+    assert benchmark.main(args + ["--compare", str(slow_baseline)]) == 0
+    assert benchmark.main(args + ["--compare", str(fast_baseline), "--threshold", "0.5"]) == 1
+    assert "REGRESSION" in capsys.readouterr().err
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
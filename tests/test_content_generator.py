@@ -0,0 +1,99 @@
+"""
+Test Content Generator
+Tests for the seeded quest, item and save generator
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import Counter
+
+import character_manager
+import content_generator
+import game_data
+
+# ============================================================================
+# QUEST TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("shape", content_generator.QUEST_SHAPES)
+def test_generated_quests_load(tmp_path, shape):
+    """Every shape writes a catalog game_data loads, with no cycles"""
+    path = tmp_path / "quests.txt"
+    assert content_generator.write_quests(str(path), 400, shape=shape, seed=1) == 400
+
+    quests = game_data.load_quests(str(path))
+    assert len(quests) == 400
+    for quest in quests.values():
+        prerequisite = quest["prerequisite"]
+        if prerequisite != "NONE":
+            # Prerequisites are earlier quests with no higher level
+            assert int(prerequisite.split("_")[1]) < int(quest["quest_id"].split("_")[1])
+            assert quests[prerequisite]["required_level"] <= quest["required_level"]
+
+def test_quest_shapes():
+    """Chains, fans and trees have the expected structure"""
+    chain = list(content_generator.iter_quests(10, shape="chain", width=5))
+    assert [q["prerequisite"] for q in chain[:6]] == [
+        "NONE", "quest_0", "quest_1", "quest_2", "quest_3", "NONE"]
+
+    fan = list(content_generator.iter_quests(8, shape="fan", width=3))
+    assert [q["prerequisite"] for q in fan] == [
+        "NONE", "quest_0", "quest_0", "quest_0", "NONE", "quest_4", "quest_4", "quest_4"]
+
+    tree = list(content_generator.iter_quests(13, shape="tree", width=3))
+    assert [q["required_level"] for q in tree] == [1, 2, 2, 2] + [3] * 9
+
+    with pytest.raises(ValueError):
+        next(content_generator.iter_quests(1, shape="star"))
+    for shape in ("chain", "fan", "tree"):
+        for width in (0, -2):
+            with pytest.raises(ValueError):
+                next(content_generator.iter_quests(5, shape=shape, width=width))
+
+def test_same_seed_same_content():
+    """The same seed always gives the same records"""
+    first = list(content_generator.iter_quests(200, shape="random", seed=9, level_spread="flat"))
+    again = list(content_generator.iter_quests(200, shape="random", seed=9, level_spread="flat"))
+    other = list(content_generator.iter_quests(200, shape="random", seed=10, level_spread="flat"))
+    assert first == again
+    assert first != other
+
+# ============================================================================
+# ITEM AND SAVE TESTS
+# ============================================================================
+
+def test_generated_items_cover_all_types(tmp_path):
+    """Item catalogs load and split evenly across the three types"""
+    path = tmp_path / "items.txt"
+    content_generator.write_items(str(path), 300, seed=2)
+
+    items = game_data.load_items(str(path))
+    assert Counter(item["type"] for item in items.values()) == {
+        "weapon": 100, "armor": 100, "consumable": 100}
+
+def test_generated_saves_load(tmp_path):
+    """Generated saves load with character_manager"""
+    save_dir = str(tmp_path / "saves")
+    content_generator.write_saves(save_dir, 25, seed=3, quest_count=50, item_count=10)
+
+    assert sorted(character_manager.list_saved_characters(save_dir)) == sorted(
+        f"Hero{index}" for index in range(25))
+    for name in ("Hero0", "Hero24"):
+        character = character_manager.load_character(name, save_dir)
+        completed = list(character["completed_quests"])
+        assert completed == [f"quest_{index}" for index in range(len(completed))]
+        assert 1 <= character["health"] <= character["max_health"]
+
+def test_command_line(tmp_path, capsys):
+    """The command line writes the requested kind of content"""
+    path = tmp_path / "deep" / "quests.txt"
+    assert content_generator.main(["quests", str(path), "--count", "30", "--shape", "chain"]) == 0
+    assert len(game_data.load_quests(str(path))) == 30
+    assert "Wrote 30 quests" in capsys.readouterr().out
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,220 @@
+"""
+Test Data Loading
+Tests for compiled caches and catalog parsing in game_data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import quest_graph
+from concurrent.futures import ThreadPoolExecutor
+from custom_exceptions import InvalidDataFormatError
+
+QUEST_TEXT = """QUEST_ID: first_quest
+TITLE: First Steps
+DESCRIPTION: A test quest
+REWARD_XP: 50
+REWARD_GOLD: 25
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+"""
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cache_is_written_and_used(tmp_path, monkeypatch):
+    """Test that a cache hit skips parsing entirely"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    first = game_data.load_quests(str(path), use_cache=True)
+    assert os.path.exists(str(path) + game_data.CACHE_SUFFIX)
+
+    def fail(lines):
+        raise AssertionError("cache hit should not parse")
+
+    monkeypatch.setattr(game_data, "parse_quest_block", fail)
+    assert game_data.load_quests(str(path), use_cache=True) == first
+
+def test_cache_hit_keeps_the_built_graph(tmp_path, monkeypatch):
+    """Test that a cache hit restores the quest graph instead of rebuilding it"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT + "\n" + QUEST_TEXT.replace(
+        "first_quest", "second_quest").replace("PREREQUISITE: NONE", "PREREQUISITE: first_quest"))
+    first = game_data.load_quests(str(path), use_cache=True)
+
+    def fail(self):
+        raise AssertionError("cache hit should not rebuild the graph")
+
+    monkeypatch.setattr(quest_graph.QuestGraph, "_topological_order", fail)
+    cached = game_data.load_quests(str(path), use_cache=True)
+
+    assert cached == first
+    assert cached.graph.order == first.graph.order == ("first_quest", "second_quest")
+    assert cached.graph.position == first.graph.position
+    assert cached.graph.unlocks == {"first_quest": ("second_quest",)}
+    assert cached.graph.prerequisite_chain("second_quest") == ["first_quest", "second_quest"]
+
+def test_concurrent_cache_writers_do_not_clobber(tmp_path):
+    """Test that writers in one process each get their own temporary file"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    key = game_data.get_cache_key(str(path))
+    data = {"quest": "x" * 100000}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda _: game_data.save_catalog_cache(str(path), "quests", key, data), range(32)))
+
+    assert all(results)
+    assert game_data.load_catalog_cache(str(path), "quests", key) == data
+    assert sorted(os.listdir(tmp_path)) == ["quests.txt", "quests.txt" + game_data.CACHE_SUFFIX]
+
+def test_cache_is_stale_after_edit(tmp_path):
+    """Test that editing the file invalidates the cache"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    game_data.load_quests(str(path), use_cache=True)
+
+    path.write_text(QUEST_TEXT.replace("REWARD_XP: 50", "REWARD_XP: 75"))
+    quests = game_data.load_quests(str(path), use_cache=True)
+
+    assert quests['first_quest']['reward_xp'] == 75
+
+def test_corrupted_cache_is_ignored(tmp_path):
+    """Test that a garbage cache file falls back to parsing"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    with open(str(path) + game_data.CACHE_SUFFIX, "wb") as f:
+        f.write(b"not a pickle")
+
+    quests = game_data.load_quests(str(path), use_cache=True)
+    assert quests['first_quest']['title'] == "First Steps"
+
+def test_bad_data_is_not_cached(tmp_path):
+    """Test that invalid files still raise and leave no cache behind"""
+    path = tmp_path / "items.txt"
+    path.write_text("ITEM_ID: broken\nTYPE: hat\n")
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_items(str(path), use_cache=True)
+    assert not os.path.exists(str(path) + game_data.CACHE_SUFFIX)
+
+# ============================================================================
+# STREAMING PARSER TESTS
+# ============================================================================
+
+def test_whitespace_blank_lines_and_crlf(tmp_path):
+    """Test that blocks split on whitespace-only lines and CRLF endings"""
+    second = QUEST_TEXT.replace("first_quest", "second_quest")
+    text = QUEST_TEXT + "   \t\n" + second
+    path = tmp_path / "quests.txt"
+    path.write_bytes(text.replace("\n", "\r\n").encode("utf-8"))
+
+    quests = game_data.load_quests(str(path))
+    assert list(quests) == ["first_quest", "second_quest"]
+    assert quests['second_quest']['prerequisite'] == "NONE"
+
+def test_iter_quests_yields_one_at_a_time(tmp_path):
+    """Test that the generator yields validated quests lazily"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT + "\nQUEST_ID: broken\nREWARD_XP: lots\n")
+
+    quests = game_data.iter_quests(str(path))
+    assert next(quests)['quest_id'] == "first_quest"
+    with pytest.raises(InvalidDataFormatError):
+        next(quests)
+
+def test_errors_report_line_numbers(tmp_path):
+    """Test that parse errors say which line is wrong"""
+    path = tmp_path / "items.txt"
+    path.write_text("\n\nITEM_ID: sword\nthis line is wrong\n")
+
+    with pytest.raises(InvalidDataFormatError, match="line 4"):
+        game_data.load_items(str(path))
+
+    path.write_text(QUEST_TEXT + "\n" + QUEST_TEXT)
+    with pytest.raises(InvalidDataFormatError, match="line 9"):
+        game_data.load_quests(str(path))
+
+# ============================================================================
+# CONTENT PACK TESTS
+# ============================================================================
+
+def test_content_pack_merges_files(tmp_path):
+    """Test loading a directory of quest files with a process pool"""
+    for region in ("east", "west", "north"):
+        (tmp_path / f"{region}.txt").write_text(QUEST_TEXT.replace("first_quest", f"{region}_quest"))
+
+    quests = game_data.load_quest_pack(str(tmp_path), max_workers=2)
+    assert sorted(quests) == ["east_quest", "north_quest", "west_quest"]
+
+    only_west = game_data.load_quest_pack(str(tmp_path / "w*.txt"), max_workers=1)
+    assert list(only_west) == ["west_quest"]
+
+def test_content_pack_reports_duplicates(tmp_path):
+    """Test that duplicate ids across files are reported with file:line"""
+    (tmp_path / "a.txt").write_text(QUEST_TEXT)
+    (tmp_path / "b.txt").write_text("\n" + QUEST_TEXT)
+
+    with pytest.raises(InvalidDataFormatError) as info:
+        game_data.load_quest_pack(str(tmp_path), max_workers=1)
+
+    message = str(info.value)
+    assert "'first_quest'" in message
+    assert "a.txt:1" in message and "b.txt:2" in message
+
+def test_content_pack_missing(tmp_path):
+    """Test that an empty pack raises MissingDataFileError"""
+    from custom_exceptions import MissingDataFileError
+
+    with pytest.raises(MissingDataFileError):
+        game_data.load_item_pack(str(tmp_path))
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_watcher_reparses_only_changed_blocks(tmp_path):
+    """Test that a one-block edit re-parses one block and swaps the catalog"""
+    text = "\n".join(QUEST_TEXT.replace("first_quest", f"quest_{i}") for i in range(5))
+    path = tmp_path / "quests.txt"
+    path.write_text(text)
+
+    watcher = game_data.CatalogWatcher(str(path), "quests")
+    old_catalog = watcher.catalog
+    assert watcher.blocks_reparsed == 5
+    assert watcher.poll() is False
+
+    path.write_text(text.replace("REWARD_GOLD: 25\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\nQUEST_ID: quest_3",
+                                 "REWARD_GOLD: 99\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\nQUEST_ID: quest_3"))
+    os.utime(path, ns=(1, 1))
+
+    assert watcher.poll() is True
+    assert watcher.blocks_reparsed == 1
+    assert watcher.catalog['quest_2']['reward_gold'] == 99
+    assert watcher.catalog is not old_catalog
+    assert old_catalog['quest_2']['reward_gold'] == 25
+
+def test_watcher_keeps_old_catalog_on_bad_edit(tmp_path):
+    """Test that a broken edit raises and leaves the old catalog in place"""
+    path = tmp_path / "items.txt"
+    path.write_text("ITEM_ID: potion\nNAME: Potion\nTYPE: consumable\n"
+                    "EFFECT: health:20\nCOST: 25\nDESCRIPTION: Heals\n")
+    watcher = game_data.CatalogWatcher(str(path), "items")
+
+    path.write_text("ITEM_ID: potion\nCOST: free\n")
+    os.utime(path, ns=(1, 1))
+
+    with pytest.raises(InvalidDataFormatError):
+        watcher.poll()
+    assert watcher.catalog['potion']['cost'] == 25
+    assert watcher.poll() is False
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,147 @@
+"""
+Test Enemies
+Tests for the enemy registry, enemy data files and flyweight enemies
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import pickle
+import random
+from collections import Counter
+
+import combat_system
+import game_data
+from combat_system import EnemyRegistry
+from custom_exceptions import InvalidDataFormatError, InvalidTargetError
+
+def enemy_block(enemy_id, min_level, max_level="NONE", weight=1, health=40):
+    """Build one enemy block for a data file"""
+    return (
+        f"ENEMY_ID: {enemy_id}\nNAME: {enemy_id.title()}\nHEALTH: {health}\n"
+        f"STRENGTH: 6\nMAGIC: 1\nXP_REWARD: 10\nGOLD_REWARD: 5\n"
+        f"MIN_LEVEL: {min_level}\nMAX_LEVEL: {max_level}\nWEIGHT: {weight}\n"
+    )
+
+@pytest.fixture
+def enemy_registry():
+    """Restore the enemy registry after a test"""
+    previous = combat_system.set_enemy_registry(None)
+    yield
+    combat_system.set_enemy_registry(previous)
+
+# ============================================================================
+# DATA FILE TESTS
+# ============================================================================
+
+def test_default_file_matches_builtin_enemies(tmp_path, monkeypatch):
+    """create_default_data_files writes the built-in enemies"""
+    monkeypatch.chdir(tmp_path)
+    game_data.create_default_data_files()
+
+    enemies = game_data.load_enemies()
+    assert enemies == game_data.get_default_enemies()
+    assert list(enemies) == ["goblin", "orc", "dragon"]
+    assert enemies["dragon"]["max_level"] is None
+
+def test_bad_enemy_blocks_rejected(tmp_path):
+    """Bad values and duplicate ids are reported with their line"""
+    path = tmp_path / "enemies.txt"
+    path.write_text(enemy_block("imp", 3, max_level=2))
+    with pytest.raises(InvalidDataFormatError, match="line 1"):
+        game_data.load_enemies(str(path))
+
+    path.write_text(enemy_block("imp", 1, weight=0))
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_enemies(str(path))
+
+    path.write_text(enemy_block("imp", 1) + "\n" + enemy_block("IMP", 2))
+    with pytest.raises(InvalidDataFormatError, match="Duplicate"):
+        game_data.load_enemies(str(path))
+
+# ============================================================================
+# REGISTRY TESTS
+# ============================================================================
+
+def test_default_enemies_by_level(enemy_registry):
+    """The default registry keeps the old goblin/orc/dragon levels"""
+    combat_system.set_enemy_registry(EnemyRegistry(game_data.get_default_enemies().values()))
+    expected = {0: "Goblin", 1: "Goblin", 2: "Goblin", 3: "Orc", 5: "Orc", 6: "Dragon", 99: "Dragon"}
+    for level, name in expected.items():
+        assert combat_system.get_random_enemy_for_level(level)["name"] == name
+
+    assert combat_system.create_enemy("ORC")["strength"] == 12
+    with pytest.raises(InvalidTargetError):
+        combat_system.create_enemy("unicorn")
+
+def test_weighted_choice(tmp_path):
+    """Enemies sharing a level are picked by weight, repeatably with a seed"""
+    path = tmp_path / "enemies.txt"
+    path.write_text("\n".join([
+        enemy_block("rat", 1, 4, weight=3),
+        enemy_block("wolf", 2, weight=1),
+        enemy_block("troll", 8),
+    ]))
+    registry = EnemyRegistry(game_data.load_enemies(str(path)).values())
+
+    assert [t.enemy_id for t in registry.templates_for_level(1)] == ["rat"]
+    assert [t.enemy_id for t in registry.templates_for_level(3)] == ["rat", "wolf"]
+    # Levels 5-7 only have wolves; no random numbers are used for them
+    assert registry.choose_template(6, rng=None).enemy_id == "wolf"
+
+    picks = Counter(registry.choose_template(3, random.Random(seed)).enemy_id
+                    for seed in range(2000))
+    assert 0.68 < picks["rat"] / 2000 < 0.82
+
+    first = [registry.choose_template(9, random.Random(4)).enemy_id for _ in range(5)]
+    second = [registry.choose_template(9, random.Random(4)).enemy_id for _ in range(5)]
+    assert first == second
+
+def test_level_gaps_use_nearest_pool():
+    """Levels with no enemies reuse the closest level that has some"""
+    registry = EnemyRegistry(
+        game_data.parse_enemy_block(block.splitlines())
+        for block in (enemy_block("bat", 3, 3), enemy_block("ogre", 6, 6))
+    )
+    ids = {level: registry.choose_template(level).enemy_id for level in range(1, 9)}
+    assert ids == {1: "bat", 2: "bat", 3: "bat", 4: "bat", 5: "bat",
+                   6: "ogre", 7: "ogre", 8: "ogre"}
+
+    with pytest.raises(InvalidTargetError):
+        EnemyRegistry([]).choose_template(1)
+
+# ============================================================================
+# FLYWEIGHT TESTS
+# ============================================================================
+
+def test_enemies_share_templates():
+    """Enemies of one type share stats and only own their health"""
+    first = combat_system.create_enemy("goblin")
+    second = combat_system.create_enemy("goblin")
+    assert first.template is second.template
+
+    first["health"] -= 20
+    assert second["health"] == second["max_health"]
+
+    first["strength"] = 99
+    assert second["strength"] == 8
+    assert combat_system.create_enemy("goblin")["strength"] == 8
+
+def test_enemy_copies_share_template():
+    """Copies, deep copies and pickles keep the template and health"""
+    enemy = combat_system.create_enemy("orc")
+    enemy["health"] = 33
+    enemy["taunt"] = ["Grr"]
+
+    for clone in (enemy.copy(), copy.deepcopy(enemy), pickle.loads(pickle.dumps(enemy))):
+        assert clone == enemy
+        assert clone.template == enemy.template
+    assert copy.deepcopy(enemy).template is enemy.template
+    assert copy.deepcopy(enemy)["taunt"] is not enemy["taunt"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
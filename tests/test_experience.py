@@ -0,0 +1,100 @@
+"""
+Test Experience
+Tests for closed-form leveling and custom XP curves
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+
+import character_manager
+
+def loop_gain_experience(character, xp_amount):
+    """The original one-level-at-a-time leveling loop"""
+    character["experience"] += xp_amount
+    leveled_up = False
+    while character["experience"] >= character["level"] * 100:
+        character["experience"] -= character["level"] * 100
+        character["level"] += 1
+        character["max_health"] += 10
+        character["strength"] += 2
+        character["magic"] += 2
+        character["health"] = character["max_health"]
+        leveled_up = True
+    return leveled_up
+
+@pytest.fixture
+def xp_curve():
+    """Restore the default XP curve after a test"""
+    previous = character_manager.get_xp_curve()
+    yield
+    character_manager.set_xp_curve(previous)
+
+# ============================================================================
+# DEFAULT CURVE TESTS
+# ============================================================================
+
+def test_matches_original_loop():
+    """Closed-form leveling gives exactly the loop's results"""
+    rng = random.Random(163)
+    for _ in range(2000):
+        character = character_manager.create_character("Xp", rng.choice(["Warrior", "Mage"]))
+        character["level"] = rng.randint(1, 60)
+        character["experience"] = rng.randint(0, character["level"] * 100 - 1)
+        character["health"] = rng.randint(1, character["max_health"])
+        expected = dict(character)
+
+        amount = rng.choice([0, 1, 99, 100, rng.randint(-500, 500), rng.randint(0, 10 ** 6)])
+        assert (character_manager.gain_experience(character, amount)
+                == loop_gain_experience(expected, amount))
+        assert character == expected
+
+def test_huge_grant_is_fast():
+    """A grant worth thousands of levels lands on the right level"""
+    character = character_manager.create_character("Admin", "Cleric")
+    strength = character["strength"]
+    character_manager.gain_experience(character, character_manager.total_xp_for_level(5000) + 7)
+    assert character["level"] == 5000
+    assert character["experience"] == 7
+    assert character["strength"] == strength + 2 * 4999
+
+def test_level_for_total_xp_boundaries():
+    """Level thresholds are exact on both sides"""
+    for level in range(1, 300):
+        total = character_manager.total_xp_for_level(level)
+        assert character_manager.level_for_total_xp(total) == level
+        assert character_manager.level_for_total_xp(total - 1) == max(1, level - 1)
+
+# ============================================================================
+# CUSTOM CURVE TESTS
+# ============================================================================
+
+def test_custom_curve(xp_curve):
+    """A custom XP table controls leveling and caps the level"""
+    character_manager.set_xp_curve([0, 50, 150, 400])
+    character = character_manager.create_character("Curve", "Rogue")
+
+    assert character_manager.gain_experience(character, 160)
+    assert character["level"] == 3
+    assert character["experience"] == 10
+
+    character_manager.gain_experience(character, 10 ** 6)
+    assert character["level"] == 4
+    assert not character_manager.gain_experience(character, 10 ** 6)
+
+    assert character_manager.create_character_at_level("Lvl", "Mage", 3)["level"] == 3
+
+def test_invalid_curve_rejected(xp_curve):
+    """Curves must start at 0 and increase"""
+    with pytest.raises(ValueError):
+        character_manager.set_xp_curve([10, 20])
+    with pytest.raises(ValueError):
+        character_manager.set_xp_curve([0, 100, 100])
+    assert character_manager.get_xp_curve() is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
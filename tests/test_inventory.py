@@ -0,0 +1,288 @@
+"""
+Test Inventory
+Tests for the indexed inventory type
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import pickle
+import random
+
+import character_manager
+import game_data
+import inventory_system
+import save_store
+from inventory_system import Inventory
+from custom_exceptions import (
+    ItemNotFoundError,
+    InvalidDataFormatError,
+    InsufficientResourcesError,
+    InventoryFullError
+)
+
+# ============================================================================
+# INVENTORY TYPE TESTS
+# ============================================================================
+
+def test_inventory_behaves_like_list():
+    """Inventory keeps insertion order and list semantics"""
+    inventory = Inventory(["potion", "sword", "potion", "shield"])
+
+    assert len(inventory) == 4
+    assert inventory == ["potion", "sword", "potion", "shield"]
+    assert "sword" in inventory
+    assert "axe" not in inventory
+    assert inventory.count("potion") == 2
+    assert inventory[1] == "sword"
+    assert ",".join(inventory) == "potion,sword,potion,shield"
+
+    # remove() takes the first copy, like list.remove
+    inventory.remove("potion")
+    assert inventory == ["sword", "potion", "shield"]
+    assert inventory.pop() == "shield"
+    assert inventory.count("shield") == 0
+
+    with pytest.raises(ValueError):
+        inventory.remove("shield")
+
+def test_inventory_counts_in_first_seen_order():
+    """counts() groups items in the order they first appear"""
+    inventory = Inventory(["a", "b", "a", "c"])
+    inventory.remove("a")
+    assert inventory.counts() == {"b": 1, "a": 1, "c": 1}
+    assert list(inventory.counts()) == ["b", "a", "c"]
+
+def test_index_operations_keep_index_consistent():
+    """Slow index-based edits still keep the count index right"""
+    inventory = Inventory(["a", "b", "c"])
+    inventory.insert(0, "c")
+    del inventory[1]
+    inventory[0] = "b"
+    assert inventory == ["b", "b", "c"]
+    assert inventory.count("b") == 2
+    assert inventory.count("a") == 0
+
+def test_random_edits_match_a_plain_list():
+    """Counts stay right through any mix of edits, copies and pickling"""
+    rng = random.Random(11)
+    inventory = Inventory()
+    model = []
+    for step in range(2000):
+        item_id = f"item_{rng.randrange(8)}"
+        operation = rng.randrange(7)
+        if operation <= 1:
+            inventory.append(item_id)
+            model.append(item_id)
+        elif operation == 2 and item_id in model:
+            inventory.remove(item_id)
+            model.remove(item_id)
+        elif operation == 3 and model:
+            assert inventory.pop() == model.pop()
+        elif operation == 4:
+            index = rng.randrange(len(model) + 1)
+            inventory.insert(index, item_id)
+            model.insert(index, item_id)
+        elif operation == 5 and model:
+            index = rng.randrange(len(model))
+            del inventory[index]
+            del model[index]
+        elif operation == 6:
+            inventory.extend([item_id, item_id])
+            model.extend([item_id, item_id])
+
+        assert inventory.count(item_id) == model.count(item_id)
+        assert (item_id in inventory) == (item_id in model)
+        if step % 250 == 0:
+            inventory = pickle.loads(pickle.dumps(copy.deepcopy(inventory)))
+    assert inventory == model
+
+def test_inventory_functions_with_inventory_type():
+    """The inventory functions work on an Inventory"""
+    character = character_manager.create_character("Bag", "Warrior")
+    assert isinstance(character["inventory"], Inventory)
+
+    inventory_system.add_item_to_inventory(character, "health_potion")
+    inventory_system.add_item_to_inventory(character, "health_potion")
+    assert inventory_system.count_item(character, "health_potion") == 2
+    assert inventory_system.has_item(character, "health_potion")
+
+    inventory_system.remove_item_from_inventory(character, "health_potion")
+    assert inventory_system.count_item(character, "health_potion") == 1
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.remove_item_from_inventory(character, "iron_sword")
+
+    assert inventory_system.clear_inventory(character) == ["health_potion"]
+    assert len(character["inventory"]) == 0
+
+def test_inventory_save_round_trip(tmp_path):
+    """Text and SQLite saves keep the comma-separated format"""
+    character = character_manager.create_character("Packrat", "Rogue")
+    character["inventory"].extend(["health_potion", "iron_sword", "health_potion"])
+
+    character_manager.save_character(character, str(tmp_path))
+    with open(tmp_path / "Packrat_save.txt") as file:
+        assert "INVENTORY: health_potion,iron_sword,health_potion\n" in file.readlines()
+
+    loaded = character_manager.load_character("Packrat", str(tmp_path))
+    assert isinstance(loaded["inventory"], Inventory)
+    assert loaded["inventory"].count("health_potion") == 2
+
+    row = save_store.character_to_row(character)
+    restored = save_store.row_to_character(row)
+    assert restored["inventory"] == character["inventory"]
+
+# ============================================================================
+# ITEM EFFECT TESTS
+# ============================================================================
+
+def test_compile_item_effect():
+    """Effect strings compile to (stat, delta) records"""
+    assert game_data.compile_item_effect("strength:5") == (("strength", 5),)
+    effects = game_data.compile_item_effect("strength:5, max_health:-10")
+    assert effects[1].stat == "max_health"
+    assert effects[1].delta == -10
+
+    for bad in ("strength", "strength:", "strength:five", ":5"):
+        with pytest.raises(InvalidDataFormatError):
+            game_data.compile_item_effect(bad)
+
+def test_loaded_items_have_compiled_effects(tmp_path):
+    """load_items compiles every item's effect once"""
+    path = tmp_path / "items.txt"
+    path.write_text(
+        "ITEM_ID: war_axe\nNAME: War Axe\nTYPE: weapon\n"
+        "EFFECT: strength:8,max_health:-5\nCOST: 90\nDESCRIPTION: Heavy\n"
+    )
+    items = game_data.load_items(str(path))
+    assert items["war_axe"]["effects"] == (("strength", 8), ("max_health", -5))
+
+def test_equip_unequip_multi_stat_item():
+    """Equipping and unequipping a multi-stat item restores every stat"""
+    character = character_manager.create_character("Axe", "Warrior")
+    before = dict(character)
+    item = {"type": "weapon", "effect": "strength:8,max_health:-5"}
+    item["effects"] = game_data.compile_item_effect(item["effect"])
+
+    character["inventory"].append("war_axe")
+    message = inventory_system.equip_weapon(character, "war_axe", item)
+    assert "+8 strength" in message
+    assert character["strength"] == before["strength"] + 8
+    assert character["max_health"] == before["max_health"] - 5
+    assert character["equipped_weapon_effect"] == item["effects"]
+
+    inventory_system.unequip_weapon(character)
+    assert character["strength"] == before["strength"]
+    assert character["max_health"] == before["max_health"]
+
+def test_legacy_equipped_effect_string():
+    """An equipped effect stored as a string is still removed correctly"""
+    character = character_manager.create_character("Old", "Warrior")
+    strength = character["strength"]
+    character["strength"] += 5
+    character["equipped_weapon"] = "iron_sword"
+    character["equipped_weapon_effect"] = "strength:5"
+
+    assert inventory_system.unequip_weapon(character) == "iron_sword"
+    assert character["strength"] == strength
+
+def test_equipped_effect_list_of_pairs():
+    """An equipped effect read back from JSON (a list of lists) still works"""
+    character = character_manager.create_character("Json", "Warrior")
+    strength = character["strength"]
+    max_health = character["max_health"]
+    character["strength"] += 8
+    character["max_health"] -= 5
+    character["equipped_weapon"] = "war_axe"
+    character["equipped_weapon_effect"] = [["strength", 8], ["max_health", -5]]
+
+    assert inventory_system.get_item_effects(character["equipped_weapon_effect"]) == (
+        ("strength", 8), ("max_health", -5))
+    assert inventory_system.unequip_weapon(character) == "war_axe"
+    assert character["strength"] == strength
+    assert character["max_health"] == max_health
+
+# ============================================================================
+# BATCH TRANSACTION TESTS
+# ============================================================================
+
+SHOP_ITEMS = {
+    "health_potion": {"name": "Health Potion", "type": "consumable", "effect": "health:30", "cost": 25},
+    "iron_sword": {"name": "Iron Sword", "type": "weapon", "effect": "strength:5", "cost": 100},
+}
+
+def test_purchase_items_in_one_transaction():
+    """A batch order charges the total once and adds every item"""
+    character = character_manager.create_character("Bulk", "Rogue")
+    character["gold"] = 300
+
+    spent = inventory_system.purchase_items(
+        character, {"health_potion": 3, "iron_sword": 1}, SHOP_ITEMS)
+    assert spent == 175
+    assert character["gold"] == 125
+    assert character["inventory"] == ["health_potion"] * 3 + ["iron_sword"]
+
+    assert inventory_system.purchase_items(character, ["health_potion", "health_potion"],
+                                           SHOP_ITEMS) == 50
+    assert character["inventory"].count("health_potion") == 5
+
+def test_failed_purchase_changes_nothing():
+    """Orders that cost too much, do not fit or name unknown items are refused whole"""
+    character = character_manager.create_character("Broke", "Mage")
+    character["inventory"].append("health_potion")
+    before = (character["gold"], list(character["inventory"]))
+
+    with pytest.raises(InsufficientResourcesError):
+        inventory_system.purchase_items(character, {"health_potion": 2, "iron_sword": 1}, SHOP_ITEMS)
+    character["gold"] = 10 ** 6
+    with pytest.raises(InventoryFullError):
+        inventory_system.purchase_items(character, {"health_potion": inventory_system.MAX_INVENTORY_SIZE},
+                                        SHOP_ITEMS)
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.purchase_items(character, ["health_potion", "dragon_egg"], SHOP_ITEMS)
+    with pytest.raises(ValueError):
+        inventory_system.purchase_items(character, {"health_potion": 0}, SHOP_ITEMS)
+
+    assert (character["gold"], list(character["inventory"])) == (10 ** 6, before[1])
+
+def test_sell_items_in_one_transaction():
+    """A batch sale pays half of each cost, or sells nothing if any item is missing"""
+    character = character_manager.create_character("Seller", "Cleric")
+    for item_id in ("iron_sword", "health_potion", "health_potion", "iron_sword"):
+        character["inventory"].append(item_id)
+    gold = character["gold"]
+
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.sell_items(character, {"health_potion": 3}, SHOP_ITEMS)
+    assert character["gold"] == gold
+    assert len(character["inventory"]) == 4
+
+    earned = inventory_system.sell_items(character, ["health_potion", "iron_sword", "health_potion"],
+                                         SHOP_ITEMS)
+    assert earned == 12 * 2 + 50
+    assert character["gold"] == gold + earned
+    assert character["inventory"] == ["iron_sword"]
+
+def test_purchase_rolls_back_if_applying_fails():
+    """An error while items are being added undoes the whole purchase"""
+    class BrokenInventory(list):
+        def append(self, item_id):
+            if len(self) == 2:
+                raise RuntimeError("disk full")
+            super().append(item_id)
+
+    character = character_manager.create_character("Rollback", "Warrior")
+    character["inventory"] = BrokenInventory(["iron_sword"])
+    gold = character["gold"]
+
+    with pytest.raises(RuntimeError):
+        inventory_system.purchase_items(character, {"health_potion": 3}, SHOP_ITEMS)
+    assert character["gold"] == gold
+    assert character["inventory"] == ["iron_sword"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
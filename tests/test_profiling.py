@@ -0,0 +1,240 @@
+"""
+Test Profiling
+Tests for the opt-in function profiler
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+import types
+
+import character_manager
+import combat_system
+import profiling
+
+SAMPLE_SOURCE = '''
+import time
+from os.path import join
+
+def outer(count):
+    for _ in range(count):
+        inner()
+    return count
+
+def inner():
+    time.sleep(0.002)
+
+def countdown(n):
+    return n if n == 0 else countdown(n - 1)
+
+def numbers(count):
+    for number in range(count):
+        inner()
+        yield number
+
+closed = []
+
+def echo():
+    try:
+        while True:
+            value = yield
+            yield value * 2
+    finally:
+        closed.append(True)
+
+class Tally:
+    def __init__(self):
+        self.total = 0
+
+    def add(self, count):
+        self.total += outer(count)
+        return self.total
+
+    @staticmethod
+    def zero():
+        return 0
+
+    def _reset(self):
+        self.total = 0
+
+def _helper():
+    return "private"
+'''
+
+@pytest.fixture
+def sample():
+    """A throwaway module with nested, recursive and generator functions and a class"""
+    module = types.ModuleType("sample_module")
+    exec(SAMPLE_SOURCE, vars(module))
+    profiling.reset()
+    yield module
+    profiling.disable()
+    profiling.reset()
+
+def stats_by_name(rows):
+    """Map report rows by their short function name"""
+    return {row.name.rsplit(".", 1)[1]: row for row in rows}
+
+# ============================================================================
+# ENABLE / DISABLE TESTS
+# ============================================================================
+
+def test_only_public_functions_are_wrapped_and_restored(sample):
+    """Wrappers exist only while enabled and only for the module's own public functions"""
+    originals = dict(vars(sample))
+
+    methods = dict(vars(sample.Tally))
+
+    assert profiling.enable([sample]) == 6
+    assert profiling.enable([sample]) == 0
+    assert profiling.is_enabled()
+    assert sample.outer is not originals["outer"]
+    assert sample.outer.__wrapped__ is originals["outer"]
+    assert sample._helper is originals["_helper"]
+    assert sample.join is originals["join"]
+    assert sample.Tally.add.__wrapped__ is methods["add"]
+    for name in ("__init__", "zero", "_reset"):
+        assert vars(sample.Tally)[name] is methods[name]
+
+    assert profiling.disable() == 6
+    assert not profiling.is_enabled()
+    for name in ("outer", "inner", "countdown", "numbers", "echo"):
+        assert getattr(sample, name) is originals[name]
+    assert vars(sample.Tally) == methods
+
+def test_default_modules_are_restored():
+    """enable() with no arguments covers the game modules and disable() undoes it"""
+    original = character_manager.create_character
+    try:
+        assert profiling.enable() > 0
+        assert character_manager.create_character is not original
+        character_manager.create_character("Profiled", "Mage")
+        names = [row.name for row in profiling.report(None)]
+        assert "character_manager.create_character" in names
+
+        battle = combat_system.SimpleBattle(
+            character_manager.create_character("Fighter", "Warrior"),
+            combat_system.create_enemy("goblin"), policy=combat_system.AttackPolicy(),
+            sink=combat_system.NullSink())
+        battle.run()
+        names = [row.name for row in profiling.report(None)]
+        assert "combat_system.SimpleBattle.run" in names
+    finally:
+        profiling.disable()
+        profiling.reset()
+    assert character_manager.create_character is original
+    assert not hasattr(combat_system.SimpleBattle.run, "__wrapped__")
+
+def test_enable_from_environment(monkeypatch, sample):
+    """QUEST_CHRONICLES_PROFILE turns profiling on unless empty or 0"""
+    monkeypatch.setenv(profiling.PROFILE_ENV, "0")
+    assert not profiling.enable_from_environment()
+
+    monkeypatch.setenv(profiling.PROFILE_ENV, "1")
+    assert profiling.enable_from_environment()
+    assert character_manager.create_character.__wrapped__ is not None
+
+# ============================================================================
+# TIMING TESTS
+# ============================================================================
+
+def test_self_and_cumulative_time(sample):
+    """Time in a profiled callee counts for the caller's cumulative time only"""
+    profiling.enable([sample])
+    assert sample.outer(5) == 5
+    sample.countdown(20)
+
+    rows = stats_by_name(profiling.report(None))
+    outer, inner, countdown = rows["outer"], rows["inner"], rows["countdown"]
+    assert (outer.calls, inner.calls, countdown.calls) == (1, 5, 21)
+    assert inner.cumulative >= 0.009
+    assert outer.cumulative >= inner.cumulative
+    assert outer.self_time < inner.cumulative
+    # A recursive function's cumulative time is its outermost call's
+    assert countdown.cumulative < outer.cumulative
+    assert countdown.self_time == pytest.approx(countdown.cumulative, abs=1e-3)
+
+def test_generators_are_timed_while_running(sample):
+    """A generator's time is the time spent inside it across every resume"""
+    profiling.enable([sample])
+    generator = sample.numbers(3)
+    assert next(generator) == 0
+    time.sleep(0.01)
+    assert list(generator) == [1, 2]
+
+    with pytest.raises(TypeError):
+        sample.numbers()
+
+    rows = stats_by_name(profiling.report(None))
+    numbers, inner = rows["numbers"], rows["inner"]
+    assert (numbers.calls, inner.calls) == (1, 3)
+    assert numbers.cumulative >= inner.cumulative >= 0.006
+    # Time the caller spent between resumes is not the generator's
+    assert numbers.cumulative < inner.cumulative + 0.005
+    assert numbers.self_time < 0.005
+
+def test_generators_pass_send_throw_and_close(sample):
+    """The wrapped generator behaves like the original"""
+    profiling.enable([sample])
+
+    echo = sample.echo()
+    next(echo)
+    assert echo.send(21) == 42
+    next(echo)
+    with pytest.raises(KeyError):
+        echo.throw(KeyError("boom"))
+
+    echo = sample.echo()
+    next(echo)
+    assert sample.closed == [True]
+    echo.close()
+    assert sample.closed == [True, True]
+
+def test_methods_are_profiled_under_their_class(sample):
+    """Public methods of public classes are timed like functions"""
+    profiling.enable([sample])
+    tally = sample.Tally()
+    assert tally.add(2) == 2
+    assert sample.Tally.zero() == 0
+
+    rows = {row.name: row for row in profiling.report(None)}
+    add = rows["sample_module.Tally.add"]
+    assert add.calls == 1
+    assert add.cumulative >= rows["sample_module.outer"].cumulative
+    assert "sample_module.Tally.zero" not in rows
+
+def test_report_order_top_and_reset(sample):
+    """report() returns the hottest functions first and reset() clears them"""
+    profiling.enable([sample])
+    sample.outer(2)
+    sample.countdown(30)
+
+    assert [row.name for row in profiling.report(1)] == ["sample_module.inner"]
+    assert profiling.report(1, sort="calls")[0].name == "sample_module.countdown"
+    assert "sample_module.outer" in profiling.format_report(profiling.report())
+    with pytest.raises(ValueError):
+        profiling.report(sort="name")
+
+    profiling.reset()
+    assert profiling.report() == []
+
+def test_threads_are_added_together(sample):
+    """Calls made in other threads show up in the report"""
+    profiling.enable([sample])
+    threads = [threading.Thread(target=sample.outer, args=(2,)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    rows = stats_by_name(profiling.report(None))
+    assert rows["outer"].calls == 3
+    assert rows["inner"].calls == 6
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
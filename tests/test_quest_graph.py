@@ -0,0 +1,232 @@
+"""
+Test Quest Graph
+Tests for the precomputed quest prerequisite graph
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import pickle
+import random
+
+import character_manager
+import game_data
+import quest_handler
+from quest_graph import QuestCatalog, QuestFrontier, QuestLog
+from custom_exceptions import InvalidDataFormatError, QuestNotFoundError
+
+def make_quest(quest_id, prerequisite="NONE", level=1):
+    """Build a minimal quest dictionary"""
+    return {
+        "quest_id": quest_id,
+        "title": quest_id.title(),
+        "description": "Test quest",
+        "reward_xp": 10,
+        "reward_gold": 5,
+        "required_level": level,
+        "prerequisite": prerequisite,
+    }
+
+def random_catalog(count, seed):
+    """Build a random prerequisite forest"""
+    rng = random.Random(seed)
+    quests = {}
+    for index in range(count):
+        prerequisite = "NONE"
+        if index and rng.random() < 0.7:
+            prerequisite = f"q{rng.randrange(index)}"
+        quests[f"q{index}"] = make_quest(f"q{index}", prerequisite, rng.randint(1, 8))
+    return quests
+
+# ============================================================================
+# GRAPH TESTS
+# ============================================================================
+
+def test_available_quests_match_full_scan():
+    """The graph gives the same answer, in the same order, as a full scan"""
+    quests = random_catalog(300, seed=7)
+    catalog = QuestCatalog(quests)
+    rng = random.Random(11)
+
+    for _ in range(20):
+        completed = rng.sample(sorted(quests), 60)
+        active = rng.sample(sorted(quests), 10)
+        character = {
+            "level": rng.randint(1, 8),
+            "completed_quests": completed,
+            "active_quests": active,
+        }
+        assert (quest_handler.get_available_quests(character, catalog)
+                == quest_handler.get_available_quests(character, quests))
+
+def test_topological_order_and_chains():
+    """Prerequisites come first and chains match the plain walk"""
+    quests = random_catalog(200, seed=3)
+    catalog = QuestCatalog(quests)
+    order = catalog.graph.order
+    position = {quest_id: index for index, quest_id in enumerate(order)}
+
+    assert sorted(order) == sorted(quests)
+    for quest_id, quest in quests.items():
+        if quest["prerequisite"] != "NONE":
+            assert position[quest["prerequisite"]] < position[quest_id]
+        assert (quest_handler.get_quest_prerequisite_chain(quest_id, catalog)
+                == quest_handler.get_quest_prerequisite_chain(quest_id, quests))
+
+def test_missing_prerequisite_in_chain():
+    """A chain through a missing prerequisite still raises QuestNotFoundError"""
+    catalog = QuestCatalog({"b": make_quest("b", "ghost")})
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain("b", catalog)
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain("nope", catalog)
+
+def test_quests_by_level_uses_buckets():
+    """Level range queries match the plain filter"""
+    quests = random_catalog(100, seed=5)
+    catalog = QuestCatalog(quests)
+    assert (quest_handler.get_quests_by_level(catalog, 3, 5)
+            == quest_handler.get_quests_by_level(quests, 3, 5))
+
+def test_catalog_rebuilds_graph_after_change():
+    """Adding a quest throws away the old graph"""
+    catalog = QuestCatalog({"a": make_quest("a")})
+    character = character_manager.create_character("Graph", "Warrior")
+    character["completed_quests"].append("a")
+    assert quest_handler.get_available_quests(character, catalog) == []
+
+    catalog["b"] = make_quest("b", "a")
+    available = quest_handler.get_available_quests(character, catalog)
+    assert [quest["quest_id"] for quest in available] == ["b"]
+
+    copied = pickle.loads(pickle.dumps(catalog))
+    assert isinstance(copied, QuestCatalog)
+    assert copied == catalog
+
+# ============================================================================
+# CYCLE TESTS
+# ============================================================================
+
+def test_cycle_rejected_at_load(tmp_path):
+    """load_quests refuses a prerequisite cycle instead of hanging later"""
+    path = tmp_path / "quests.txt"
+    blocks = []
+    for quest_id, prerequisite in (("a", "c"), ("b", "a"), ("c", "b")):
+        blocks.append(
+            f"QUEST_ID: {quest_id}\nTITLE: {quest_id}\nDESCRIPTION: Loop\n"
+            f"REWARD_XP: 1\nREWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: {prerequisite}\n"
+        )
+    path.write_text("\n".join(blocks))
+
+    with pytest.raises(InvalidDataFormatError, match="cycle"):
+        game_data.load_quests(str(path))
+
+def test_build_finds_cycle_up_front():
+    """build() makes the graph now, so a cycle fails before first use"""
+    catalog = QuestCatalog({"a": make_quest("a"), "b": make_quest("b", "a")})
+    assert catalog.build() is catalog.graph
+
+    catalog["a"] = make_quest("a", "b")
+    with pytest.raises(InvalidDataFormatError):
+        catalog.build()
+
+def test_plain_dict_chain_cycle_does_not_hang():
+    """A cycle in a plain dictionary raises instead of looping forever"""
+    quests = {"a": make_quest("a", "b"), "b": make_quest("b", "a")}
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.get_quest_prerequisite_chain("a", quests)
+
+# ============================================================================
+# FRONTIER TESTS
+# ============================================================================
+
+def test_frontier_tracks_random_play():
+    """The frontier matches a full scan through accepts, completions,
+    abandons and level-ups"""
+    quests = random_catalog(250, seed=21)
+    catalog = QuestCatalog(quests)
+    character = character_manager.create_character("Frontier", "Mage")
+    rng = random.Random(4)
+
+    for _ in range(300):
+        available = quest_handler.get_available_quests(character, catalog)
+        assert available == quest_handler.get_available_quests(character, quests)
+        assert isinstance(character["quest_frontier"], QuestFrontier)
+
+        roll = rng.random()
+        if available and roll < 0.5:
+            quest_handler.accept_quest(character, rng.choice(available)["quest_id"], catalog)
+        elif character["active_quests"] and roll < 0.85:
+            quest_handler.complete_quest(character, rng.choice(character["active_quests"]), catalog)
+        elif character["active_quests"] and roll < 0.95:
+            quest_handler.abandon_quest(character, rng.choice(character["active_quests"]))
+        else:
+            character_manager.gain_experience(character, 150)
+
+def test_frontier_rebuilds_after_outside_changes():
+    """Editing the quest lists directly does not leave a stale frontier"""
+    catalog = QuestCatalog({"a": make_quest("a"), "b": make_quest("b", "a", level=2)})
+    character = character_manager.create_character("Outside", "Rogue")
+
+    assert [q["quest_id"] for q in quest_handler.get_available_quests(character, catalog)] == ["a"]
+    character["completed_quests"].append("a")
+    assert quest_handler.get_available_quests(character, catalog) == []
+    character["level"] = 2
+    assert [q["quest_id"] for q in quest_handler.get_available_quests(character, catalog)] == ["b"]
+
+def test_frontier_copy_shares_catalog():
+    """Copying a character (autosave) does not copy the quest catalog"""
+    catalog = QuestCatalog(random_catalog(50, seed=2))
+    character = character_manager.create_character("Copy", "Cleric")
+    quest_handler.get_available_quests(character, catalog)
+
+    clone = copy.deepcopy(character)
+    assert clone["quest_frontier"].catalog is catalog
+    assert clone["quest_frontier"].character is clone
+    assert clone["quest_frontier"].is_current(catalog, clone)
+
+# ============================================================================
+# QUEST LOG TESTS
+# ============================================================================
+
+def test_quest_log_is_ordered_set():
+    """QuestLog keeps completion order and behaves like a list"""
+    log = QuestLog(["c", "a", "b"])
+    log.append("a")
+    assert log == ["c", "a", "b"]
+    assert "a" in log and "z" not in log
+    assert log[0] == "c"
+    assert ",".join(log) == "c,a,b"
+
+    log.remove("a")
+    assert log == ["c", "b"]
+    assert log.pop() == "b"
+    with pytest.raises(ValueError):
+        log.remove("a")
+
+def test_quest_log_save_round_trip(tmp_path):
+    """Quest lines are saved and loaded unchanged, in order"""
+    character = character_manager.create_character("Veteran", "Warrior")
+    assert isinstance(character["completed_quests"], QuestLog)
+    for index in range(5, 0, -1):
+        character["completed_quests"].append(f"quest_{index}")
+    character["active_quests"].append("quest_9")
+
+    character_manager.save_character(character, str(tmp_path))
+    with open(tmp_path / "Veteran_save.txt") as file:
+        lines = file.readlines()
+    assert "ACTIVE_QUESTS: quest_9\n" in lines
+    assert "COMPLETED_QUESTS: quest_5,quest_4,quest_3,quest_2,quest_1\n" in lines
+
+    loaded = character_manager.load_character("Veteran", str(tmp_path))
+    assert isinstance(loaded["completed_quests"], QuestLog)
+    assert loaded["completed_quests"] == character["completed_quests"]
+    assert quest_handler.is_quest_completed(loaded, "quest_3")
+    assert quest_handler.is_quest_active(loaded, "quest_9")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
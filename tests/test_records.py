@@ -0,0 +1,115 @@
+"""
+Test Records
+Tests for the slotted Character and Enemy record types
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import pickle
+import random
+
+import character_manager
+import combat_system
+import inventory_system
+from records import Character, Enemy
+
+# ============================================================================
+# MAPPING BEHAVIOR TESTS
+# ============================================================================
+
+def test_character_is_a_mapping():
+    """Characters are records that still work like dictionaries"""
+    character = character_manager.create_character("Rec", "Warrior")
+    assert isinstance(character, Character)
+    assert not hasattr(character, "__dict__")
+
+    assert character["class"] == "Warrior"
+    assert character.character_class == "Warrior"
+    character["health"] -= 10
+    assert character.health == character["max_health"] - 10
+
+    assert "equipped_weapon" not in character
+    assert character.get("equipped_weapon") is None
+    with pytest.raises(KeyError):
+        character["equipped_weapon"]
+
+    character["equipped_weapon"] = "iron_sword"
+    assert "equipped_weapon" in character
+    del character["equipped_weapon"]
+    assert "equipped_weapon" not in character
+
+def test_extra_keys_and_dict_equality():
+    """Unknown keys are kept, and records compare equal to dictionaries"""
+    enemy = combat_system.create_enemy("goblin")
+    enemy["taunt"] = "Grr"
+    plain = dict(enemy)
+
+    assert plain["taunt"] == "Grr"
+    assert enemy == plain
+    assert list(enemy)[:2] == ["name", "health"]
+    assert len(enemy) == 8
+
+def test_copies_are_independent():
+    """copy(), deepcopy() and pickle give equal, separate records"""
+    character = character_manager.create_character("Copy", "Mage")
+    character["inventory"].append("health_potion")
+
+    shallow = character.copy()
+    shallow["gold"] = 0
+    assert character["gold"] == 100
+    assert shallow["inventory"] is character["inventory"]
+
+    deep = copy.deepcopy(character)
+    assert deep == character
+    assert deep["inventory"] is not character["inventory"]
+
+    restored = pickle.loads(pickle.dumps(character))
+    assert isinstance(restored, Character)
+    assert restored == character
+
+# ============================================================================
+# COMPATIBILITY TESTS
+# ============================================================================
+
+def test_battle_accepts_records_and_plain_dicts():
+    """The battle engine gives the same result for records and dictionaries"""
+    template = character_manager.create_character("Fighter", "Rogue")
+
+    record_result = combat_system.run_headless_battle(
+        template.copy(), combat_system.create_enemy("orc"), rng=random.Random(5)
+    )
+    plain_character = dict(template)
+    plain_enemy = dict(combat_system.create_enemy("orc"))
+    dict_result = combat_system.run_headless_battle(
+        plain_character, plain_enemy, rng=random.Random(5)
+    )
+
+    assert record_result == dict_result
+    assert plain_enemy["health"] == 0
+
+def test_loaded_character_is_record(tmp_path):
+    """Saves load back as Character records"""
+    character = character_manager.create_character("Saved", "Cleric")
+    inventory_system.add_item_to_inventory(character, "health_potion")
+    character_manager.save_character(character, str(tmp_path))
+
+    loaded = character_manager.load_character("Saved", str(tmp_path))
+    assert isinstance(loaded, Character)
+    assert loaded == character
+
+def test_enemy_record_fields():
+    """Enemies keep exactly the old fields"""
+    enemy = combat_system.create_enemy("dragon")
+    assert isinstance(enemy, Enemy)
+    assert dict(enemy) == {
+        "name": "Dragon", "health": 200, "max_health": 200, "strength": 25,
+        "magic": 15, "xp_reward": 200, "gold_reward": 100,
+    }
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,205 @@
+"""
+Test Save System
+Tests for save backends, migration and safe saving
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+import autosave
+import character_manager
+import save_store
+from custom_exceptions import CharacterNotFoundError
+
+# ============================================================================
+# SQLITE BACKEND TESTS
+# ============================================================================
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    """Use a SQLite store for the duration of a test"""
+    store = save_store.SQLiteSaveStore(str(tmp_path / "saves.db"))
+    previous = character_manager.set_save_backend(store)
+    yield store
+    character_manager.set_save_backend(previous)
+    store.close()
+
+def test_sqlite_backend_round_trip(sqlite_backend):
+    """Test that the normal save API works on top of SQLite"""
+    char = character_manager.create_character("SqlHero", "Mage")
+    char['inventory'] = ["health_potion", "health_potion", "fire_staff"]
+    char['completed_quests'] = ["first_steps"]
+
+    assert character_manager.save_character(char) == True
+    loaded = character_manager.load_character("SqlHero")
+
+    assert loaded == char
+    assert character_manager.list_saved_characters() == ["SqlHero"]
+
+    char['gold'] = 5
+    character_manager.save_character(char)
+    assert character_manager.load_character("SqlHero")['gold'] == 5
+
+    assert character_manager.delete_character("SqlHero") == True
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SqlHero")
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("SqlHero")
+
+def test_sqlite_batch_save(sqlite_backend):
+    """Test saving many characters in one transaction"""
+    chars = [character_manager.create_character(f"Hero{i:03}", "Rogue") for i in range(250)]
+    sqlite_backend.save_many(chars)
+
+    names = character_manager.list_saved_characters()
+    assert len(names) == 250
+    assert names[0] == "Hero000"
+
+def test_migrate_text_saves(tmp_path):
+    """Test importing text saves, skipping broken ones"""
+    save_dir = str(tmp_path / "saves")
+    for name in ("Alpha", "Beta", "Gamma"):
+        char = character_manager.create_character(name, "Cleric")
+        char['active_quests'] = ["goblin_hunter"]
+        character_manager.save_character(char, save_dir)
+    with open(os.path.join(save_dir, "Broken_save.txt"), "w") as f:
+        f.write("NAME: Broken\nLEVEL: high\n")
+    with open(os.path.join(save_dir, "Garbled_save.txt"), "wb") as f:
+        f.write(b"NAME: Garbled\xff\n")
+
+    db_path = str(tmp_path / "saves.db")
+    report = save_store.migrate_text_saves(save_dir, db_path=db_path, batch_size=2)
+
+    assert report['migrated'] == 3
+    assert list(report['failed']) == ["Broken", "Garbled"]
+    with save_store.SQLiteSaveStore(db_path) as store:
+        assert store.list_names() == ["Alpha", "Beta", "Gamma"]
+        assert store.load("Beta")['active_quests'] == ["goblin_hunter"]
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_unchanged_save_is_skipped(tmp_path, monkeypatch):
+    """Test that saving the same state twice writes the file only once"""
+    writes = []
+    real_write = character_manager.write_file_atomically
+
+    def counting_write(filename, text, fsync=True):
+        writes.append(filename)
+        real_write(filename, text, fsync)
+
+    monkeypatch.setattr(character_manager, "write_file_atomically", counting_write)
+    char = character_manager.create_character("CoalesceTest", "Warrior")
+
+    character_manager.save_character(char, str(tmp_path))
+    character_manager.save_character(char, str(tmp_path))
+    assert len(writes) == 1
+
+    char['gold'] += 1
+    character_manager.save_character(char, str(tmp_path))
+    assert len(writes) == 2
+    assert character_manager.load_character("CoalesceTest", str(tmp_path))['gold'] == char['gold']
+
+def test_failed_save_keeps_old_file(tmp_path, monkeypatch):
+    """Test that a crash before the rename leaves the previous save intact"""
+    char = character_manager.create_character("AtomicTest", "Mage")
+    character_manager.save_character(char, str(tmp_path), fsync=False)
+
+    def crash(src, dst):
+        raise OSError("disk unplugged")
+
+    monkeypatch.setattr(character_manager.os, "replace", crash)
+    char['level'] = 9
+    with pytest.raises(OSError):
+        character_manager.save_character(char, str(tmp_path), fsync=False)
+    monkeypatch.undo()
+
+    assert os.listdir(str(tmp_path)) == ["AtomicTest_save.txt"]
+    assert character_manager.load_character("AtomicTest", str(tmp_path))['level'] == 1
+
+def test_concurrent_writes_never_collide(tmp_path):
+    """Test that threads writing the same save at once all succeed"""
+    filename = str(tmp_path / "Racer_save.txt")
+    texts = [f"GOLD: {index}\n" * 2000 for index in range(8)]
+    errors = []
+
+    def writer(text):
+        try:
+            for _ in range(20):
+                character_manager.write_file_atomically(filename, text, fsync=False)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(str(tmp_path)) == ["Racer_save.txt"]
+    with open(filename, encoding="utf-8") as f:
+        assert f.read() in texts
+
+# ============================================================================
+# AUTOSAVE SCHEDULER TESTS
+# ============================================================================
+
+def test_read_only_actions_do_not_save():
+    """Test that unchanged characters are never written"""
+    saved = []
+    char = character_manager.create_character("AutoTest", "Rogue")
+    scheduler = autosave.AutosaveScheduler(char, saved.append, max_interval=None,
+                                           max_operations=3)
+
+    for _ in range(10):
+        assert scheduler.mark_action() == False
+    assert scheduler.close() == False
+    assert saved == []
+
+def test_operation_count_policy():
+    """Test that the scheduler saves after max_operations changing actions"""
+    saved = []
+    char = character_manager.create_character("OpsTest", "Warrior")
+    scheduler = autosave.AutosaveScheduler(char, saved.append, max_interval=None,
+                                           max_operations=3)
+
+    for _ in range(3):
+        char['gold'] += 10
+        scheduler.mark_action()
+    assert len(saved) == 1
+    assert saved[0]['gold'] == char['gold']
+    assert saved[0] is not char
+
+    char['inventory'].append("health_potion")
+    scheduler.mark_action()
+    assert scheduler.dirty
+    assert scheduler.close() == True
+    assert saved[-1]['inventory'] == ["health_potion"]
+
+def test_background_thread_flushes_old_changes():
+    """Test the time-based policy"""
+    saved = []
+    char = character_manager.create_character("TimerTest", "Cleric")
+    scheduler = autosave.AutosaveScheduler(char, saved.append, max_interval=0.05,
+                                           max_operations=None)
+    char['experience'] += 5
+    scheduler.mark_action()
+
+    deadline = time.monotonic() + 5
+    while not saved and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scheduler.close()
+
+    assert len(saved) == 1
+    assert not scheduler.dirty
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+"""
+Test Shop Catalog
+Tests for the indexed, paginated shop catalog
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+
+import shop_catalog
+from shop_catalog import ShopCatalog
+
+STATS = ("health", "max_health", "strength", "magic")
+
+def random_items(count, seed):
+    """Build a random item catalog"""
+    rng = random.Random(seed)
+    items = {}
+    for index in range(count):
+        stats = rng.sample(STATS, rng.randint(1, 2))
+        items[f"item_{index}"] = {
+            "item_id": f"item_{index}",
+            "name": f"Item {index}",
+            "type": rng.choice(["weapon", "armor", "consumable"]),
+            "effect": ",".join(f"{stat}:{rng.randint(1, 9)}" for stat in stats),
+            "cost": rng.randint(1, 500),
+            "description": "Test item",
+        }
+    return items
+
+def full_scan(items, item_type=None, stat=None, min_cost=None, max_cost=None):
+    """The answer a search should give, by checking every item"""
+    matches = [
+        item_id for item_id, item in items.items()
+        if (item_type is None or item["type"] == item_type)
+        and (stat is None or stat in [part.split(":")[0] for part in item["effect"].split(",")])
+        and (min_cost is None or item["cost"] >= min_cost)
+        and (max_cost is None or item["cost"] <= max_cost)
+    ]
+    return sorted(matches, key=lambda item_id: items[item_id]["cost"])
+
+# ============================================================================
+# SEARCH TESTS
+# ============================================================================
+
+def test_search_matches_full_scan():
+    """Every filter combination gives the full-scan answer, cheapest first"""
+    items = random_items(600, seed=1)
+    catalog = ShopCatalog(items)
+    rng = random.Random(2)
+
+    for _ in range(200):
+        filters = {
+            "item_type": rng.choice([None, "weapon", "armor", "consumable"]),
+            "stat": rng.choice((None,) + STATS),
+            "min_cost": rng.choice([None, rng.randint(0, 500)]),
+            "max_cost": rng.choice([None, rng.randint(0, 500)]),
+        }
+        assert list(catalog.search(**filters)) == full_scan(items, **filters)
+
+def test_unknown_filters_give_no_items():
+    """Unknown types and stats match nothing instead of raising"""
+    catalog = ShopCatalog(random_items(20, seed=3))
+    assert len(catalog.search(item_type="shield")) == 0
+    assert len(catalog.search(item_type="weapon", stat="luck")) == 0
+    assert catalog.search(min_cost=400, max_cost=100).page(0) == []
+
+# ============================================================================
+# PAGINATION TESTS
+# ============================================================================
+
+def test_pages_cover_results_in_order():
+    """Pages split the results without gaps or repeats"""
+    items = random_items(95, seed=4)
+    results = ShopCatalog(items).search(max_cost=300)
+
+    pages = [results.page(index, 10) for index in range(results.page_count(10))]
+    assert results.page_count(10) == -(-len(results) // 10)
+    assert [item_id for page in pages for item_id, _ in page] == list(results)
+    assert pages[0][0][1] is items[pages[0][0][0]]
+    assert results.page(results.page_count(10), 10) == []
+    with pytest.raises(ValueError):
+        results.page(-1)
+
+def test_catalog_cache_follows_item_dictionary():
+    """The cached catalog is rebuilt for a new or resized item dictionary"""
+    items = random_items(10, seed=5)
+    catalog = shop_catalog.get_shop_catalog(items)
+    assert shop_catalog.get_shop_catalog(items) is catalog
+
+    items["extra"] = dict(items["item_0"], item_id="extra", cost=0)
+    rebuilt = shop_catalog.get_shop_catalog(items)
+    assert rebuilt is not catalog
+    assert rebuilt.search().page(0)[0][0] == "extra"
+
+    assert shop_catalog.get_shop_catalog(dict(items)) is not rebuilt
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])